@@ -1,13 +1,70 @@
-from flask import Flask, render_template, request
+import atexit
+import json
+import os
+from collections.abc import Mapping
 
-from core.orchestrator import DesignOrchestrator
+from flask import Flask, Response, abort, jsonify, render_template, request, send_file
+
+from core.admission import Deadline, DeadlineExceeded, Overloaded, Priority
+from core.design_store import DesignStore
+from core.orchestrator import DesignOrchestrator, InfeasibleRequirementsError, InvalidPlanError
+from core.plan_retrieval import DEFAULT_SIMILARITY_THRESHOLD, RetrievingAIStrategyService
+from core.profiling import PROFILE_HEADER, RequestProfiler
 from core.requirements import PowerSupplyRequirements
+from core.schematic import Schematic
+from core.serialization import MSGPACK_MIMETYPE, compress, negotiate_encoding, packb, to_columnar
 
 # Initialize the Flask application
 app = Flask(__name__)
+app.config.setdefault(
+    "DESIGN_DB_PATH",
+    os.environ.get("PCB_DESIGN_DB", os.path.join(app.instance_path, "designs.db"))
+)
+# Seconds a /generate request may take before it is failed with a 503
+app.config.setdefault("GENERATE_TIMEOUT_S", float(os.environ.get("PCB_GENERATE_TIMEOUT_S", "30")))
+
+# Instantiate the Design Orchestrator, which is now the main entry point.
+# Paraphrases of earlier requests reuse their plan instead of calling the AI again;
+# set PCB_PLAN_INDEX to persist the retrieval index across restarts.
+orchestrator = DesignOrchestrator(ai_strategy_service=RetrievingAIStrategyService(
+    threshold=float(os.environ.get("PCB_PLAN_SIMILARITY_THRESHOLD", DEFAULT_SIMILARITY_THRESHOLD)),
+    index_path=os.environ.get("PCB_PLAN_INDEX")
+))
+atexit.register(orchestrator.ai_strategy_service.close)
+
+# Opt-in request profiling, configured with PCB_PROFILE_TOKEN / PCB_PROFILE_SAMPLE_RATE.
+# Views wrapped with profiler.wrap are left untouched when neither is set.
+profiler = RequestProfiler.from_env(os.path.join(app.instance_path, "profiles"))
 
-# Instantiate the Design Orchestrator, which is now the main entry point
-orchestrator = DesignOrchestrator()
+def get_design_store() -> DesignStore:
+    """Returns the app's design history store, opening it on first use."""
+    store = app.extensions.get("design_store")
+    if store is None:
+        store = DesignStore(app.config["DESIGN_DB_PATH"])
+        app.extensions["design_store"] = store
+        atexit.register(store.close)
+    return store
+
+def default_requirements() -> PowerSupplyRequirements:
+    """
+    Returns the detailed requirements used for every request.
+
+    For this PoC, we still need to provide some hard-coded detailed requirements
+    until the AI can extract these from the user_request itself.
+    The AI's plan will determine which components are used.
+    These values are used for net naming and component selection logic.
+    """
+    return PowerSupplyRequirements(
+        block_name="AI Generated Power Supply",
+        input_voltage_v=12.0,
+        output_voltage_v=5.0,
+        max_output_current_a=1.0
+    )
+
+def request_priority() -> Priority:
+    """Scripted clients can mark their work as batch so interactive users are served first."""
+    return Priority.BATCH if request.headers.get('X-Request-Priority', '').lower() == 'batch' \
+        else Priority.INTERACTIVE
 
 @app.route('/')
 def index():
@@ -17,32 +74,149 @@ def index():
     return render_template('index.html')
 
 @app.route('/generate', methods=['POST'])
+@profiler.wrap
 def generate_schematic():
     """
     Handles the user's request, orchestrates the design, and displays the result.
     """
     user_request = request.form['user_request']
+    deadline = Deadline(app.config["GENERATE_TIMEOUT_S"])
+    priority = request_priority()
 
-    # For this PoC, we still need to provide some hard-coded detailed requirements
-    # until the AI can extract these from the user_request itself.
-    # The AI's plan will determine which components are used.
-    # These values are used for net naming and component selection logic.
-    requirements = PowerSupplyRequirements(
-        block_name="AI Generated Power Supply",
-        input_voltage_v=12.0,
-        output_voltage_v=5.0,
-        max_output_current_a=1.0
-    )
+    requirements = default_requirements()
 
-    # Use the orchestrator to create the schematic from the high-level request
-    schematic, design_plan = orchestrator.create_schematic_from_request(
-        user_request,
-        requirements
-    )
+    # Use the orchestrator to create the schematic from the high-level request.
+    # An invalid plan is rolled back by the orchestrator and shown as a failed design.
+    try:
+        schematic, design_plan = orchestrator.create_schematic_from_request(
+            user_request,
+            requirements,
+            deadline=deadline,
+            priority=priority
+        )
+    except InfeasibleRequirementsError as e:
+        # Rejected by the feasibility pre-check, before any AI work
+        message = f"These requirements cannot be met. {e.report.message}"
+        return render_template('schematic.html', schematic=Schematic(), plan=[], user_request=user_request,
+                               error_message=message), 422
+    except InvalidPlanError as e:
+        print(f"App: {e}")
+        schematic, design_plan = Schematic(), []
+    except (Overloaded, DeadlineExceeded) as e:
+        print(f"App: Request not served: {e}")
+        message = f"The design service is busy and could not complete your request in time ({e}). Please try again shortly."
+        return render_template('schematic.html', schematic=Schematic(), plan=[], user_request=user_request,
+                               error_message=message), 503, {'Retry-After': '1'}
+
+    # Queue the design for the history store; the write happens in the background
+    if design_plan:
+        get_design_store().save_design(user_request, requirements, design_plan, schematic)
 
     # Render the result page, passing the schematic and the AI's plan
     return render_template('schematic.html', schematic=schematic, plan=design_plan, user_request=user_request)
 
+@app.route('/api/schematic', methods=['GET', 'POST'])
+@profiler.wrap
+def api_schematic():
+    """
+    Returns the schematic and plan for a request in the compact columnar layout.
+
+    The request is read from the user_request query parameter (GET) or from a JSON
+    or form body (POST). Responses are JSON unless the client accepts MessagePack,
+    and are compressed with brotli or gzip when the client accepts it. Only POST
+    requests are saved to the design history; GET has no side effects.
+    """
+    body = (request.get_json(silent=True) or request.form) if request.method == 'POST' else request.args
+    user_request = body.get('user_request') if isinstance(body, Mapping) else None
+    if not user_request or not isinstance(user_request, str):
+        return jsonify({"error": "Missing 'user_request'."}), 400
+
+    requirements = default_requirements()
+    try:
+        schematic, design_plan = orchestrator.create_schematic_from_request(
+            user_request,
+            requirements,
+            deadline=Deadline(app.config["GENERATE_TIMEOUT_S"]),
+            priority=request_priority()
+        )
+    except InfeasibleRequirementsError as e:
+        return jsonify({"error": str(e), "reasons": e.report.reasons, "suggestions": e.report.suggestions,
+                        "limits": e.report.limits}), 422
+    except InvalidPlanError as e:
+        return jsonify({"error": str(e)}), 422
+    except (Overloaded, DeadlineExceeded) as e:
+        return jsonify({"error": str(e)}), 503, {'Retry-After': '1'}
+    if design_plan and request.method == 'POST':
+        get_design_store().save_design(user_request, requirements, design_plan, schematic)
+
+    payload = to_columnar(schematic, design_plan)
+    if request.accept_mimetypes.best_match(['application/json', MSGPACK_MIMETYPE, 'application/x-msgpack']) \
+            in (MSGPACK_MIMETYPE, 'application/x-msgpack'):
+        data, mimetype = packb(payload), MSGPACK_MIMETYPE
+    else:
+        data, mimetype = json.dumps(payload, separators=(',', ':')).encode('utf-8'), 'application/json'
+    coding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+    response = Response(compress(data, coding), mimetype=mimetype)
+    if coding:
+        response.headers['Content-Encoding'] = coding
+    response.headers['Vary'] = 'Accept, Accept-Encoding'
+    return response
+
+@app.route('/admin/admission')
+def admission_stats():
+    """
+    Reports the admission controller's counters, including shed and expired work.
+    """
+    return jsonify(orchestrator.admission_controller.stats())
+
+def _require_profiler_access():
+    """Aborts unless profiling is enabled and the caller presents the profiling token."""
+    if not profiler.enabled:
+        abort(404)
+    if not profiler.is_authorized(request.headers.get(PROFILE_HEADER) or request.args.get('token')):
+        abort(403)
+
+@app.route('/admin/profiles')
+def list_profiles():
+    """
+    Lists stored request profiles for authorized callers.
+    """
+    _require_profiler_access()
+    return render_template('admin_profiles.html', captures=profiler.list_captures(),
+                           profile_header=PROFILE_HEADER)
+
+@app.route('/admin/profiles/<name>')
+def show_profile(name):
+    """
+    Shows a profile summary, or downloads the raw pstats file with ?download=1.
+    """
+    _require_profiler_access()
+    path = profiler.path_for(name)
+    if path is None:
+        abort(404)
+    if request.args.get('download'):
+        return send_file(path, as_attachment=True, download_name=name)
+    return Response(profiler.summary(name), mimetype='text/plain')
+
+@app.route('/designs')
+def list_designs():
+    """
+    Lists previously generated designs, newest first.
+    """
+    designs = get_design_store().list_designs(project_name=request.args.get('project'), limit=100)
+    return render_template('designs.html', designs=designs)
+
+@app.route('/designs/<design_id>')
+def show_design(design_id):
+    """
+    Reopens a previously generated design.
+    """
+    design = get_design_store().get_design(design_id)
+    if design is None:
+        abort(404)
+    return render_template('schematic.html', schematic=design.schematic, plan=design.plan,
+                           user_request=design.user_request)
+
 
 if __name__ == '__main__':
     # Running in debug mode for development on port 5001
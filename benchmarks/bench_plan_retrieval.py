@@ -0,0 +1,90 @@
+"""
+Reports recall, false-hit rate and query latency of plan retrieval on a
+small labeled set of paraphrased requests: a threshold sweep on the tuning
+split, and the default threshold on the held-out split.
+
+Usage:
+    python -m benchmarks.bench_plan_retrieval
+"""
+from core.plan_retrieval import DEFAULT_SIMILARITY_THRESHOLD, PlanIndex, evaluate
+
+PSU_5V_PLAN = ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+PSU_3V3_PLAN = ["add_regulator_3v3", "add_input_capacitor", "add_output_capacitor"]
+
+# Previously accepted request -> plan pairs. Each set is run separately: short
+# requests like the ones /generate stores, and longer, more specific ones.
+SEEDS = {
+    "short": [
+        ("I need a 5V power supply.", PSU_5V_PLAN),
+        ("I need a 3.3V power supply.", PSU_3V3_PLAN),
+    ],
+    "long": [
+        ("I need a 5V power supply for my Arduino project.", PSU_5V_PLAN),
+        ("Design a 3.3V power supply for a sensor board.", PSU_3V3_PLAN),
+    ],
+}
+
+# (request, expected plan or None if nothing should be retrieved), split into a
+# tuning set that DEFAULT_SIMILARITY_THRESHOLD was chosen on and a held-out set
+# that is only reported, never tuned against.
+TUNING = [
+    ("5 volt supply for a Pi", PSU_5V_PLAN),
+    ("need 5V PSU", PSU_5V_PLAN),
+    ("Please build a 5v power supply", PSU_5V_PLAN),
+    ("5V regulator for an Arduino", PSU_5V_PLAN),
+    ("power supply, 5 V, for my robot", PSU_5V_PLAN),
+    ("I want a 5 volt power supply", PSU_5V_PLAN),
+    ("3.3 volt supply for sensors", PSU_3V3_PLAN),
+    ("need a 3.3V PSU", PSU_3V3_PLAN),
+    ("3.3V rail for a sensor board", PSU_3V3_PLAN),
+    ("12V power supply for a motor", None),
+    ("Design a high-speed differential pair.", None),
+    ("5V tolerant level shifter", None),
+    ("Build me a spaceship.", None),
+    ("USB-C PD sink at 20V", None),
+    ("5V USB hub", None),
+    ("5V relay driver", None),
+    ("5V fan controller", None),
+    ("3.3V level shifter for I2C", None),
+]
+HELD_OUT = [
+    ("5V PSU for a Raspberry Pi", PSU_5V_PLAN),
+    ("I would like a 5V supply", PSU_5V_PLAN),
+    ("a 5 volt power supply, please", PSU_5V_PLAN),
+    ("5V power supply for an LED strip", PSU_5V_PLAN),
+    ("need a 3.3 volt regulator", PSU_3V3_PLAN),
+    ("3.3V supply for a microcontroller", PSU_3V3_PLAN),
+    ("5V power switch", None),
+    ("5V supply monitor", None),
+    ("5V USB power bank", None),
+    ("5V battery charger", None),
+    ("5V motor driver", None),
+    ("3.3V power sequencer", None),
+    ("3.3V supply supervisor for a microcontroller", None),
+    ("5V power indicator LED", None),
+]
+
+
+def main():
+    for name, seed in SEEDS.items():
+        index = PlanIndex()
+        for request, plan in seed:
+            index.add(request, plan)
+        # Pad the index with unrelated requests so latency reflects a populated index
+        for i in range(5000):
+            index.add(f"unrelated request number {i} for a {i % 40}V motor driver board", [f"step_{i}"])
+
+        print(f"{name} seeds, tuning set:")
+        for threshold in (0.2, 0.3, DEFAULT_SIMILARITY_THRESHOLD, 0.4, 0.5):
+            _print_report(f"threshold={threshold:.2f}", evaluate(index, TUNING, threshold))
+        print(f"{name} seeds, held-out set:")
+        _print_report(f"threshold={DEFAULT_SIMILARITY_THRESHOLD:.2f}", evaluate(index, HELD_OUT))
+
+
+def _print_report(label: str, report):
+    print(f"  {label}: recall={report.recall:.2f} false_hits={report.false_hit_rate:.2f} "
+          f"mean={report.mean_latency_ms:.3f}ms p95={report.p95_latency_ms:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares payload size and encode time of the /api/schematic encodings against
+a naive dataclasses.asdict JSON dump, on flattened boards of increasing size.
+
+dataclasses.asdict cannot serialize a Net directly (its pins are a set of
+dataclasses), so the naive baseline converts each pin set to a list of dicts.
+
+Usage:
+    python -m benchmarks.bench_schematic_api
+"""
+import dataclasses
+import gzip
+import json
+import time
+
+from core import serialization
+from core.hierarchy import BlockLibrary, HierarchicalSchematic
+from core.requirements import PowerSupplyRequirements
+from core.serialization import packb, to_columnar
+
+PLAN = ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+
+
+def build_board(channels: int):
+    reqs = PowerSupplyRequirements("Channel PSU", input_voltage_v=12.0, output_voltage_v=5.0,
+                                   max_output_current_a=0.5)
+    psu = BlockLibrary().get_block("PSU_5V", PLAN, reqs,
+                                   ports={"VIN": "VIN_12.0V", "VOUT": "VOUT_5.0V", "GND": "GND"})
+    board = HierarchicalSchematic()
+    for channel in range(channels):
+        board.instantiate(psu, f"CH{channel}", {"VIN": "VIN_12V", "VOUT": f"CH{channel}_5V", "GND": "GND"})
+    return board.flatten().to_schematic()
+
+
+def naive_dump(schematic, plan) -> bytes:
+    return json.dumps({
+        "plan": plan,
+        "components": [dataclasses.asdict(c) for c in schematic.components],
+        "nets": [{"name": n.name, "pins": [dataclasses.asdict(p) for p in n.pins]} for n in schematic.nets],
+    }).encode("utf-8")
+
+
+def columnar_json(schematic, plan) -> bytes:
+    return json.dumps(to_columnar(schematic, plan), separators=(",", ":")).encode("utf-8")
+
+
+def columnar_msgpack(schematic, plan) -> bytes:
+    return packb(to_columnar(schematic, plan))
+
+
+def timed(fn, *args, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return result, best * 1000.0
+
+
+def main():
+    codec = "msgpack" if serialization.msgpack is not None else "pure-Python msgpack"
+    encoders = [("naive asdict JSON", naive_dump), ("columnar JSON", columnar_json),
+                (f"columnar {codec}", columnar_msgpack)]
+    for channels in (100, 1000, 5000):
+        schematic = build_board(channels)
+        print(f"\n{len(schematic.components)} components, {len(schematic.nets)} nets")
+        for name, encoder in encoders:
+            body, encode_ms = timed(encoder, schematic, PLAN)
+            gzipped, gzip_ms = timed(gzip.compress, body, 6, repeat=1)
+            print(f"  {name:28s} {len(body) / 1024:9.1f} KiB  gzip {len(gzipped) / 1024:8.1f} KiB  "
+                  f"encode {encode_ms:8.2f}ms  +gzip {gzip_ms:7.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
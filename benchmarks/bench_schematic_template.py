@@ -0,0 +1,48 @@
+"""
+Compares replaying a plan command by command with stamping its recorded
+template, for a sweep of requirement sets that all share one plan.
+
+Usage:
+    python -m benchmarks.bench_schematic_template
+"""
+import contextlib
+import io
+import time
+
+from core.requirements import PowerSupplyRequirements
+from core.schematic_generator import SchematicGenerator
+
+PLAN = ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+
+
+def requirement_sets(count: int):
+    return [
+        PowerSupplyRequirements(f"PSU {i}", input_voltage_v=7.0 + (i % 200) * 0.1, output_voltage_v=5.0,
+                                max_output_current_a=0.1 + (i % 10) * 0.1)
+        for i in range(count)
+    ]
+
+
+def main():
+    sets = requirement_sets(5000)
+    generator = SchematicGenerator()
+    # Silence the per-command progress output so it does not dominate the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        replayed = [generator._replay(PLAN, reqs) for reqs in sets]
+        replay_s = time.perf_counter() - started
+
+        generator.execute_plan(PLAN, sets[0])
+        started = time.perf_counter()
+        stamped = [generator.execute_plan(PLAN, reqs) for reqs in sets]
+        stamp_s = time.perf_counter() - started
+
+    assert all(a.fingerprint() == b.fingerprint() for a, b in zip(replayed, stamped))
+    print(f"{len(sets)} schematics from one plan:")
+    print(f"  replay  {replay_s * 1000:8.1f}ms  ({replay_s / len(sets) * 1e6:6.1f}us each)")
+    print(f"  stamp   {stamp_s * 1000:8.1f}ms  ({stamp_s / len(sets) * 1e6:6.1f}us each)")
+    print(f"  speedup {replay_s / stamp_s:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Admission control for the design pipeline: deadlines, a bounded priority
+wait queue around the AI service, and load shedding.
+"""
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, List, Optional
+
+
+class Priority(IntEnum):
+    """Priority classes; lower values are admitted first."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline passes, or cannot be met, before its work completes."""
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed because the wait queue is full."""
+
+
+class Deadline:
+    """
+    A point in (monotonic) time by which a request must complete.
+    """
+    def __init__(self, timeout_s: float):
+        """
+        Args:
+            timeout_s: Seconds from now until the deadline.
+        """
+        self.expires_at = time.monotonic() + timeout_s
+
+    def remaining(self) -> float:
+        """Returns the seconds left until the deadline, never less than zero."""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """True once the deadline has passed."""
+        return time.monotonic() >= self.expires_at
+
+    def check(self, stage: str):
+        """Raises DeadlineExceeded if the deadline has passed before the given stage."""
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline exceeded before {stage}.")
+
+
+@dataclass(order=True)
+class _Waiter:
+    """A request waiting for a concurrency slot, ordered by priority then arrival."""
+    priority: int
+    sequence: int
+    event: threading.Event = field(default_factory=threading.Event, compare=False)
+    granted: bool = field(default=False, compare=False)
+    evicted: bool = field(default=False, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class AdmissionController:
+    """
+    Limits concurrent work, queues a bounded number of waiters by priority, and
+    sheds requests that cannot be admitted in time.
+
+    Counters:
+        admitted: Requests that got a slot.
+        shed: Requests rejected without doing work (queue full, evicted by a
+            higher-priority request, or predicted to miss their deadline).
+        expired: Requests whose deadline passed while waiting or while working.
+        completed: Admitted requests that finished without expiring.
+    """
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 32, service_time_s: float = 0.1):
+        """
+        Args:
+            max_concurrency: Maximum number of requests working at the same time.
+            max_queue: Maximum number of requests waiting for a slot.
+            service_time_s: Initial estimate of how long a request holds its slot.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: List[_Waiter] = []
+        self._queued = 0
+        self._sequence = itertools.count()
+        self._service_time_s = service_time_s
+        self.admitted = 0
+        self.shed = 0
+        self.expired = 0
+        self.completed = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Returns a snapshot of the controller's counters and gauges."""
+        with self._lock:
+            return {
+                "active": self._active,
+                "queued": self._queued,
+                "admitted": self.admitted,
+                "shed": self.shed,
+                "expired": self.expired,
+                "completed": self.completed,
+                "service_time_s": round(self._service_time_s, 6),
+            }
+
+    @contextmanager
+    def admit(self, priority: Priority = Priority.INTERACTIVE, deadline: Optional[Deadline] = None):
+        """
+        Holds a concurrency slot for the duration of the block.
+
+        Raises:
+            Overloaded: If the request was shed.
+            DeadlineExceeded: If the deadline passed, or is predicted to pass, before admission,
+                or if the block itself raised DeadlineExceeded.
+        """
+        self._acquire(priority, deadline)
+        started = time.monotonic()
+        expired = False
+        try:
+            yield
+        except DeadlineExceeded:
+            expired = True
+            raise
+        finally:
+            self._release(time.monotonic() - started, expired)
+
+    def _acquire(self, priority: Priority, deadline: Optional[Deadline]):
+        """Takes a slot immediately, or waits for one in the priority queue."""
+        with self._lock:
+            if deadline is not None and deadline.expired:
+                self.expired += 1
+                raise DeadlineExceeded("Deadline exceeded before admission.")
+            if self._active < self.max_concurrency and not self._queued:
+                self._active += 1
+                self.admitted += 1
+                return
+
+            estimated_wait = (self._queued + 1) * self._service_time_s / self.max_concurrency
+            if deadline is not None and estimated_wait > deadline.remaining():
+                self.shed += 1
+                raise DeadlineExceeded(
+                    f"Deadline cannot be met: estimated queue wait is {estimated_wait:.2f}s "
+                    f"but only {deadline.remaining():.2f}s remain."
+                )
+            if self._queued >= self.max_queue and not self._evict_below(priority):
+                self.shed += 1
+                raise Overloaded(f"Server is overloaded: {self._queued} requests are already waiting.")
+
+            waiter = _Waiter(int(priority), next(self._sequence))
+            heapq.heappush(self._waiters, waiter)
+            self._queued += 1
+
+        waiter.event.wait(deadline.remaining() if deadline is not None else None)
+
+        with self._lock:
+            if waiter.granted:
+                self.admitted += 1
+                return
+            if waiter.evicted:
+                raise Overloaded("Request was shed in favour of higher-priority work.")
+            waiter.cancelled = True
+            self._queued -= 1
+            self.expired += 1
+        raise DeadlineExceeded("Deadline exceeded while waiting for admission.")
+
+    def _evict_below(self, priority: Priority) -> bool:
+        """Sheds the lowest-priority, newest waiter if it ranks below the given priority."""
+        candidates = [w for w in self._waiters if not (w.cancelled or w.evicted or w.granted)]
+        if not candidates:
+            return False
+        victim = max(candidates)
+        if victim.priority <= priority:
+            return False
+        victim.evicted = True
+        self._queued -= 1
+        self.shed += 1
+        victim.event.set()
+        return True
+
+    def _release(self, held_s: float, expired: bool):
+        """Hands the slot to the best waiter, or frees it."""
+        with self._lock:
+            # Exponentially weighted moving average of slot hold times
+            self._service_time_s = 0.8 * self._service_time_s + 0.2 * held_s
+            if expired:
+                self.expired += 1
+            else:
+                self.completed += 1
+            while self._waiters:
+                waiter = heapq.heappop(self._waiters)
+                if waiter.cancelled or waiter.evicted:
+                    continue
+                waiter.granted = True
+                self._queued -= 1
+                waiter.event.set()
+                return
+            self._active -= 1
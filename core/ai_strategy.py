@@ -2,37 +2,80 @@
 Simulates an AI service that creates a design plan from a user request.
 In a real application, this would involve a call to a large language model (LLM).
 """
-from typing import List
+from typing import Iterator, List, Optional
+
+from core.admission import Deadline
 
 class AIStrategyService:
     """
     A mock service that returns a hard-coded design plan based on keywords
     in the user's request.
     """
-    def get_design_plan(self, user_request: str) -> List[str]:
+    def get_design_plan(self, user_request: str, deadline: Optional[Deadline] = None) -> List[str]:
         """
         Parses the user request and returns a step-by-step design plan.
 
         Args:
             user_request: The natural language request from the user.
+            deadline: Optional deadline; DeadlineExceeded is raised once it passes.
 
         Returns:
             A list of commands for the schematic generator.
         """
+        return list(self.iter_design_plan(user_request, deadline))
+
+    def known_plan(self, user_request: str) -> Optional[List[str]]:
+        """
+        Returns the complete plan for a request if it is known without generating it.
+
+        Callers can then build the whole plan at once instead of streaming it.
+        The mock always generates its plan, so it never knows one in advance.
+
+        Args:
+            user_request: The natural language request from the user.
+
+        Returns:
+            The complete plan, or None if it has to be generated.
+        """
+        return None
+
+    def iter_generated_plan(self, user_request: str, deadline: Optional[Deadline] = None) -> Iterator[str]:
+        """
+        Streams a newly generated plan, skipping any lookup of known plans.
+
+        Callers that already got None from known_plan() use this instead of
+        iter_design_plan() so the request is not looked up twice.
+        """
+        return self.iter_design_plan(user_request, deadline)
+
+    def iter_design_plan(self, user_request: str, deadline: Optional[Deadline] = None) -> Iterator[str]:
+        """
+        Streams the design plan one step at a time.
+
+        A token-streaming LLM produces the plan incrementally; yielding each step
+        as soon as it is complete lets callers start executing it while the rest
+        of the plan is still being generated.
+
+        Args:
+            user_request: The natural language request from the user.
+            deadline: Optional deadline, checked before each step is produced.
+
+        Yields:
+            Commands for the schematic generator, in order.
+        """
         request_lower = user_request.lower()
 
         # This is a very simple keyword-based mock. A real implementation
         # would use an LLM to generate a much more nuanced plan.
         if "5v" in request_lower and "power supply" in request_lower:
             print("AI Strategy: Detected request for a 5V power supply. Generating standard plan.")
-            return [
-                "add_regulator_5v",
-                "add_input_capacitor",
-                "add_output_capacitor"
-            ]
+            for step in ("add_regulator_5v", "add_input_capacitor", "add_output_capacitor"):
+                if deadline is not None:
+                    deadline.check("the next AI plan step")
+                yield step
+            return
 
         print(f"AI Strategy: No specific plan found for request: '{user_request}'. Returning empty plan.")
-        return []
 
 if __name__ == '__main__':
     # Example usage
@@ -0,0 +1,353 @@
+"""
+DC operating-point analysis of generated power trees.
+
+Builds a modified-nodal-analysis (MNA) system from a Schematic using the
+per-part electrical models in the component library, solves it with a sparse
+LU factorization, and checks the result against the PowerSupplyRequirements.
+
+Supply and load are implied by net naming: every net starting with "VIN" is
+driven by an ideal source at the requested input voltage, every net starting
+with "VOUT" sinks the requested maximum output current, and "GND" is the
+reference node.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from core.requirements import PowerSupplyRequirements
+from core.schematic import Schematic
+from core.schematic_generator import COMPONENT_LIBRARY
+
+GROUND_NET = "GND"
+SUPPLY_NET_PREFIX = "VIN"
+LOAD_NET_PREFIX = "VOUT"
+
+# Tiny conductance from every node to ground, so nets that only touch
+# capacitors (open at DC) still have a defined voltage.
+GMIN_S = 1e-12
+
+# Allowed deviation of a load rail from the requested output voltage.
+OUTPUT_VOLTAGE_TOLERANCE = 0.02
+
+
+class SingularMatrixError(ValueError):
+    """Raised when the MNA system of a schematic has no unique solution."""
+
+
+@dataclass
+class OperatingPoint:
+    """
+    The DC solution of a schematic under a given set of requirements.
+
+    Attributes:
+        rail_voltages_v (Dict[str, float]): Voltage of every net, keyed by net name.
+        part_currents_a (Dict[str, float]): Current through each part, keyed by designator.
+            For regulators this is the output current.
+        part_dissipation_w (Dict[str, float]): Power dissipated in each part, in Watts.
+        supply_current_a (float): Total current drawn from the input source(s).
+        load_current_a (float): Total current sunk by the load(s).
+        issues (List[str]): Human-readable violations of the requirements.
+    """
+    rail_voltages_v: Dict[str, float] = field(default_factory=dict)
+    part_currents_a: Dict[str, float] = field(default_factory=dict)
+    part_dissipation_w: Dict[str, float] = field(default_factory=dict)
+    supply_current_a: float = 0.0
+    load_current_a: float = 0.0
+    issues: List[str] = field(default_factory=list)
+
+    @property
+    def meets_requirements(self) -> bool:
+        """True if no requirement was violated."""
+        return not self.issues
+
+
+class _SparseLU:
+    """
+    LU factorization with partial pivoting over dict-of-rows sparse storage.
+    """
+    def __init__(self, rows: List[Dict[int, float]]):
+        n = len(rows)
+        upper = [dict(row) for row in rows]
+        lower: List[Dict[int, float]] = [{} for _ in range(n)]
+        perm = list(range(n))
+
+        for k in range(n):
+            pivot_row = max(range(k, n), key=lambda i: abs(upper[i].get(k, 0.0)))
+            if abs(upper[pivot_row].get(k, 0.0)) < 1e-300:
+                raise SingularMatrixError(f"MNA matrix is singular at column {k}.")
+            if pivot_row != k:
+                upper[k], upper[pivot_row] = upper[pivot_row], upper[k]
+                lower[k], lower[pivot_row] = lower[pivot_row], lower[k]
+                perm[k], perm[pivot_row] = perm[pivot_row], perm[k]
+
+            pivot = upper[k][k]
+            tail = [(j, v) for j, v in upper[k].items() if j > k]
+            for i in range(k + 1, n):
+                entry = upper[i].pop(k, None)
+                if not entry:
+                    continue
+                factor = entry / pivot
+                lower[i][k] = factor
+                row = upper[i]
+                for j, v in tail:
+                    row[j] = row.get(j, 0.0) - factor * v
+
+        self.upper = upper
+        self.lower = lower
+        self.perm = perm
+
+    def solve(self, rhs: List[float]) -> List[float]:
+        """Solves A x = rhs using the stored factors."""
+        n = len(rhs)
+        y = [rhs[self.perm[i]] for i in range(n)]
+        for i in range(n):
+            y[i] -= sum(factor * y[j] for j, factor in self.lower[i].items())
+        x = [0.0] * n
+        for i in reversed(range(n)):
+            row = self.upper[i]
+            acc = y[i] - sum(v * x[j] for j, v in row.items() if j > i)
+            x[i] = acc / row[i]
+        return x
+
+
+class _MNAStructure:
+    """
+    The topology-dependent part of an MNA system: node and branch numbering.
+
+    It depends only on which parts connect to which (unnamed) nodes, so it can
+    be shared by every schematic produced by the same plan, and it keeps the
+    last LU factorization so solves whose matrix values did not change only
+    redo the triangular substitutions. Net names differ between those
+    schematics (e.g. "VIN_9.0V" vs "VIN_12.0V"), so they are not stored here;
+    node i is the i-th entry of node_names() of whichever schematic is solved.
+    """
+    def __init__(self, schematic: Schematic):
+        names = self.node_names(schematic)
+        node_index = {name: i for i, name in enumerate(names)}
+        node_of_pin = {
+            (pin.component_ref_des, pin.pin_name): node_index.get(net.name, -1)
+            for net in schematic.nets for pin in net.pins
+        }
+
+        self.node_count = size = len(names)
+        self.supply_branches: List[Tuple[int, int]] = []
+        for node, name in enumerate(names):
+            if name.startswith(SUPPLY_NET_PREFIX):
+                self.supply_branches.append((node, size))
+                size += 1
+        self.load_nodes = [node for node, name in enumerate(names) if name.startswith(LOAD_NET_PREFIX)]
+
+        self.regulators: List[Tuple[str, dict, int, int, int, int]] = []
+        self.resistors: List[Tuple[str, float, int, int]] = []
+        for comp in schematic.components:
+            model = COMPONENT_LIBRARY.get(comp.part_number, {}).get("electrical_model")
+            if model is None:
+                continue
+            pin = lambda name: node_of_pin.get((comp.reference_designator, name), -1)
+            if model["type"] == "linear_regulator":
+                self.regulators.append((comp.reference_designator, model, pin("IN"), pin("OUT"), pin("GND"), size))
+                size += 1
+            elif model["type"] == "capacitor":
+                self.resistors.append((comp.reference_designator, 1.0 / model["leakage_resistance_ohm"], pin("1"), pin("2")))
+        self.size = size
+
+        self._matrix_key: Optional[Tuple] = None
+        self._lu: Optional[_SparseLU] = None
+        self.factorizations = 0
+
+    @staticmethod
+    def node_names(schematic: Schematic) -> List[str]:
+        """Returns the names of the non-ground nets in node order (first appearance)."""
+        return list(dict.fromkeys(net.name for net in schematic.nets if net.name != GROUND_NET))
+
+    @staticmethod
+    def signature(schematic: Schematic) -> Tuple:
+        """Returns a name-independent key describing the schematic topology."""
+        node_ids: Dict[str, int] = {}
+        pins = []
+        for net in schematic.nets:
+            node = -1 if net.name == GROUND_NET else node_ids.setdefault(net.name, len(node_ids))
+            role = net.name[:len(SUPPLY_NET_PREFIX)] if net.name.startswith(SUPPLY_NET_PREFIX) else \
+                net.name[:len(LOAD_NET_PREFIX)] if net.name.startswith(LOAD_NET_PREFIX) else ""
+            pins.extend((pin.component_ref_des, pin.pin_name, node, role) for pin in net.pins)
+        parts = tuple((c.reference_designator, c.part_number) for c in schematic.components)
+        return parts, tuple(sorted(pins))
+
+    def factorization(self, matrix: Dict[Tuple[int, int], float]) -> _SparseLU:
+        """Returns an LU factorization of the matrix, refactoring only if its values changed."""
+        key = tuple(sorted(matrix.items()))
+        if key != self._matrix_key:
+            rows: List[Dict[int, float]] = [{} for _ in range(self.size)]
+            for (i, j), value in matrix.items():
+                rows[i][j] = value
+            self._lu = _SparseLU(rows)
+            self._matrix_key = key
+            self.factorizations += 1
+        return self._lu
+
+
+class DCOperatingPointSolver:
+    """
+    Solves the DC operating point of schematics, caching MNA structure per topology.
+    """
+    def __init__(self):
+        self._structures: Dict[Tuple, _MNAStructure] = {}
+
+    def solve(self, schematic: Schematic, requirements: PowerSupplyRequirements) -> OperatingPoint:
+        """
+        Computes rail voltages, part currents and dissipation for a schematic.
+
+        Args:
+            schematic: The schematic to analyse.
+            requirements: Supplies the input voltage and load current, and the
+                output voltage and current the result is checked against.
+
+        Returns:
+            The operating point, including any requirement violations.
+        """
+        signature = _MNAStructure.signature(schematic)
+        structure = self._structures.get(signature)
+        if structure is None:
+            structure = _MNAStructure(schematic)
+            self._structures[signature] = structure
+
+        if not structure.supply_branches:
+            return OperatingPoint(issues=["No input rail (net starting with 'VIN') to drive."])
+
+        # Solve assuming every regulator is in regulation, then switch the ones that
+        # would need more headroom than the input provides into dropout and re-solve.
+        in_dropout = set()
+        while True:
+            x = self._solve_once(structure, requirements, in_dropout)
+            newly_dropped = {
+                ref for ref, model, n_in, n_out, n_gnd, _ in structure.regulators
+                if ref not in in_dropout
+                and _v(x, n_in) - _v(x, n_gnd) - model["dropout_voltage_v"] < model["output_voltage_v"]
+            }
+            if not newly_dropped:
+                break
+            in_dropout |= newly_dropped
+
+        return self._report(structure, _MNAStructure.node_names(schematic), requirements, x, in_dropout)
+
+    @staticmethod
+    def _solve_once(structure: _MNAStructure, requirements: PowerSupplyRequirements, in_dropout) -> List[float]:
+        """Stamps and solves the MNA system for one set of regulator modes."""
+        matrix: Dict[Tuple[int, int], float] = {}
+        rhs = [0.0] * structure.size
+
+        def stamp(i: int, j: int, value: float):
+            if i >= 0 and j >= 0:
+                matrix[(i, j)] = matrix.get((i, j), 0.0) + value
+
+        for node in range(structure.node_count):
+            stamp(node, node, GMIN_S)
+        for _, conductance, a, b in structure.resistors:
+            stamp(a, a, conductance)
+            stamp(b, b, conductance)
+            stamp(a, b, -conductance)
+            stamp(b, a, -conductance)
+        for node, branch in structure.supply_branches:
+            stamp(node, branch, 1.0)
+            stamp(branch, node, 1.0)
+            rhs[branch] = requirements.input_voltage_v
+        for node in structure.load_nodes:
+            rhs[node] -= requirements.max_output_current_a
+
+        for ref, model, n_in, n_out, n_gnd, branch in structure.regulators:
+            # Output branch current i flows from OUT into the regulator, so the
+            # regulator sources -i into OUT and draws -i + Iq from IN.
+            stamp(n_out, branch, 1.0)
+            stamp(n_in, branch, -1.0)
+            quiescent = model["quiescent_current_a"]
+            if n_in >= 0:
+                rhs[n_in] -= quiescent
+            if n_gnd >= 0:
+                rhs[n_gnd] += quiescent
+            stamp(branch, n_out, 1.0)
+            if ref in in_dropout:
+                stamp(branch, n_in, -1.0)
+                rhs[branch] = -model["dropout_voltage_v"]
+            else:
+                stamp(branch, n_gnd, -1.0)
+                rhs[branch] = model["output_voltage_v"]
+
+        return structure.factorization(matrix).solve(rhs)
+
+    @staticmethod
+    def _report(
+        structure: _MNAStructure,
+        node_names: List[str],
+        requirements: PowerSupplyRequirements,
+        x: List[float],
+        in_dropout
+    ) -> OperatingPoint:
+        """
+        Turns a raw MNA solution into an OperatingPoint and checks the requirements.
+
+        Nodes are labelled with node_names of the schematic being solved, not of
+        the schematic the (shared) structure was built from.
+        """
+        point = OperatingPoint()
+        for node, name in enumerate(node_names):
+            point.rail_voltages_v[name] = x[node]
+        point.rail_voltages_v[GROUND_NET] = 0.0
+        point.supply_current_a = -sum(x[branch] for _, branch in structure.supply_branches)
+        point.load_current_a = requirements.max_output_current_a * len(structure.load_nodes)
+
+        for ref, conductance, a, b in structure.resistors:
+            dv = _v(x, a) - _v(x, b)
+            point.part_currents_a[ref] = dv * conductance
+            point.part_dissipation_w[ref] = dv * dv * conductance
+
+        for ref, model, n_in, n_out, n_gnd, branch in structure.regulators:
+            output_current = -x[branch]
+            quiescent = model["quiescent_current_a"]
+            point.part_currents_a[ref] = output_current
+            dissipation = (_v(x, n_in) - _v(x, n_out)) * output_current + (_v(x, n_in) - _v(x, n_gnd)) * quiescent
+            point.part_dissipation_w[ref] = dissipation
+
+            if ref in in_dropout:
+                point.issues.append(f"{ref} is in dropout: input rail is below "
+                                    f"{model['output_voltage_v'] + model['dropout_voltage_v']:.2f}V.")
+            if output_current > model["max_output_current_a"]:
+                point.issues.append(f"{ref} must supply {output_current:.3f}A but is rated for "
+                                    f"{model['max_output_current_a']:.3f}A.")
+            if dissipation > model["max_dissipation_w"]:
+                point.issues.append(f"{ref} dissipates {dissipation:.2f}W, above its "
+                                    f"{model['max_dissipation_w']:.2f}W limit.")
+
+        if not structure.load_nodes:
+            point.issues.append("No output rail (net starting with 'VOUT') to load.")
+        target = requirements.output_voltage_v
+        for node in structure.load_nodes:
+            name = node_names[node]
+            if abs(x[node] - target) > OUTPUT_VOLTAGE_TOLERANCE * abs(target):
+                point.issues.append(f"{name} settles at {x[node]:.3f}V instead of {target:.3f}V.")
+        return point
+
+
+def _v(x: List[float], node: int) -> float:
+    """Returns the voltage of a node, with -1 denoting ground."""
+    return x[node] if node >= 0 else 0.0
+
+
+if __name__ == '__main__':
+    # Example usage
+    from core.orchestrator import DesignOrchestrator
+
+    reqs = PowerSupplyRequirements(
+        block_name="5V PSU",
+        input_voltage_v=12.0,
+        output_voltage_v=5.0,
+        max_output_current_a=1.0
+    )
+    schematic, _ = DesignOrchestrator().create_schematic_from_request("I need a 5V power supply.", reqs)
+    point = DCOperatingPointSolver().solve(schematic, reqs)
+
+    print("\n--- DC Operating Point ---")
+    for name, voltage in point.rail_voltages_v.items():
+        print(f"  - {name}: {voltage:.3f}V")
+    for ref, watts in point.part_dissipation_w.items():
+        print(f"  - {ref}: {point.part_currents_a[ref]:.4f}A, {watts:.4f}W")
+    print(f"Supply current: {point.supply_current_a:.4f}A")
+    print(f"Meets requirements: {point.meets_requirements} {point.issues}")
@@ -0,0 +1,283 @@
+"""
+Design-space exploration over sweeps of power supply requirements.
+
+A sweep expands a grid of input voltages, output currents and board-cost
+targets, generates one schematic per distinct requirement set in a process
+pool, rates every variant on BOM cost and regulator dissipation, and returns
+the Pareto-optimal variants.
+"""
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.feasibility import FeasibilityReport, check_feasibility
+from core.orchestrator import DesignOrchestrator
+from core.requirements import PowerSupplyRequirements
+from core.schematic import Schematic
+from core.schematic_generator import COMPONENT_LIBRARY
+
+# Per-process orchestrator used by pool workers, created lazily on first use.
+_worker_orchestrator: Optional[DesignOrchestrator] = None
+
+
+@dataclass
+class DesignVariant:
+    """
+    A single rated point of a design-space sweep.
+
+    Attributes:
+        requirements (PowerSupplyRequirements): The requirements this variant was generated for.
+        target_cost_usd (Optional[float]): Board-cost target of this grid point, if any.
+        plan (List[str]): The design plan that was executed.
+        schematic (Schematic): The generated schematic.
+        bom_cost_usd (float): Summed unit cost of all components in the schematic.
+        regulator_dissipation_w (float): Power dissipated in the linear regulator, in Watts.
+    """
+    requirements: PowerSupplyRequirements
+    target_cost_usd: Optional[float]
+    plan: List[str]
+    schematic: Schematic
+    bom_cost_usd: float = 0.0
+    regulator_dissipation_w: float = 0.0
+
+    @property
+    def meets_cost_target(self) -> bool:
+        """True if the variant has no cost target or its BOM cost is within it."""
+        return self.target_cost_usd is None or self.bom_cost_usd <= self.target_cost_usd
+
+
+@dataclass
+class SweepResult:
+    """
+    The outcome of a design-space sweep.
+
+    Attributes:
+        variants (List[DesignVariant]): Every rated grid point, in grid order.
+        pareto_front (List[DesignVariant]): Variants that meet their cost target and are not
+            dominated on (BOM cost, regulator dissipation), sorted by cost.
+        infeasible (List[Tuple[PowerSupplyRequirements, FeasibilityReport]]): Grid points skipped
+            because they failed the feasibility pre-check.
+    """
+    variants: List[DesignVariant] = field(default_factory=list)
+    pareto_front: List[DesignVariant] = field(default_factory=list)
+    infeasible: List[Tuple[PowerSupplyRequirements, FeasibilityReport]] = field(default_factory=list)
+
+
+def expand_requirement_grid(
+    base: PowerSupplyRequirements,
+    input_voltages: Optional[Sequence[float]] = None,
+    output_currents: Optional[Sequence[float]] = None
+) -> List[PowerSupplyRequirements]:
+    """
+    Expands the cartesian product of the given parameter ranges.
+
+    Args:
+        base: Requirements whose remaining fields are copied into every grid point.
+        input_voltages: Input voltages to sweep. Defaults to the base value.
+        output_currents: Maximum output currents to sweep. Defaults to the base value.
+
+    Returns:
+        One PowerSupplyRequirements per grid point.
+    """
+    input_voltages = input_voltages or [base.input_voltage_v]
+    output_currents = output_currents or [base.max_output_current_a]
+    return [
+        replace(base, input_voltage_v=vin, max_output_current_a=current,
+                protection_features=list(base.protection_features or []))
+        for vin, current in itertools.product(input_voltages, output_currents)
+    ]
+
+
+def bom_costs(schematics: Sequence[Schematic]) -> List[float]:
+    """Returns the BOM cost of each schematic, looked up once per distinct part number."""
+    unit_costs: Dict[str, float] = {
+        part: spec.get("unit_cost_usd", 0.0) for part, spec in COMPONENT_LIBRARY.items()
+    }
+    return [
+        sum(unit_costs.get(comp.part_number, 0.0) for comp in schematic.components)
+        for schematic in schematics
+    ]
+
+
+def regulator_dissipations(
+    requirements: Sequence[PowerSupplyRequirements],
+    schematics: Sequence[Schematic]
+) -> List[float]:
+    """
+    Returns the linear regulator dissipation (Vin - Vout) * I for each variant.
+
+    Variants without an LM7805 in their schematic dissipate nothing in this model.
+    """
+    has_linear = [
+        any(comp.part_number == "LM7805" for comp in schematic.components)
+        for schematic in schematics
+    ]
+    headroom = [max(req.input_voltage_v - req.output_voltage_v, 0.0) for req in requirements]
+    currents = [req.max_output_current_a for req in requirements]
+    return [
+        dv * current if linear else 0.0
+        for dv, current, linear in zip(headroom, currents, has_linear)
+    ]
+
+
+def pareto_front(variants: Iterable[DesignVariant]) -> List[DesignVariant]:
+    """
+    Returns the variants that are not dominated on (BOM cost, regulator dissipation).
+
+    Only variants that meet their cost target are considered. Runs in O(n log n).
+    """
+    candidates = sorted(
+        (v for v in variants if v.meets_cost_target),
+        key=lambda v: (v.bom_cost_usd, v.regulator_dissipation_w)
+    )
+    front: List[DesignVariant] = []
+    best_dissipation = float("inf")
+    for variant in candidates:
+        if variant.regulator_dissipation_w < best_dissipation:
+            front.append(variant)
+            best_dissipation = variant.regulator_dissipation_w
+    return front
+
+
+def _requirements_key(requirements: PowerSupplyRequirements) -> Tuple:
+    """Returns a hashable key of the fields that influence schematic generation."""
+    return (
+        requirements.input_voltage_v,
+        requirements.output_voltage_v,
+        requirements.max_output_current_a,
+        tuple(requirements.protection_features or []),
+    )
+
+
+def _build_variant(plan: Tuple[str, ...], requirements: PowerSupplyRequirements) -> Schematic:
+    """Pool worker: executes a plan with a per-process orchestrator."""
+    global _worker_orchestrator
+    if _worker_orchestrator is None:
+        _worker_orchestrator = DesignOrchestrator()
+    return _worker_orchestrator.execute_plan(list(plan), requirements)
+
+
+class DesignSpaceExplorer:
+    """
+    Generates and rates design variants across a grid of requirements.
+    """
+    def __init__(self, orchestrator: Optional[DesignOrchestrator] = None, max_workers: Optional[int] = None):
+        """
+        Args:
+            orchestrator: Orchestrator used for the AI step. A new one is created if omitted.
+            max_workers: Size of the process pool. A value of 1 generates in-process.
+        """
+        self.orchestrator = orchestrator or DesignOrchestrator()
+        self.max_workers = max_workers
+
+    def sweep(
+        self,
+        user_request: str,
+        base_requirements: PowerSupplyRequirements,
+        input_voltages: Optional[Sequence[float]] = None,
+        output_currents: Optional[Sequence[float]] = None,
+        target_costs: Optional[Sequence[Optional[float]]] = None,
+        skip_infeasible: bool = True
+    ) -> SweepResult:
+        """
+        Runs a sweep and returns every rated variant plus the Pareto front.
+
+        The AI plan is requested once for the whole sweep, and each distinct set of
+        generation inputs is built once and shared by all grid points (e.g. every
+        cost target) that map to it.
+
+        Args:
+            user_request: The natural language request that drives the AI plan.
+            base_requirements: Requirements copied into every grid point.
+            input_voltages: Input voltages to sweep.
+            output_currents: Maximum output currents to sweep.
+            target_costs: Board-cost targets to sweep; None means unconstrained.
+            skip_infeasible: If True, grid points that fail the feasibility pre-check are
+                not generated and are reported in SweepResult.infeasible instead.
+
+        Returns:
+            The rated variants and their Pareto front.
+        """
+        plan = tuple(self.orchestrator.ai_strategy_service.get_design_plan(user_request))
+        grid = expand_requirement_grid(base_requirements, input_voltages, output_currents)
+        target_costs = target_costs or [None]
+        infeasible = []
+        if skip_infeasible:
+            reports = [check_feasibility(requirements) for requirements in grid]
+            infeasible = [(req, report) for req, report in zip(grid, reports) if not report.feasible]
+            grid = [req for req, report in zip(grid, reports) if report.feasible]
+
+        unique: Dict[Tuple, PowerSupplyRequirements] = {}
+        for requirements in grid:
+            unique.setdefault(_requirements_key(requirements), requirements)
+        print(f"Design Space: {len(grid) * len(target_costs)} grid points, "
+              f"{len(unique)} unique schematics to generate, {len(infeasible)} infeasible points skipped.")
+
+        keys = list(unique)
+        if not keys:
+            built = []
+        elif self.max_workers == 1:
+            built = [self.orchestrator.execute_plan(list(plan), unique[key]) for key in keys]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                built = list(pool.map(_build_variant, itertools.repeat(plan), [unique[key] for key in keys]))
+        schematics = dict(zip(keys, built))
+
+        grid_schematics = [schematics[_requirements_key(req)] for req in grid]
+        costs = bom_costs(grid_schematics)
+        dissipations = regulator_dissipations(grid, grid_schematics)
+
+        variants = [
+            DesignVariant(
+                requirements=requirements,
+                target_cost_usd=target,
+                plan=list(plan),
+                schematic=schematic,
+                bom_cost_usd=cost,
+                regulator_dissipation_w=dissipation
+            )
+            for target in target_costs
+            for requirements, schematic, cost, dissipation in zip(grid, grid_schematics, costs, dissipations)
+        ]
+        return SweepResult(variants=variants, pareto_front=pareto_front(variants), infeasible=infeasible)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point for running a sweep."""
+    parser = argparse.ArgumentParser(description="Sweep power supply requirements and print the Pareto front.")
+    parser.add_argument("--request", default="I need a 5V power supply.", help="Natural language design request.")
+    parser.add_argument("--output-voltage", type=float, default=5.0, help="Output voltage in Volts.")
+    parser.add_argument("--input-voltages", type=float, nargs="+", default=[7.0, 9.0, 12.0],
+                        help="Input voltages to sweep, in Volts.")
+    parser.add_argument("--output-currents", type=float, nargs="+", default=[0.5, 1.0],
+                        help="Maximum output currents to sweep, in Amperes.")
+    parser.add_argument("--target-costs", type=float, nargs="*", default=None,
+                        help="Board-cost targets to sweep, in USD.")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size.")
+    args = parser.parse_args(argv)
+
+    base = PowerSupplyRequirements(
+        block_name="Sweep",
+        input_voltage_v=args.input_voltages[0],
+        output_voltage_v=args.output_voltage,
+        max_output_current_a=args.output_currents[0]
+    )
+    explorer = DesignSpaceExplorer(max_workers=args.workers)
+    result = explorer.sweep(args.request, base, args.input_voltages, args.output_currents, args.target_costs)
+
+    print("\n--- Pareto Front ---")
+    for variant in result.pareto_front:
+        req = variant.requirements
+        print(f"  - Vin={req.input_voltage_v}V I={req.max_output_current_a}A "
+              f"target={variant.target_cost_usd}: cost=${variant.bom_cost_usd:.2f}, "
+              f"dissipation={variant.regulator_dissipation_w:.2f}W")
+    if result.infeasible:
+        print("\n--- Skipped As Infeasible ---")
+    for req, report in result.infeasible:
+        print(f"  - Vin={req.input_voltage_v}V I={req.max_output_current_a}A: {report.reasons[0]}")
+
+
+if __name__ == '__main__':
+    main()
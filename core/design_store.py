@@ -0,0 +1,324 @@
+"""
+Persistent history of projects, requirements, plans and generated schematics.
+
+Designs are stored in a local SQLite database in WAL mode. Writes are queued
+and group-committed by a background writer thread, so callers such as the
+/generate request handler never wait on disk I/O. Rows are serialized on the
+caller's thread, so invalid input fails in save_design rather than in the
+writer, and a failed batch is retried one design at a time. Reads check a connection
+out of a bounded pool and return it afterwards, so the number of open
+connections does not grow with the number of request threads.
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+from core.requirements import PowerSupplyRequirements, ProjectRequirements
+from core.schematic import Schematic
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    max_length_mm REAL,
+    max_width_mm REAL,
+    target_cost_usd REAL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS designs (
+    id TEXT PRIMARY KEY,
+    project_name TEXT,
+    created_at REAL NOT NULL,
+    user_request TEXT NOT NULL,
+    requirements TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    schematic TEXT NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_designs_project_time ON designs (project_name, created_at);
+CREATE INDEX IF NOT EXISTS idx_designs_time ON designs (created_at);
+CREATE INDEX IF NOT EXISTS idx_designs_fingerprint ON designs (fingerprint);
+"""
+
+# Sentinel that tells the writer thread to stop.
+_STOP = object()
+
+
+@dataclass
+class StoredDesign:
+    """
+    A design loaded back from the store.
+
+    Attributes:
+        id (str): Unique identifier of the design.
+        project_name (Optional[str]): Name of the project the design belongs to, if any.
+        created_at (float): Creation time as a UNIX timestamp.
+        user_request (str): The natural language request that produced the design.
+        requirements (PowerSupplyRequirements): The requirements used for generation.
+        plan (List[str]): The executed design plan.
+        schematic (Schematic): The generated schematic.
+        fingerprint (str): Content fingerprint of the schematic.
+    """
+    id: str
+    project_name: Optional[str]
+    created_at: float
+    user_request: str
+    requirements: PowerSupplyRequirements
+    plan: List[str] = field(default_factory=list)
+    schematic: Schematic = field(default_factory=Schematic)
+    fingerprint: str = ""
+
+
+class DesignStore:
+    """
+    SQLite-backed store with a background, group-committing writer.
+    """
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 100,
+        flush_interval_s: float = 0.05,
+        max_read_connections: int = 4
+    ):
+        """
+        Args:
+            path: Path of the SQLite database file. Parent directories are created.
+            batch_size: Maximum number of writes committed in one transaction.
+            flush_interval_s: How long the writer waits to gather more writes into a batch.
+            max_read_connections: Size of the read connection pool; further readers wait
+                for a connection to be returned.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_read_connections = max_read_connections
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._idle_readers: "queue.LifoQueue" = queue.LifoQueue()
+        self._open_readers = 0
+        self._queue: "queue.Queue" = queue.Queue()
+
+        self._writer_connection = self._open_connection()
+        self._writer_connection.execute("PRAGMA journal_mode=WAL")
+        self._writer_connection.executescript(SCHEMA)
+        self._writer_connection.commit()
+
+        self._writer = threading.Thread(target=self._write_loop, name="design-store-writer", daemon=True)
+        self._writer.start()
+
+    # --- Writes ---
+
+    def save_design(
+        self,
+        user_request: str,
+        requirements: PowerSupplyRequirements,
+        plan: List[str],
+        schematic: Schematic,
+        project: Optional[ProjectRequirements] = None
+    ) -> str:
+        """
+        Queues a design for storage and returns its id immediately.
+
+        The design is serialized before this returns, so later edits by the
+        caller are not stored. Use flush() to wait until the write is visible
+        to readers.
+
+        Raises:
+            TypeError: If the requirements or plan are not JSON-serializable.
+        """
+        design_id = uuid.uuid4().hex
+        created_at = time.time()
+        project_row = None
+        if project is not None:
+            project_row = (project.project_name, project.max_length_mm, project.max_width_mm,
+                           project.target_cost_usd, created_at)
+        design_row = (design_id, project and project.project_name, created_at, user_request,
+                      json.dumps(asdict(requirements)), json.dumps(list(plan)),
+                      json.dumps(schematic.to_dict()), schematic.fingerprint())
+        self._queue.put((project_row, design_row))
+        return design_id
+
+    def flush(self):
+        """Blocks until every queued write has been committed."""
+        self._queue.join()
+
+    def close(self):
+        """Flushes pending writes, stops the writer and closes all connections."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+            self._open_readers = 0
+        while not self._idle_readers.empty():
+            self._idle_readers.get_nowait()
+
+    def _write_loop(self):
+        """Writer thread: drains the queue and commits writes in batches."""
+        connection = self._writer_connection
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval_s
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is _STOP
+            items = batch[:-1] if stop else batch
+            try:
+                if items:
+                    self._write_items(connection, items)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_items(self, connection: sqlite3.Connection, items: list):
+        """Commits a batch, falling back to one transaction per design if the batch fails."""
+        try:
+            self._write_batch(connection, items)
+            return
+        except Exception as e:
+            if len(items) == 1:
+                print(f"Design Store: Failed to write design {items[0][1][0]}: {e!r}")
+                return
+            print(f"Design Store: Failed to write a batch of {len(items)} designs, retrying one by one: {e!r}")
+        for item in items:
+            try:
+                self._write_batch(connection, [item])
+            except Exception as e:
+                print(f"Design Store: Failed to write design {item[1][0]}: {e!r}")
+
+    @staticmethod
+    def _write_batch(connection: sqlite3.Connection, items: list):
+        """Commits a batch of serialized designs in a single transaction."""
+        projects = [project_row for project_row, _ in items if project_row is not None]
+        designs = [design_row for _, design_row in items]
+        with connection:
+            connection.executemany(
+                "INSERT INTO projects (name, max_length_mm, max_width_mm, target_cost_usd, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(name) DO UPDATE SET "
+                "max_length_mm=excluded.max_length_mm, max_width_mm=excluded.max_width_mm, "
+                "target_cost_usd=excluded.target_cost_usd, updated_at=excluded.updated_at",
+                projects
+            )
+            connection.executemany("INSERT INTO designs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", designs)
+
+    # --- Reads ---
+
+    def get_design(self, design_id: str) -> Optional[StoredDesign]:
+        """Returns a design by id, or None if it does not exist."""
+        with self._reader() as connection:
+            row = connection.execute("SELECT * FROM designs WHERE id = ?", (design_id,)).fetchone()
+        return self._to_design(row) if row else None
+
+    def get_project(self, name: str) -> Optional[ProjectRequirements]:
+        """Returns the stored requirements of a project, or None if it does not exist."""
+        with self._reader() as connection:
+            row = connection.execute(
+                "SELECT name, max_length_mm, max_width_mm, target_cost_usd FROM projects WHERE name = ?", (name,)
+            ).fetchone()
+        return ProjectRequirements(*row) if row else None
+
+    def list_designs(
+        self,
+        project_name: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50
+    ) -> List[StoredDesign]:
+        """
+        Returns designs newest first, optionally filtered by project and time range.
+
+        Args:
+            project_name: Only return designs of this project.
+            since: Only return designs created at or after this UNIX timestamp.
+            until: Only return designs created before this UNIX timestamp.
+            limit: Maximum number of designs to return.
+        """
+        clauses, params = [], []
+        if project_name is not None:
+            clauses.append("project_name = ?")
+            params.append(project_name)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._reader() as connection:
+            rows = connection.execute(
+                f"SELECT * FROM designs {where} ORDER BY created_at DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [self._to_design(row) for row in rows]
+
+    def find_by_fingerprint(self, fingerprint: str) -> List[StoredDesign]:
+        """Returns every stored design whose schematic has the given fingerprint, newest first."""
+        with self._reader() as connection:
+            rows = connection.execute(
+                "SELECT * FROM designs WHERE fingerprint = ? ORDER BY created_at DESC", (fingerprint,)
+            ).fetchall()
+        return [self._to_design(row) for row in rows]
+
+    # --- Internal helpers ---
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Opens a connection that is closed by close()."""
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connections_lock:
+            self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def _reader(self):
+        """Checks a read connection out of the pool, opening one if the pool is not full yet."""
+        try:
+            connection = self._idle_readers.get_nowait()
+        except queue.Empty:
+            with self._connections_lock:
+                can_open = self._open_readers < self.max_read_connections
+                if can_open:
+                    self._open_readers += 1
+            if not can_open:
+                connection = self._idle_readers.get()
+            else:
+                try:
+                    connection = self._open_connection()
+                except sqlite3.Error:
+                    with self._connections_lock:
+                        self._open_readers -= 1
+                    raise
+        try:
+            yield connection
+        finally:
+            self._idle_readers.put(connection)
+
+    @staticmethod
+    def _to_design(row: sqlite3.Row) -> StoredDesign:
+        """Converts a designs row into a StoredDesign."""
+        return StoredDesign(
+            id=row["id"],
+            project_name=row["project_name"],
+            created_at=row["created_at"],
+            user_request=row["user_request"],
+            requirements=PowerSupplyRequirements(**json.loads(row["requirements"])),
+            plan=json.loads(row["plan"]),
+            schematic=Schematic.from_dict(json.loads(row["schematic"])),
+            fingerprint=row["fingerprint"]
+        )
@@ -0,0 +1,195 @@
+"""
+Fast feasibility pre-check of requirements against the component library.
+
+Bounds such as the fixed output voltages of the regulators, the lowest
+regulator dropout, the highest output current and dissipation any regulator
+survives, and the cheapest possible BOM are computed once from
+COMPONENT_LIBRARY. A request is checked against them with a handful of
+arithmetic comparisons, so impossible requests (stepping 5V up to 12V, a 3.3V
+output from a library of 5V regulators, dissipating tens of Watts in a linear
+regulator, a cost target below the cheapest BOM) are rejected before any AI or
+generator work. The same bounds are propagated back into the requirement
+space to suggest the nearest feasible values.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from core.dc_analysis import OUTPUT_VOLTAGE_TOLERANCE
+from core.requirements import PowerSupplyRequirements, ProjectRequirements
+from core.schematic_generator import COMPONENT_LIBRARY
+
+
+@dataclass(frozen=True)
+class LibraryBounds:
+    """
+    Best-case capabilities of the parts in a component library.
+
+    Each bound is taken over all parts of a kind, so a request that violates
+    it cannot be met by any combination of library parts.
+
+    Attributes:
+        output_voltages_v (Tuple[float, ...]): Fixed output voltages of the linear regulators, ascending.
+        min_dropout_voltage_v (float): Lowest dropout of any linear regulator.
+        min_quiescent_current_a (float): Lowest quiescent current of any linear regulator.
+        max_output_current_a (float): Highest rated output current of any linear regulator.
+        max_dissipation_w (float): Highest power any linear regulator can dissipate.
+        min_bom_cost_usd (float): Cheapest regulator plus the two cheapest capacitors
+            (input and output), a lower bound on the cost of any supply.
+    """
+    output_voltages_v: Tuple[float, ...]
+    min_dropout_voltage_v: float
+    min_quiescent_current_a: float
+    max_output_current_a: float
+    max_dissipation_w: float
+    min_bom_cost_usd: float
+
+
+def compute_library_bounds(library: Mapping[str, Mapping[str, Any]] = COMPONENT_LIBRARY) -> LibraryBounds:
+    """
+    Derives LibraryBounds from a component library.
+
+    Raises:
+        ValueError: If the library has no linear regulator or fewer than two capacitors.
+    """
+    regulators = [spec for spec in library.values()
+                  if spec.get("electrical_model", {}).get("type") == "linear_regulator"]
+    capacitor_costs = sorted(spec.get("unit_cost_usd", 0.0) for spec in library.values()
+                             if spec.get("electrical_model", {}).get("type") == "capacitor")
+    if not regulators or len(capacitor_costs) < 2:
+        raise ValueError("The component library needs a linear regulator and at least two capacitors.")
+    models = [spec["electrical_model"] for spec in regulators]
+    return LibraryBounds(
+        output_voltages_v=tuple(sorted({m["output_voltage_v"] for m in models})),
+        min_dropout_voltage_v=min(m["dropout_voltage_v"] for m in models),
+        min_quiescent_current_a=min(m.get("quiescent_current_a", 0.0) for m in models),
+        max_output_current_a=max(m["max_output_current_a"] for m in models),
+        max_dissipation_w=max(m["max_dissipation_w"] for m in models),
+        min_bom_cost_usd=min(spec.get("unit_cost_usd", 0.0) for spec in regulators) + sum(capacitor_costs[:2]),
+    )
+
+
+# Bounds of the built-in library, computed once at import time.
+LIBRARY_BOUNDS = compute_library_bounds()
+
+
+@dataclass
+class FeasibilityReport:
+    """
+    The outcome of a feasibility check.
+
+    Attributes:
+        reasons (List[str]): Why the requirements cannot be met; empty if they can.
+        suggestions (List[str]): Changes that would make the requirements feasible.
+        limits (Dict[str, float]): Propagated bounds on individual requirements, e.g.
+            "input_voltage_v_min", "input_voltage_v_max", "max_output_current_a_max".
+    """
+    reasons: List[str] = field(default_factory=list)
+    suggestions: List[str] = field(default_factory=list)
+    limits: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def feasible(self) -> bool:
+        """True if no constraint is violated."""
+        return not self.reasons
+
+    @property
+    def message(self) -> str:
+        """Reasons and suggestions as a single sentence-per-item text for the UI."""
+        return " ".join(self.reasons + self.suggestions)
+
+
+def check_feasibility(
+    requirements: PowerSupplyRequirements,
+    project: Optional[ProjectRequirements] = None,
+    bounds: LibraryBounds = LIBRARY_BOUNDS
+) -> FeasibilityReport:
+    """
+    Checks requirements against the library bounds of a linear regulator design.
+
+    Args:
+        requirements: The power supply requirements to check.
+        project: Optional project requirements; their cost target is checked against the cheapest BOM.
+        bounds: Library bounds to check against.
+
+    Returns:
+        A report with the violated constraints, suggestions and propagated limits.
+    """
+    report = FeasibilityReport()
+    vin = requirements.input_voltage_v
+    vout = requirements.output_voltage_v
+    current = requirements.max_output_current_a
+
+    if project is not None and project.target_cost_usd is not None \
+            and project.target_cost_usd < bounds.min_bom_cost_usd:
+        report.reasons.append(f"The target cost of ${project.target_cost_usd:.2f} is below the cheapest "
+                              f"possible BOM of ${bounds.min_bom_cost_usd:.2f}.")
+        report.suggestions.append(f"Raise the target cost to at least ${bounds.min_bom_cost_usd:.2f}.")
+
+    invalid = [name for name, value in (("input voltage", vin), ("output voltage", vout),
+                                        ("output current", current)) if value <= 0]
+    if invalid:
+        report.reasons.append(f"The {', '.join(invalid)} must be positive.")
+        return report
+
+    # Headroom: Vin >= Vout + dropout
+    vin_min = vout + bounds.min_dropout_voltage_v
+    report.limits["input_voltage_v_min"] = vin_min
+    if vout > vin:
+        report.reasons.append(f"A linear regulator cannot step {vin:g}V up to {vout:g}V.")
+        report.suggestions.append(f"Use a switching (boost) regulator, or supply at least {vin_min:g}V.")
+    elif vin < vin_min:
+        report.reasons.append(f"{vin:g}V in leaves {vin - vout:.2f}V of headroom for {vout:g}V out, "
+                              f"but every regulator needs at least {bounds.min_dropout_voltage_v:g}V of dropout.")
+        report.suggestions.append(f"Supply at least {vin_min:g}V, or use a low-dropout or switching regulator.")
+
+    # Current: I <= Imax
+    report.limits["max_output_current_a_max"] = bounds.max_output_current_a
+    if current > bounds.max_output_current_a:
+        report.reasons.append(f"{current:g}A exceeds the {bounds.max_output_current_a:g}A rating "
+                              f"of every regulator in the library.")
+        report.suggestions.append(f"Reduce the output current to {bounds.max_output_current_a:g}A "
+                                  f"or use a switching regulator.")
+
+    # Dissipation: (Vin - Vout) * I + Vin * Iq <= Pmax, propagated to bounds on Vin and I
+    iq = bounds.min_quiescent_current_a
+    p_max = bounds.max_dissipation_w
+    vin_max = (p_max + vout * current) / (current + iq)
+    report.limits["input_voltage_v_max"] = vin_max
+    if vin > vout:
+        current_for_dissipation = max((p_max - vin * iq) / (vin - vout), 0.0)
+        report.limits["max_output_current_a_max"] = min(bounds.max_output_current_a, current_for_dissipation)
+    dissipation = max(vin - vout, 0.0) * current + vin * iq
+    if vin > vout and dissipation > p_max:
+        report.reasons.append(f"A linear regulator would dissipate {dissipation:.1f}W, above the "
+                              f"{p_max:g}W any library part survives.")
+        if vin_max >= vin_min:
+            report.suggestions.append(f"Lower the input voltage to at most {vin_max:.2f}V.")
+        report.suggestions.append(f"Reduce the output current to at most "
+                                  f"{report.limits['max_output_current_a_max']:.2f}A, "
+                                  f"or use a switching (buck) regulator.")
+
+    # Output voltage: |Vout - Vreg| <= tolerance * Vout for some fixed-output regulator,
+    # the same tolerance the DC analysis applies to the output rail
+    if not any(abs(vout - v) <= OUTPUT_VOLTAGE_TOLERANCE * vout for v in bounds.output_voltages_v):
+        available = ", ".join(f"{v:g}V" for v in bounds.output_voltages_v)
+        nearest = min(bounds.output_voltages_v, key=lambda v: abs(v - vout))
+        report.reasons.append(f"No regulator in the library outputs {vout:g}V; "
+                              f"the available fixed outputs are {available}.")
+        report.suggestions.append(f"Use an adjustable or switching regulator for {vout:g}V, "
+                                  f"or design for {nearest:g}V instead.")
+    return report
+
+
+if __name__ == '__main__':
+    # Example usage
+    print(LIBRARY_BOUNDS)
+    for reqs in (
+        PowerSupplyRequirements("OK", input_voltage_v=12.0, output_voltage_v=5.0, max_output_current_a=1.0),
+        PowerSupplyRequirements("Step-up", input_voltage_v=5.0, output_voltage_v=12.0, max_output_current_a=0.5),
+        PowerSupplyRequirements("Hot", input_voltage_v=48.0, output_voltage_v=5.0, max_output_current_a=1.0),
+        PowerSupplyRequirements("3V3", input_voltage_v=12.0, output_voltage_v=3.3, max_output_current_a=0.5),
+    ):
+        report = check_feasibility(reqs, ProjectRequirements("Demo", target_cost_usd=0.10))
+        print(f"\n{reqs.block_name}: feasible={report.feasible}")
+        for line in report.reasons + report.suggestions:
+            print(f"  - {line}")
@@ -0,0 +1,197 @@
+"""
+Canonical, order-independent fingerprints of schematic content and fast diffs.
+
+Every component and net is hashed into a 64-bit leaf. Leaves are summed
+(mod 2**64) into a two-level tree of buckets, so the fingerprint does not depend
+on insertion order. It can be updated in O(1) per edit, and two schematics can
+be diffed by descending only into buckets whose sums differ.
+"""
+import hashlib
+import zlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+if TYPE_CHECKING:
+    from core.schematic import Component, Pin, Schematic
+
+MASK = (1 << 64) - 1
+GROUP_COUNT = 64
+BUCKETS_PER_GROUP = 64
+
+
+def _hash(*parts: str) -> int:
+    """Returns a stable 64-bit hash of the given string parts."""
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def component_hash(component: "Component") -> int:
+    """Returns the leaf hash of a component."""
+    return _hash("C", component.reference_designator, component.part_number, component.description)
+
+
+def pin_hash(pin: "Pin") -> int:
+    """Returns the hash a pin contributes to its net."""
+    return _hash("P", pin.component_ref_des, pin.pin_name)
+
+
+def net_hash(name: str, pin_sum: int) -> int:
+    """Returns the leaf hash of a net from its name and the sum of its pin hashes."""
+    return _hash("N", name, f"{pin_sum:016x}")
+
+
+class _Group:
+    """One of the GROUP_COUNT groups of a MerkleIndex: its buckets and their sums, by offset."""
+    __slots__ = ("buckets", "bucket_sums", "total")
+
+    def __init__(self, buckets: List[Optional[Dict[str, int]]], bucket_sums: List[int], total: int):
+        self.buckets = buckets
+        self.bucket_sums = bucket_sums
+        self.total = total
+
+
+class MerkleIndex:
+    """
+    A keyed multiset of 64-bit leaf hashes with additive bucket sums.
+
+    copy() is cheap: only the table of GROUP_COUNT groups is copied. Groups
+    (with their bucket sums) and buckets are shared with the copy and
+    duplicated only when one side first writes to them.
+    """
+    def __init__(self):
+        self._groups: List[Optional[_Group]] = [None] * GROUP_COUNT
+        self._owned_groups: Set[int] = set()
+        self._owned_buckets: Set[int] = set()
+        self.root = 0
+
+    @staticmethod
+    def _bucket_of(key: str) -> int:
+        """Maps a key to its bucket; the group is bucket // BUCKETS_PER_GROUP."""
+        return zlib.crc32(key.encode("utf-8")) % (GROUP_COUNT * BUCKETS_PER_GROUP)
+
+    def get(self, key: str) -> Optional[int]:
+        """Returns the leaf hash stored under a key, if any."""
+        g, offset = divmod(self._bucket_of(key), BUCKETS_PER_GROUP)
+        group = self._groups[g]
+        bucket = group.buckets[offset] if group else None
+        return bucket.get(key) if bucket else None
+
+    def add(self, key: str, value: int):
+        """Adds a hash to the leaf stored under a key."""
+        self._update(key, value)
+
+    def discard(self, key: str, value: int):
+        """Subtracts a hash previously added under a key."""
+        self._update(key, -value)
+
+    def _update(self, key: str, delta: int):
+        b = self._bucket_of(key)
+        g, offset = divmod(b, BUCKETS_PER_GROUP)
+        group = self._groups[g]
+        if g not in self._owned_groups:
+            group = _Group(list(group.buckets), list(group.bucket_sums), group.total) if group \
+                else _Group([None] * BUCKETS_PER_GROUP, [0] * BUCKETS_PER_GROUP, 0)
+            self._groups[g] = group
+            self._owned_groups.add(g)
+        bucket = group.buckets[offset]
+        if b not in self._owned_buckets:
+            bucket = dict(bucket) if bucket else {}
+            group.buckets[offset] = bucket
+            self._owned_buckets.add(b)
+        leaf = (bucket.get(key, 0) + delta) & MASK
+        if leaf:
+            bucket[key] = leaf
+        else:
+            bucket.pop(key, None)
+
+        group.bucket_sums[offset] = (group.bucket_sums[offset] + delta) & MASK
+        group.total = (group.total + delta) & MASK
+        self.root = (self.root + delta) & MASK
+
+    def copy(self) -> "MerkleIndex":
+        """Returns a copy that shares groups and buckets until either side writes."""
+        clone = MerkleIndex()
+        clone._groups = list(self._groups)
+        clone.root = self.root
+        self._owned_groups = set()
+        self._owned_buckets = set()
+        return clone
+
+    def changed_keys(self, other: "MerkleIndex") -> List[str]:
+        """
+        Returns the keys whose leaves differ between two indexes.
+
+        Only groups and buckets with differing sums are visited, so the cost is
+        proportional to the number of differences rather than the index size.
+        """
+        if self.root == other.root:
+            return []
+        keys: List[str] = []
+        for mine, theirs in zip(self._groups, other._groups):
+            if mine is theirs or (mine.total if mine else 0) == (theirs.total if theirs else 0):
+                continue
+            for offset in range(BUCKETS_PER_GROUP):
+                left = mine.buckets[offset] if mine else None
+                right = theirs.buckets[offset] if theirs else None
+                if left is right or (mine.bucket_sums[offset] if mine else 0) == \
+                        (theirs.bucket_sums[offset] if theirs else 0):
+                    continue
+                left, right = left or {}, right or {}
+                keys.extend(k for k in left.keys() | right.keys() if left.get(k) != right.get(k))
+        return keys
+
+
+@dataclass
+class SchematicDiff:
+    """
+    The differences between two schematics, by designator and net name.
+
+    Attributes:
+        added_components (List[str]): Designators only present in the new schematic.
+        removed_components (List[str]): Designators only present in the old schematic.
+        changed_components (List[str]): Designators whose part or description changed.
+        added_nets (List[str]): Net names only present in the new schematic.
+        removed_nets (List[str]): Net names only present in the old schematic.
+        changed_nets (List[str]): Net names whose pin set changed.
+    """
+    added_components: List[str] = field(default_factory=list)
+    removed_components: List[str] = field(default_factory=list)
+    changed_components: List[str] = field(default_factory=list)
+    added_nets: List[str] = field(default_factory=list)
+    removed_nets: List[str] = field(default_factory=list)
+    changed_nets: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the two schematics have identical content."""
+        return not any((self.added_components, self.removed_components, self.changed_components,
+                        self.added_nets, self.removed_nets, self.changed_nets))
+
+
+def diff_schematics(old: "Schematic", new: "Schematic") -> SchematicDiff:
+    """
+    Compares two schematics using their incrementally maintained sub-hashes.
+
+    Args:
+        old: The reference schematic.
+        new: The schematic to compare against it.
+
+    Returns:
+        The added, removed and changed components and nets, each sorted by name.
+    """
+    diff = SchematicDiff()
+    pairs = (
+        (old._component_hashes, new._component_hashes,
+         diff.added_components, diff.removed_components, diff.changed_components),
+        (old._net_hashes, new._net_hashes, diff.added_nets, diff.removed_nets, diff.changed_nets),
+    )
+    for old_index, new_index, added, removed, changed in pairs:
+        for key in sorted(old_index.changed_keys(new_index)):
+            before, after = old_index.get(key), new_index.get(key)
+            if before is None:
+                added.append(key)
+            elif after is None:
+                removed.append(key)
+            else:
+                changed.append(key)
+    return diff
@@ -0,0 +1,286 @@
+"""
+Hierarchical schematics built from shared, flyweight block definitions.
+
+A BlockDefinition captures a sub-circuit (e.g. a regulator with its input and
+output capacitors) once. A HierarchicalSchematic instantiates it any number of
+times, binding the block's ports to top-level nets. Instances only store a
+reference to their definition and their port bindings, so memory grows with
+the number of unique blocks rather than the total part count. flatten()
+returns a lazy, flat view for exporters and templates.
+"""
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import Dict, FrozenSet, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from core.orchestrator import DesignOrchestrator
+from core.requirements import PowerSupplyRequirements
+from core.schematic import Component, Net, Pin, Schematic
+
+# Separator between an instance name and the designator or net name it prefixes.
+HIERARCHY_SEPARATOR = "/"
+
+
+@dataclass(frozen=True)
+class BlockDefinition:
+    """
+    An immutable, hashable sub-circuit that can be instantiated many times.
+
+    Attributes:
+        name (str): Name of the block.
+        components (Tuple[Tuple[str, str, str], ...]): The block's components as
+            (reference designator, part number, description).
+        nets (Tuple[Tuple[str, FrozenSet[Pin]], ...]): The block's internal nets and their pins.
+        ports (Tuple[Tuple[str, str], ...]): Pairs of (port name, internal net name).
+    """
+    name: str
+    components: Tuple[Tuple[str, str, str], ...]
+    nets: Tuple[Tuple[str, FrozenSet[Pin]], ...]
+    ports: Tuple[Tuple[str, str], ...]
+
+    @classmethod
+    def from_schematic(
+        cls,
+        name: str,
+        schematic: Schematic,
+        ports: Optional[Mapping[str, str]] = None
+    ) -> "BlockDefinition":
+        """
+        Captures a schematic as a block definition.
+
+        Args:
+            name: Name of the block.
+            schematic: The schematic to capture; later edits to it do not affect the block.
+            ports: Mapping of port name to internal net name. Defaults to exposing
+                every net as a port named after it.
+
+        Raises:
+            ValueError: If a port refers to a net that does not exist.
+        """
+        nets = tuple((net.name, frozenset(net.pins)) for net in schematic.nets)
+        net_names = {net_name for net_name, _ in nets}
+        ports = dict(ports) if ports is not None else {net_name: net_name for net_name, _ in nets}
+        unknown = sorted(set(ports.values()) - net_names)
+        if unknown:
+            raise ValueError(f"Block '{name}' has ports bound to unknown nets: {unknown}")
+        components = tuple((c.reference_designator, c.part_number, c.description) for c in schematic.components)
+        return cls(name=name, components=components, nets=nets,
+                   ports=tuple(sorted(ports.items())))
+
+    @property
+    def port_names(self) -> List[str]:
+        """Returns the names of the block's ports."""
+        return [port for port, _ in self.ports]
+
+    @cached_property
+    def port_of_net(self) -> Dict[str, str]:
+        """Maps each internal net exposed as a port to its port name."""
+        return {net_name: port for port, net_name in self.ports}
+
+
+class BlockInstance:
+    """
+    A flyweight placement of a block definition under an instance name.
+    """
+    __slots__ = ("name", "definition", "bindings")
+
+    def __init__(self, name: str, definition: BlockDefinition, bindings: Mapping[str, str]):
+        self.name = name
+        self.definition = definition
+        self.bindings = dict(bindings)
+
+    def net_name(self, internal_net: str) -> str:
+        """Returns the flattened name of one of the block's internal nets."""
+        port = self.definition.port_of_net.get(internal_net)
+        if port is not None and port in self.bindings:
+            return self.bindings[port]
+        return f"{self.name}{HIERARCHY_SEPARATOR}{internal_net}"
+
+    def designator(self, reference_designator: str) -> str:
+        """Returns the flattened reference designator of one of the block's components."""
+        return f"{self.name}{HIERARCHY_SEPARATOR}{reference_designator}"
+
+
+class FlatView:
+    """
+    A lazy, read-only flat view of a hierarchical schematic.
+
+    It exposes `components` and `nets` like Schematic, so exporters and templates
+    can consume it directly. Each list is only built the first time it is read.
+    """
+    def __init__(self, top: Schematic, instances: Sequence[BlockInstance]):
+        self._top = top
+        self._instances = list(instances)
+
+    def iter_components(self) -> Iterator[Component]:
+        """Yields every flattened component without materializing the list."""
+        yield from self._top.components
+        for instance in self._instances:
+            for reference_designator, part_number, description in instance.definition.components:
+                yield Component(
+                    reference_designator=instance.designator(reference_designator),
+                    part_number=part_number,
+                    description=description
+                )
+
+    @cached_property
+    def components(self) -> List[Component]:
+        """All components, with instance components prefixed by their instance name."""
+        return list(self.iter_components())
+
+    @cached_property
+    def nets(self) -> List[Net]:
+        """All nets, with port nets merged into the top-level nets they are bound to."""
+        pins_by_net: Dict[str, set] = {}
+        for net in self._top.nets:
+            pins_by_net.setdefault(net.name, set()).update(net.pins)
+        for instance in self._instances:
+            for internal_net, pins in instance.definition.nets:
+                target = pins_by_net.setdefault(instance.net_name(internal_net), set())
+                target.update(Pin(instance.designator(pin.component_ref_des), pin.pin_name) for pin in pins)
+        return [Net(name=name, pins=pins) for name, pins in pins_by_net.items()]
+
+    @cached_property
+    def _net_index(self) -> Dict[str, Net]:
+        return {net.name: net for net in self.nets}
+
+    def find_net(self, name: str) -> Optional[Net]:
+        """Finds a flattened net by its name."""
+        return self._net_index.get(name)
+
+    def to_schematic(self) -> Schematic:
+        """Materializes the view as a regular, editable Schematic."""
+        return Schematic(components=list(self.components), nets=[Net(n.name, set(n.pins)) for n in self.nets])
+
+
+class HierarchicalSchematic:
+    """
+    A top-level schematic plus instances of shared block definitions.
+    """
+    def __init__(self, top: Optional[Schematic] = None):
+        """
+        Args:
+            top: Schematic holding top-level components and nets. A new one is created if omitted.
+        """
+        self.top = top or Schematic()
+        self.instances: List[BlockInstance] = []
+        self._instance_names = set()
+
+    def instantiate(
+        self,
+        definition: BlockDefinition,
+        instance_name: str,
+        bindings: Optional[Mapping[str, str]] = None
+    ) -> BlockInstance:
+        """
+        Places a block and binds its ports to top-level nets.
+
+        Unbound ports become nets local to the instance.
+
+        Args:
+            definition: The block to place.
+            instance_name: Unique name of the instance, used to prefix designators.
+            bindings: Mapping of port name to top-level net name.
+
+        Raises:
+            ValueError: If the instance name is taken or a binding names an unknown port.
+        """
+        if instance_name in self._instance_names:
+            raise ValueError(f"Instance name '{instance_name}' is already used.")
+        bindings = dict(bindings or {})
+        unknown = sorted(set(bindings) - set(definition.port_names))
+        if unknown:
+            raise ValueError(f"Block '{definition.name}' has no ports named {unknown}.")
+        instance = BlockInstance(instance_name, definition, bindings)
+        self.instances.append(instance)
+        self._instance_names.add(instance_name)
+        return instance
+
+    @property
+    def definitions(self) -> List[BlockDefinition]:
+        """Returns the unique block definitions in use, in first-use order."""
+        unique: Dict[int, BlockDefinition] = {}
+        for instance in self.instances:
+            unique.setdefault(id(instance.definition), instance.definition)
+        return list(unique.values())
+
+    @property
+    def part_count(self) -> int:
+        """Returns the total number of parts in the flattened design, without flattening it."""
+        return len(self.top.components) + sum(len(i.definition.components) for i in self.instances)
+
+    def flatten(self) -> FlatView:
+        """Returns a lazy flat view of the current design."""
+        return FlatView(self.top, self.instances)
+
+
+class BlockLibrary:
+    """
+    Generates block definitions from design plans, once per unique plan and requirements.
+
+    Requesting the same content under another name returns a renamed block that
+    shares the generated components and nets.
+    """
+    def __init__(self, orchestrator: Optional[DesignOrchestrator] = None):
+        self.orchestrator = orchestrator or DesignOrchestrator()
+        self._generated: Dict[Tuple, BlockDefinition] = {}
+        self._blocks: Dict[Tuple, BlockDefinition] = {}
+
+    def get_block(
+        self,
+        name: str,
+        design_plan: Sequence[str],
+        requirements: PowerSupplyRequirements,
+        ports: Optional[Mapping[str, str]] = None
+    ) -> BlockDefinition:
+        """
+        Returns the block generated by a plan, generating it only on first request.
+
+        Args:
+            name: Name given to a newly generated block.
+            design_plan: The generator commands that build the block.
+            requirements: The requirements the block is generated for.
+            ports: Mapping of port name to internal net name; every net by default.
+        """
+        key = (
+            tuple(design_plan),
+            requirements.input_voltage_v,
+            requirements.output_voltage_v,
+            requirements.max_output_current_a,
+            tuple(requirements.protection_features or []),
+            tuple(sorted(ports.items())) if ports is not None else None,
+        )
+        block = self._blocks.get((name, key))
+        if block is None:
+            generated = self._generated.get(key)
+            if generated is None:
+                schematic = self.orchestrator.execute_plan(list(design_plan), requirements)
+                generated = self._generated[key] = BlockDefinition.from_schematic(name, schematic, ports)
+            block = generated if generated.name == name else replace(generated, name=name)
+            self._blocks[(name, key)] = block
+        return block
+
+
+if __name__ == '__main__':
+    # Example usage: a 16-channel board where every channel has its own 5V rail
+    reqs = PowerSupplyRequirements(
+        block_name="Channel PSU",
+        input_voltage_v=12.0,
+        output_voltage_v=5.0,
+        max_output_current_a=0.5
+    )
+    library = BlockLibrary()
+    psu = library.get_block(
+        "PSU_5V",
+        ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"],
+        reqs,
+        ports={"VIN": "VIN_12.0V", "VOUT": "VOUT_5.0V", "GND": "GND"}
+    )
+
+    board = HierarchicalSchematic()
+    for channel in range(1, 17):
+        board.instantiate(psu, f"CH{channel}", {"VIN": "VIN_12V", "VOUT": f"CH{channel}_5V", "GND": "GND"})
+
+    flat = board.flatten()
+    print(f"\nUnique blocks: {len(board.definitions)}, total parts: {board.part_count}")
+    print(f"Flattened: {len(flat.components)} components, {len(flat.nets)} nets")
+    print(f"VIN_12V connects {len(flat.find_net('VIN_12V').pins)} pins")
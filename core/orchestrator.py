@@ -1,59 +1,156 @@
 """
 The DesignOrchestrator coordinates the AI strategy and schematic generation services.
 """
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Tuple
 
+from core.admission import AdmissionController, Deadline, Priority
 from core.ai_strategy import AIStrategyService
-from core.requirements import PowerSupplyRequirements
+from core.feasibility import FeasibilityReport, check_feasibility
+from core.requirements import PowerSupplyRequirements, ProjectRequirements
 from core.schematic import Schematic
 from core.schematic_generator import SchematicGenerator
 
+class InvalidPlanError(ValueError):
+    """Raised when a design plan contains a step the generator cannot execute."""
+
+class InfeasibleRequirementsError(ValueError):
+    """Raised when requirements fail the feasibility pre-check; carries the FeasibilityReport."""
+    def __init__(self, report: FeasibilityReport):
+        super().__init__(" ".join(report.reasons))
+        self.report = report
+
 class DesignOrchestrator:
     """
     Coordinates the entire design process, from user request to final schematic.
     """
-    def __init__(self):
-        self.ai_strategy_service = AIStrategyService()
+    def __init__(
+        self,
+        admission_controller: Optional[AdmissionController] = None,
+        ai_strategy_service: Optional[AIStrategyService] = None
+    ):
+        self.ai_strategy_service = ai_strategy_service or AIStrategyService()
         self.schematic_generator = SchematicGenerator()
+        self.admission_controller = admission_controller or AdmissionController()
 
     def create_schematic_from_request(
         self,
         user_request: str,
-        requirements: PowerSupplyRequirements
+        requirements: PowerSupplyRequirements,
+        deadline: Optional[Deadline] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        project: Optional[ProjectRequirements] = None
     ) -> Tuple[Schematic, List[str]]:
         """
         Orchestrates the design process.
 
-        1. Gets a design plan from the AI Strategy Service.
-        2. Executes the plan step-by-step using the Schematic Generator.
+        0. Rejects requirements that no part in the library can meet, before any AI work.
+        1. If the AI Strategy Service already knows the complete plan (e.g. a
+           retrieval hit), builds it at once with execute_plan, which stamps the
+           generator's cached template for that plan.
+        2. Otherwise streams the design plan from the AI Strategy Service, and
+           validates and executes each step with the Schematic Generator as soon
+           as it arrives, so schematic building overlaps with plan generation.
         3. Returns the final schematic and the plan that was executed.
 
+        If the plan stream fails or yields an invalid step, every step executed so
+        far is rolled back and the error is re-raised.
+
+        The AI step runs under the admission controller, which bounds concurrency
+        and sheds requests that cannot be served before their deadline.
+
         Args:
             user_request: The user's natural language request.
             requirements: The detailed, parameterized requirements.
+            deadline: Optional deadline passed through to the AI service and generator.
+            priority: Priority class used when waiting for the AI service.
+            project: Optional project requirements, whose cost target is also pre-checked.
 
         Returns:
             A tuple containing the generated schematic and the design plan.
+
+        Raises:
+            InfeasibleRequirementsError: If the requirements fail the feasibility pre-check.
+            InvalidPlanError: If the AI produced a step the generator does not support.
+            Overloaded: If the request was shed by the admission controller.
+            DeadlineExceeded: If the deadline passed or cannot be met.
         """
         print("Orchestrator: Starting design process.")
 
-        # 1. Get the design plan from the AI
-        design_plan = self.ai_strategy_service.get_design_plan(user_request)
-
-        # 2. Create an empty schematic to build upon
-        schematic = Schematic()
+        report = check_feasibility(requirements, project)
+        if not report.feasible:
+            print(f"Orchestrator: Requirements are infeasible: {report.message}")
+            raise InfeasibleRequirementsError(report)
 
-        # 3. Execute the plan step-by-step
-        if not design_plan:
-            print("Orchestrator: AI returned an empty plan. Nothing to generate.")
-        else:
-            print(f"Orchestrator: Executing AI plan: {design_plan}")
-            for command in design_plan:
-                self.schematic_generator.execute_command(command, schematic, requirements)
+        with self.admission_controller.admit(priority, deadline):
+            design_plan = self.ai_strategy_service.known_plan(user_request)
+            if design_plan is not None:
+                schematic = self.execute_plan(design_plan, requirements, deadline)
+            else:
+                plan_stream = self.ai_strategy_service.iter_generated_plan(user_request, deadline)
+                schematic, design_plan = self._execute_steps(plan_stream, requirements, deadline)
 
         print("Orchestrator: Design process complete.")
         return schematic, design_plan
 
+    def execute_plan(
+        self,
+        design_plan: List[str],
+        requirements: PowerSupplyRequirements,
+        deadline: Optional[Deadline] = None
+    ) -> Schematic:
+        """
+        Builds a new schematic by executing an existing design plan.
+
+        This skips the AI step entirely, so callers that already hold a plan
+        (e.g. design-space sweeps) can reuse it across many requirement sets.
+
+        Args:
+            design_plan: The list of generator commands to execute.
+            requirements: The detailed, parameterized requirements.
+            deadline: Optional deadline passed through to the generator.
+
+        Returns:
+            The generated schematic.
+
+        Raises:
+            InvalidPlanError: If the plan contains a step the generator does not support.
+            DeadlineExceeded: If the deadline passes while building.
+        """
+        for step, command in enumerate(design_plan, start=1):
+            if not self.schematic_generator.supports(command):
+                raise InvalidPlanError(f"Plan step {step} is not a supported command: '{command}'.")
+        # The whole plan is known up front, so the generator can stamp a cached template
+        return self.schematic_generator.execute_plan(design_plan, requirements, deadline)
+
+    def _execute_steps(
+        self,
+        steps: Iterable[str],
+        requirements: PowerSupplyRequirements,
+        deadline: Optional[Deadline] = None
+    ) -> Tuple[Schematic, List[str]]:
+        """
+        Executes plan steps in arrival order inside a single schematic transaction.
+        """
+        schematic = Schematic()
+        executed: List[str] = []
+        schematic.begin()
+        try:
+            for command in steps:
+                if not self.schematic_generator.supports(command):
+                    raise InvalidPlanError(f"Plan step {len(executed) + 1} is not a supported command: '{command}'.")
+                print(f"Orchestrator: Executing plan step {len(executed) + 1}: {command}")
+                self.schematic_generator.execute_command(command, schematic, requirements, deadline)
+                executed.append(command)
+        except BaseException as e:
+            schematic.rollback()
+            print(f"Orchestrator: Plan aborted after {len(executed)} step(s), rolled back: {e!r}")
+            raise
+        schematic.commit()
+
+        if not executed:
+            print("Orchestrator: AI returned an empty plan. Nothing to generate.")
+        return schematic, executed
+
 if __name__ == '__main__':
     # Example Usage
     orchestrator = DesignOrchestrator()
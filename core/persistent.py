@@ -0,0 +1,292 @@
+"""
+Persistent containers with O(1) copies, used for schematic snapshots.
+
+Both containers are 32-way tries. copy() shares the whole trie with the copy;
+afterwards a write copies only the nodes on the path to the changed slot, so
+branching costs memory proportional to the edits rather than to the size of
+the container. Nodes are tagged with the token of the container that created
+them and are modified in place while that container still owns them.
+"""
+from typing import Any, Generic, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+V = TypeVar("V")
+
+BITS = 5
+WIDTH = 1 << BITS
+SLOT_MASK = WIDTH - 1
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+# Entries a map leaf holds before it is split into a branch
+LEAF_SIZE = 8
+
+
+class _Node:
+    """A trie node: a list of children or items, or (map leaves only) a dict of entries."""
+    __slots__ = ("owner", "items")
+
+    def __init__(self, owner: object, items):
+        self.owner = owner
+        self.items = items
+
+
+class PersistentVector(Generic[T]):
+    """
+    A list-like sequence supporting append, pop, indexing and item assignment.
+
+    Leaves hold up to WIDTH items and every branch level indexes BITS more bits
+    of the position, so reads and writes touch O(log32 n) nodes.
+    """
+    def __init__(self, items: Iterable[T] = ()):
+        self._owner = object()
+        self._root = _Node(self._owner, [])
+        self._shift = 0
+        self._len = 0
+        for item in items:
+            self.append(item)
+
+    def copy(self) -> "PersistentVector[T]":
+        """Returns a copy sharing every node; neither side modifies them in place afterwards."""
+        clone = PersistentVector()
+        clone._root = self._root
+        clone._shift = self._shift
+        clone._len = self._len
+        self._owner = object()
+        return clone
+
+    def append(self, item: T):
+        """Appends an item."""
+        if self._len == WIDTH << self._shift:
+            self._root = _Node(self._owner, [self._root])
+            self._shift += BITS
+        node = self._root = self._editable(self._root)
+        shift = self._shift
+        while shift > 0:
+            slot = (self._len >> shift) & SLOT_MASK
+            if slot == len(node.items):
+                node.items.append(_Node(self._owner, []))
+            else:
+                node.items[slot] = self._editable(node.items[slot])
+            node = node.items[slot]
+            shift -= BITS
+        node.items.append(item)
+        self._len += 1
+
+    def pop(self) -> T:
+        """Removes and returns the last item."""
+        if not self._len:
+            raise IndexError("pop from empty vector")
+        path = self._edit_path(self._len - 1)
+        item = path[-1].items.pop()
+        self._len -= 1
+        # Drop emptied nodes so the next append recreates them in place
+        for parent, child in zip(reversed(path[:-1]), reversed(path[1:])):
+            if child.items:
+                break
+            parent.items.pop()
+        while self._shift and len(self._root.items) == 1:
+            self._root = self._root.items[0]
+            self._shift -= BITS
+        return item
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return list(self)[index]
+        index = self._check_index(index)
+        node = self._root
+        shift = self._shift
+        while shift > 0:
+            node = node.items[(index >> shift) & SLOT_MASK]
+            shift -= BITS
+        return node.items[index & SLOT_MASK]
+
+    def __setitem__(self, index: int, item: T):
+        index = self._check_index(index)
+        self._edit_path(index)[-1].items[index & SLOT_MASK] = item
+
+    def __iter__(self) -> Iterator[T]:
+        return self._iter(self._root, self._shift)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (PersistentVector, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PersistentVector({list(self)!r})"
+
+    def _iter(self, node: _Node, shift: int) -> Iterator[T]:
+        """Yields the items below a node in order."""
+        if shift == 0:
+            yield from node.items
+        else:
+            for child in node.items:
+                yield from self._iter(child, shift - BITS)
+
+    def _check_index(self, index: int) -> int:
+        """Normalizes a negative index and raises IndexError if it is out of range."""
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("vector index out of range")
+        return index
+
+    def _editable(self, node: _Node) -> _Node:
+        """Returns the node itself if this vector owns it, or an owned copy."""
+        return node if node.owner is self._owner else _Node(self._owner, list(node.items))
+
+    def _edit_path(self, index: int) -> List[_Node]:
+        """Makes the nodes from the root to the leaf holding index owned, and returns them."""
+        node = self._root = self._editable(self._root)
+        path = [node]
+        shift = self._shift
+        while shift > 0:
+            slot = (index >> shift) & SLOT_MASK
+            node.items[slot] = self._editable(node.items[slot])
+            node = node.items[slot]
+            path.append(node)
+            shift -= BITS
+        return path
+
+
+class PersistentMap(Generic[V]):
+    """
+    A hash trie mapping keys to values, supporting get, in, setdefault and del.
+
+    Each branch level indexes BITS bits of hash(key). Leaves are small dicts
+    that are split into a branch once they exceed LEAF_SIZE entries.
+    """
+    def __init__(self):
+        self._owner = object()
+        self._root = _Node(self._owner, [None] * WIDTH)
+        self._len = 0
+
+    def copy(self) -> "PersistentMap[V]":
+        """Returns a copy sharing every node; neither side modifies them in place afterwards."""
+        clone = PersistentMap()
+        clone._root = self._root
+        clone._len = self._len
+        self._owner = object()
+        return clone
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        """Returns the value stored under a key, or default."""
+        leaf = self._find_leaf(key)
+        return leaf.items.get(key, default) if leaf is not None else default
+
+    def setdefault(self, key: Hashable, value: V) -> V:
+        """Stores value under key unless the key is present; returns the stored value."""
+        leaf = self._find_leaf(key)
+        if leaf is not None and key in leaf.items:
+            return leaf.items[key]
+        self[key] = value
+        return value
+
+    def __getitem__(self, key: Hashable) -> V:
+        leaf = self._find_leaf(key)
+        if leaf is None or key not in leaf.items:
+            raise KeyError(key)
+        return leaf.items[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        leaf = self._find_leaf(key)
+        return leaf is not None and key in leaf.items
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __setitem__(self, key: Hashable, value: V):
+        h = hash(key) & HASH_MASK
+        node = self._root = self._editable(self._root)
+        shift = 0
+        while True:
+            slot = (h >> shift) & SLOT_MASK
+            child = node.items[slot]
+            if child is None:
+                node.items[slot] = _Node(self._owner, {key: value})
+                self._len += 1
+                return
+            if isinstance(child.items, dict):
+                if key in child.items or len(child.items) < LEAF_SIZE or shift + BITS >= HASH_BITS:
+                    child = node.items[slot] = self._editable(child)
+                    self._len += key not in child.items
+                    child.items[key] = value
+                    return
+                child = self._split(child, shift + BITS)
+            else:
+                child = self._editable(child)
+            node.items[slot] = child
+            node = child
+            shift += BITS
+
+    def __delitem__(self, key: Hashable):
+        h = hash(key) & HASH_MASK
+        node = self._root = self._editable(self._root)
+        shift = 0
+        while True:
+            slot = (h >> shift) & SLOT_MASK
+            child = node.items[slot]
+            if child is None:
+                raise KeyError(key)
+            child = node.items[slot] = self._editable(child)
+            if isinstance(child.items, dict):
+                del child.items[key]
+                if not child.items:
+                    node.items[slot] = None
+                self._len -= 1
+                return
+            node = child
+            shift += BITS
+
+    def __iter__(self) -> Iterator[Hashable]:
+        for key, _ in self._entries(self._root):
+            yield key
+
+    def items(self) -> Iterator[Tuple[Hashable, V]]:
+        """Yields the (key, value) pairs in no particular order."""
+        return self._entries(self._root)
+
+    def __repr__(self) -> str:
+        return f"PersistentMap({dict(self.items())!r})"
+
+    def _entries(self, node: _Node) -> Iterator[Tuple[Hashable, V]]:
+        """Yields the entries below a node."""
+        if isinstance(node.items, dict):
+            yield from node.items.items()
+            return
+        for child in node.items:
+            if child is not None:
+                yield from self._entries(child)
+
+    def _find_leaf(self, key: Hashable) -> Optional[_Node]:
+        """Returns the leaf a key belongs in, or None if it has no leaf."""
+        h = hash(key) & HASH_MASK
+        node = self._root
+        shift = 0
+        while not isinstance(node.items, dict):
+            node = node.items[(h >> shift) & SLOT_MASK]
+            if node is None:
+                return None
+            shift += BITS
+        return node
+
+    def _split(self, leaf: _Node, shift: int) -> _Node:
+        """Returns an owned branch holding a full leaf's entries, indexed at the given shift."""
+        branch = _Node(self._owner, [None] * WIDTH)
+        for key, value in leaf.items.items():
+            slot = ((hash(key) & HASH_MASK) >> shift) & SLOT_MASK
+            if branch.items[slot] is None:
+                branch.items[slot] = _Node(self._owner, {})
+            branch.items[slot].items[key] = value
+        return branch
+
+    def _editable(self, node: _Node) -> _Node:
+        """Returns the node itself if this map owns it, or an owned copy."""
+        if node.owner is self._owner:
+            return node
+        return _Node(self._owner, dict(node.items) if isinstance(node.items, dict) else list(node.items))
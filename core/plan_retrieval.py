@@ -0,0 +1,373 @@
+"""
+Nearest-neighbor retrieval of design plans for previously seen requests.
+
+Requests are embedded with a dependency-free hashed n-gram vectorizer and
+stored in an index of accepted request -> plan pairs. A paraphrase of an
+earlier request ("5 volt supply for a Pi" vs "need 5V PSU") is answered from
+the index instead of paying for another full AI call.
+"""
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core.admission import Deadline
+from core.ai_strategy import AIStrategyService
+
+# Word-level rewrites applied before vectorizing, so common abbreviations and
+# spelled-out units map to the same tokens.
+_SYNONYMS = {
+    "volt": "v", "volts": "v", "voltage": "v",
+    "amp": "a", "amps": "a", "ampere": "a", "amperes": "a",
+    "milliamp": "ma", "milliamps": "ma",
+    "psu": "power supply", "regulator": "power supply", "rail": "power supply",
+}
+_STOPWORDS = {
+    "a", "an", "the", "i", "me", "my", "we", "our", "for", "to", "of", "and", "with",
+    "need", "want", "please", "design", "build", "make", "some", "can", "you", "get",
+}
+# Words that end the main noun phrase of a request ("5V supply | for a Pi").
+_PHRASE_END_RE = re.compile(r"\b(?:for|at|with|to|on|from|in|into|that|which|using)\b")
+# Minimum cosine similarity for a stored plan to be reused, on top of the
+# quantity and head-noun guards of PlanIndex. Chosen on the tuning split of
+# benchmarks/bench_plan_retrieval.py, with short seeds like the requests
+# /generate stores ("I need a 5V power supply.") and longer ones; the lowest
+# tuning paraphrase scores 0.36. The held-out split is only reported.
+DEFAULT_SIMILARITY_THRESHOLD = 0.34
+
+_TOKEN_RE = re.compile(r"\d+(?:\.\d+)?|[a-z]+")
+_QUANTITY_RE = re.compile(r"^\d+(?:\.\d+)?[a-z]+$")
+
+
+def head_noun(text: str) -> str:
+    """
+    Returns the head of a request's main noun phrase, e.g. "supply" for
+    "5V power supply for a Pi" and "switch" for "5V power switch".
+
+    The head is the last non-quantity token before the first preposition, or
+    of the whole request if nothing precedes one. Empty if there is none.
+    """
+    for part in (_PHRASE_END_RE.split(text.lower(), 1)[0], text):
+        words = [t for t in tokenize(part) if not _QUANTITY_RE.match(t)]
+        if words:
+            return words[-1]
+    return ""
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Normalizes a request into tokens.
+
+    Lowercases, expands synonyms, drops stopwords, and joins numbers with the
+    unit that follows them ("5 volt" -> "5v").
+    """
+    raw = _TOKEN_RE.findall(text.lower())
+    words: List[str] = []
+    for word in raw:
+        words.extend(_SYNONYMS.get(word, word).split())
+    tokens: List[str] = []
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word[0].isdigit() and i + 1 < len(words) and words[i + 1] in ("v", "a", "ma", "w", "mm"):
+            tokens.append(word + words[i + 1])
+            i += 2
+            continue
+        if word not in _STOPWORDS:
+            tokens.append(word)
+        i += 1
+    return tokens
+
+
+class HashedNgramVectorizer:
+    """
+    Embeds text as an L2-normalized sparse vector of hashed word and character n-grams.
+    """
+    def __init__(self, n_features: int = 1 << 18, char_ngram: int = 3, quantity_weight: float = 0.5):
+        """
+        Args:
+            n_features: Size of the hashed feature space.
+            char_ngram: Length of the character n-grams taken from each word.
+            quantity_weight: Weight of number+unit tokens such as "5v", relative to other words.
+                PlanIndex already requires identical quantities, so a low weight keeps
+                a shared "5v" from making unrelated short requests look similar.
+        """
+        self.n_features = n_features
+        self.char_ngram = char_ngram
+        self.quantity_weight = quantity_weight
+
+    def _feature(self, kind: str, value: str) -> int:
+        return zlib.crc32(f"{kind}:{value}".encode("utf-8")) % self.n_features
+
+    def transform(self, text: str) -> Dict[int, float]:
+        """Returns the sparse embedding of a text as {feature index: weight}."""
+        tokens = tokenize(text)
+        vector: Dict[int, float] = {}
+
+        def add(feature: int, weight: float):
+            vector[feature] = vector.get(feature, 0.0) + weight
+
+        for token in tokens:
+            add(self._feature("w", token), self.quantity_weight if _QUANTITY_RE.match(token) else 1.0)
+            padded = f"<{token}>"
+            for i in range(len(padded) - self.char_ngram + 1):
+                add(self._feature("c", padded[i:i + self.char_ngram]), 0.25)
+        for left, right in zip(tokens, tokens[1:]):
+            add(self._feature("b", f"{left} {right}"), 0.5)
+
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {f: w / norm for f, w in vector.items()} if norm else {}
+
+
+@dataclass
+class PlanMatch:
+    """
+    The nearest stored request for a query.
+
+    Attributes:
+        request (str): The stored request.
+        plan (List[str]): The plan accepted for the stored request.
+        similarity (float): Cosine similarity between the query and the stored request.
+    """
+    request: str
+    plan: List[str]
+    similarity: float
+
+
+class PlanIndex:
+    """
+    An incrementally updatable index of accepted request -> plan pairs.
+
+    Vectors are kept in inverted posting lists (feature -> [(row, weight)]), so
+    a query is a sparse matrix-vector product over only the features it contains.
+    Two guards restrict which stored requests a query can match: they must name
+    exactly the same quantities ("5v", "3.3v"), and their main noun phrases must
+    have the same head noun (see head_noun()), so "5V power switch" never
+    matches "5V power supply" however many words they share. Posting lists are
+    partitioned by (quantity set, head noun) and a query only scans its own
+    partition.
+
+    add() and save() are serialized by a lock, so the index can be shared by
+    request threads. Queries do not take the lock: a row's request and plan
+    are stored before any posting refers to it.
+    """
+    def __init__(self, vectorizer: Optional[HashedNgramVectorizer] = None):
+        self.vectorizer = vectorizer or HashedNgramVectorizer()
+        self._requests: List[str] = []
+        self._plans: List[List[str]] = []
+        self._postings: Dict[Tuple[frozenset, str], Dict[int, List[Tuple[int, float]]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def add(self, request: str, plan: Sequence[str]):
+        """Inserts an accepted request -> plan pair."""
+        key = self._partition_of(request)
+        vector = self.vectorizer.transform(request)
+        with self._lock:
+            row = len(self._requests)
+            self._requests.append(request)
+            self._plans.append(list(plan))
+            partition = self._postings.setdefault(key, {})
+            for feature, weight in vector.items():
+                partition.setdefault(feature, []).append((row, weight))
+
+    def query(self, request: str) -> Optional[PlanMatch]:
+        """Returns the most similar stored request with matching quantities and head noun, if any."""
+        partition = self._postings.get(self._partition_of(request))
+        if not partition:
+            return None
+        scores: Dict[int, float] = {}
+        for feature, weight in self.vectorizer.transform(request).items():
+            for row, stored in partition.get(feature, ()):
+                scores[row] = scores.get(row, 0.0) + weight * stored
+        if not scores:
+            return None
+        row, score = max(scores.items(), key=lambda item: item[1])
+        return PlanMatch(self._requests[row], list(self._plans[row]), score)
+
+    @staticmethod
+    def _partition_of(request: str) -> Tuple[frozenset, str]:
+        """Returns the (quantity set, head noun) partition a request belongs to."""
+        return frozenset(t for t in tokenize(request) if _QUANTITY_RE.match(t)), head_noun(request)
+
+    def save(self, path: str):
+        """Writes the index to a JSON file, atomically replacing any previous version."""
+        with self._lock:
+            data = {
+                "n_features": self.vectorizer.n_features,
+                "char_ngram": self.vectorizer.char_ngram,
+                "quantity_weight": self.vectorizer.quantity_weight,
+                "entries": [{"request": r, "plan": p} for r, p in zip(self._requests, self._plans)],
+            }
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PlanIndex":
+        """Reads an index written by save(); returns an empty index if the file does not exist."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            data = json.load(f)
+        index = cls(HashedNgramVectorizer(data["n_features"], data["char_ngram"], data["quantity_weight"]))
+        for entry in data["entries"]:
+            index.add(entry["request"], entry["plan"])
+        return index
+
+
+class RetrievingAIStrategyService(AIStrategyService):
+    """
+    An AI strategy service that answers paraphrases of earlier requests from a PlanIndex.
+
+    On a miss, the plan is streamed from the underlying service as usual and,
+    once the caller has consumed (and therefore accepted) every step, the pair is
+    added to the index. With an index_path, new pairs are saved by a background
+    thread every save_interval_s seconds rather than on the request path; call
+    close() on shutdown to save the rest.
+    """
+    def __init__(
+        self,
+        index: Optional[PlanIndex] = None,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        index_path: Optional[str] = None,
+        save_interval_s: float = 5.0
+    ):
+        """
+        Args:
+            index: The index to query and update. Loaded from index_path, or empty, if omitted.
+            threshold: Minimum cosine similarity for a stored plan to be reused.
+            index_path: If given, new pairs are periodically saved here.
+            save_interval_s: Seconds between background saves of new pairs.
+        """
+        if index is None:
+            index = PlanIndex.load(index_path) if index_path else PlanIndex()
+        self.index = index
+        self.threshold = threshold
+        self.index_path = index_path
+        self.save_interval_s = save_interval_s
+        self.hits = 0
+        self.misses = 0
+        self._unsaved = 0
+        self._unsaved_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._saver: Optional[threading.Thread] = None
+        if index_path:
+            self._saver = threading.Thread(target=self._save_loop, name="plan-index-saver", daemon=True)
+            self._saver.start()
+
+    def flush(self):
+        """Saves the index if pairs were added since the last save."""
+        if not self.index_path:
+            return
+        with self._unsaved_lock:
+            if not self._unsaved:
+                return
+            self._unsaved = 0
+        self.index.save(self.index_path)
+
+    def close(self):
+        """Stops the background saver and saves any remaining pairs."""
+        self._stop.set()
+        if self._saver is not None:
+            self._saver.join()
+        self.flush()
+
+    def _save_loop(self):
+        """Saver thread: periodically writes new pairs to disk."""
+        while not self._stop.wait(self.save_interval_s):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"AI Strategy: Failed to save the plan index: {e}")
+
+    def known_plan(self, user_request: str) -> Optional[List[str]]:
+        """Returns the plan of a similar stored request, counting it as a hit, or None."""
+        match = self.index.query(user_request)
+        if match is None or match.similarity < self.threshold:
+            return None
+        self.hits += 1
+        print(f"AI Strategy: Reusing plan of similar request '{match.request}' "
+              f"(similarity {match.similarity:.2f}).")
+        return list(match.plan)
+
+    def iter_design_plan(self, user_request: str, deadline: Optional[Deadline] = None) -> Iterator[str]:
+        """Streams a retrieved plan on a hit, or the AI-generated plan on a miss."""
+        plan = self.known_plan(user_request)
+        if plan is None:
+            yield from self.iter_generated_plan(user_request, deadline)
+            return
+        for step in plan:
+            if deadline is not None:
+                deadline.check("the next AI plan step")
+            yield step
+
+    def iter_generated_plan(self, user_request: str, deadline: Optional[Deadline] = None) -> Iterator[str]:
+        """Streams the AI-generated plan without querying the index, and indexes it once accepted."""
+        self.misses += 1
+        steps: List[str] = []
+        for step in super().iter_design_plan(user_request, deadline):
+            steps.append(step)
+            yield step
+        if steps:
+            self.index.add(user_request, steps)
+            with self._unsaved_lock:
+                self._unsaved += 1
+
+
+@dataclass
+class RetrievalReport:
+    """
+    Quality and latency of an index on a labeled request set.
+
+    Attributes:
+        recall (float): Fraction of requests with a known plan that retrieved exactly that plan.
+        false_hit_rate (float): Fraction of requests without a known plan that retrieved one anyway.
+        mean_latency_ms (float): Mean query latency in milliseconds.
+        p95_latency_ms (float): 95th percentile query latency in milliseconds.
+    """
+    recall: float
+    false_hit_rate: float
+    mean_latency_ms: float
+    p95_latency_ms: float
+
+
+def evaluate(
+    index: PlanIndex,
+    labeled_requests: Sequence[Tuple[str, Optional[List[str]]]],
+    threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+) -> RetrievalReport:
+    """
+    Measures retrieval recall and latency on (request, expected plan or None) pairs.
+    """
+    latencies: List[float] = []
+    positives = hits = negatives = false_hits = 0
+    for request, expected in labeled_requests:
+        started = time.perf_counter()
+        match = index.query(request)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        retrieved = match.plan if match is not None and match.similarity >= threshold else None
+        if expected is None:
+            negatives += 1
+            false_hits += retrieved is not None
+        else:
+            positives += 1
+            hits += retrieved == expected
+    latencies.sort()
+    return RetrievalReport(
+        recall=hits / positives if positives else 0.0,
+        false_hit_rate=false_hits / negatives if negatives else 0.0,
+        mean_latency_ms=sum(latencies) / len(latencies) if latencies else 0.0,
+        p95_latency_ms=latencies[min(int(0.95 * len(latencies)), len(latencies) - 1)] if latencies else 0.0,
+    )
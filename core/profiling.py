@@ -0,0 +1,171 @@
+"""
+Opt-in, per-request profiling for Flask views.
+
+A request is profiled when an authorized caller asks for it (X-Profile header
+or ?profile= query parameter carrying the configured token) or when it is
+picked by random sampling. The whole view, including the orchestrator, the
+generator and template rendering, runs under cProfile, and the result is kept
+as a .pstats file with bounded on-disk retention. Captures can only be viewed
+with the token, so sampling requires one too.
+
+When neither a token nor a sample rate is configured, wrap() returns the view
+unchanged, so there is no overhead at all.
+"""
+import cProfile
+import functools
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from flask import make_response, request
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+CAPTURE_HEADER = "X-Profile-Capture"
+_CAPTURE_NAME_RE = re.compile(r"^[\w.-]+\.pstats$")
+
+
+@dataclass
+class ProfileCapture:
+    """
+    A stored profile of a single request.
+
+    Attributes:
+        name (str): File name of the capture.
+        endpoint (str): The view that was profiled.
+        created_at (float): Capture time as a UNIX timestamp.
+        size_bytes (int): Size of the pstats file.
+    """
+    name: str
+    endpoint: str
+    created_at: float
+    size_bytes: int
+
+
+class RequestProfiler:
+    """
+    Profiles selected requests and manages the stored captures.
+    """
+    def __init__(
+        self,
+        directory: str,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        max_captures: int = 50
+    ):
+        """
+        Args:
+            directory: Where captures are written.
+            token: Secret that authorizes callers to request profiling and view captures.
+            sample_rate: Fraction of requests (0.0-1.0) profiled without being asked.
+            max_captures: Number of captures kept on disk; the oldest are deleted first.
+
+        Raises:
+            ValueError: If sampling is on without a token, as its captures could never be viewed.
+        """
+        if sample_rate > 0 and not token:
+            raise ValueError("Profile sampling requires a token to view the captures; "
+                             "set PCB_PROFILE_TOKEN as well as PCB_PROFILE_SAMPLE_RATE.")
+        self.directory = directory
+        self.token = token or None
+        self.sample_rate = sample_rate
+        self.max_captures = max_captures
+        # cProfile cannot profile two threads at once, so concurrent captures are skipped
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, default_directory: str) -> "RequestProfiler":
+        """Creates a profiler from PCB_PROFILE_* environment variables."""
+        return cls(
+            directory=os.environ.get("PCB_PROFILE_DIR", default_directory),
+            token=os.environ.get("PCB_PROFILE_TOKEN"),
+            sample_rate=float(os.environ.get("PCB_PROFILE_SAMPLE_RATE", "0")),
+            max_captures=int(os.environ.get("PCB_PROFILE_MAX_CAPTURES", "50"))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """True if profiling can be triggered at all."""
+        return self.token is not None or self.sample_rate > 0
+
+    def is_authorized(self, supplied: Optional[str]) -> bool:
+        """Checks a caller-supplied token against the configured one in constant time."""
+        return self.token is not None and supplied is not None and hmac.compare_digest(supplied, self.token)
+
+    def wrap(self, view: Callable) -> Callable:
+        """
+        Decorates a Flask view so that selected requests are profiled.
+
+        Returns the view itself when profiling is disabled.
+        """
+        if not self.enabled:
+            return view
+
+        @functools.wraps(view)
+        def profiled_view(*args, **kwargs):
+            requested = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_PARAM)
+            if not (self.is_authorized(requested) or random.random() < self.sample_rate):
+                return view(*args, **kwargs)
+            if not self._lock.acquire(blocking=False):
+                return view(*args, **kwargs)
+            try:
+                profiler = cProfile.Profile()
+                result = profiler.runcall(view, *args, **kwargs)
+                name = self._store(profiler, view.__name__)
+            finally:
+                self._lock.release()
+            response = make_response(result)
+            response.headers[CAPTURE_HEADER] = name
+            return response
+
+        return profiled_view
+
+    def list_captures(self) -> List[ProfileCapture]:
+        """Returns the stored captures, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        captures = []
+        for name in os.listdir(self.directory):
+            if not _CAPTURE_NAME_RE.match(name):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            endpoint = name.split("-")[1] if name.count("-") >= 2 else ""
+            captures.append(ProfileCapture(name, endpoint, stat.st_mtime, stat.st_size))
+        captures.sort(key=lambda c: (c.created_at, c.name), reverse=True)
+        return captures
+
+    def path_for(self, name: str) -> Optional[str]:
+        """Returns the path of a stored capture, or None if the name is invalid or missing."""
+        if not _CAPTURE_NAME_RE.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def summary(self, name: str, limit: int = 40) -> Optional[str]:
+        """Returns the top functions of a capture by cumulative time, as text."""
+        path = self.path_for(name)
+        if path is None:
+            return None
+        output = io.StringIO()
+        pstats.Stats(path, stream=output).strip_dirs().sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+    def _store(self, profiler: cProfile.Profile, endpoint: str) -> str:
+        """Writes a capture to disk and enforces the retention limit."""
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{endpoint}-{uuid.uuid4().hex[:8]}.pstats"
+        profiler.dump_stats(os.path.join(self.directory, name))
+        for stale in self.list_captures()[self.max_captures:]:
+            try:
+                os.remove(os.path.join(self.directory, stale.name))
+            except FileNotFoundError:
+                pass
+        return name
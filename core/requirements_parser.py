@@ -1,8 +1,29 @@
 """
 Functions to gather requirements data via command-line input and
 create instances of the dataclasses defined in core.requirements.
+
+Besides the interactive prompts, a non-interactive bulk mode streams
+requirement records from CSV, JSON Lines or YAML files (or stdin), generates
+a schematic for each record across a process pool, and writes the results as
+JSON Lines. Records are read, generated and written with a bounded window, so
+memory stays flat regardless of input size.
+
+Usage:
+    python -m core.requirements_parser                       # interactive
+    python -m core.requirements_parser --bulk records.csv    # bulk, results to stdout
+    cat records.jsonl | python -m core.requirements_parser --bulk - --format jsonl -o results.jsonl
 """
-from typing import Optional, List
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, List, TextIO, Tuple
 
 from core.requirements import ProjectRequirements, PowerSupplyRequirements
 
@@ -109,8 +130,13 @@ def prompt_for_power_supply_requirements() -> Optional[PowerSupplyRequirements]:
         protection_features=protection_features
     )
 
+from core.orchestrator import DesignOrchestrator, InfeasibleRequirementsError
 from core.schematic import Schematic
-from core.schematic_generator import SchematicGenerator
+
+BULK_FORMATS = ("csv", "jsonl", "yaml")
+
+# Per-process orchestrator used by bulk workers, created lazily on first use.
+_worker_orchestrator: Optional[DesignOrchestrator] = None
 
 
 def display_schematic(schematic: Schematic):
@@ -131,14 +157,212 @@ def display_schematic(schematic: Schematic):
     print("-------------------------\n")
 
 
-if __name__ == '__main__':
+def default_request_for(psu_req: PowerSupplyRequirements) -> str:
+    """Returns the natural language request used when a record does not provide one."""
+    return f"I need a {psu_req.output_voltage_v:g}V power supply."
+
+
+def read_requirement_records(stream: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yields raw requirement records from a CSV, JSON Lines or YAML stream.
+
+    YAML input is read as a multi-document stream (one record per document)
+    and requires PyYAML.
+
+    Args:
+        stream: The text stream to read from.
+        fmt: One of BULK_FORMATS.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "jsonl":
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == "yaml":
+        try:
+            import yaml
+        except ImportError as e:
+            raise RuntimeError("YAML input requires PyYAML (pip install pyyaml).") from e
+        for document in yaml.safe_load_all(stream):
+            if isinstance(document, list):
+                yield from document
+            elif document is not None:
+                yield document
+    else:
+        raise ValueError(f"Unsupported format '{fmt}'. Expected one of {BULK_FORMATS}.")
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    """Converts a record value to float, treating missing or blank values as None."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return float(value)
+
+
+def record_to_requirements(
+    record: Dict[str, Any]
+) -> Tuple[Optional[ProjectRequirements], PowerSupplyRequirements, str]:
+    """
+    Converts a raw record into requirement dataclasses.
+
+    Project fields are optional; when project_name is present a ProjectRequirements
+    is returned as well. protection_features may be a list or a comma-separated string.
+
+    Returns:
+        The project requirements (or None), the power supply requirements and the
+        natural language request to generate it from.
+
+    Raises:
+        ValueError: If a mandatory power supply field is missing or not numeric.
+    """
+    project = None
+    if record.get("project_name"):
+        project = ProjectRequirements(
+            project_name=str(record["project_name"]),
+            max_length_mm=_optional_float(record.get("max_length_mm")),
+            max_width_mm=_optional_float(record.get("max_width_mm")),
+            target_cost_usd=_optional_float(record.get("target_cost_usd"))
+        )
+
+    mandatory = {}
+    for name in ("input_voltage_v", "output_voltage_v", "max_output_current_a"):
+        value = _optional_float(record.get(name))
+        if value is None:
+            raise ValueError(f"Missing mandatory field '{name}'.")
+        mandatory[name] = value
+
+    features = record.get("protection_features") or []
+    if isinstance(features, str):
+        features = [feature.strip() for feature in features.split(",") if feature.strip()]
+
+    psu_req = PowerSupplyRequirements(
+        block_name=str(record.get("block_name") or "Power Supply"),
+        protection_features=list(features),
+        **mandatory
+    )
+    user_request = record.get("user_request") or default_request_for(psu_req)
+    return project, psu_req, user_request
+
+
+def generate_from_record(indexed_record: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Pool worker: generates the schematic for one record and returns a JSON-ready result.
+
+    Errors are reported in the result rather than raised, so one bad record does
+    not abort the batch. Progress prints from the pipeline are suppressed.
+    """
+    global _worker_orchestrator
+    index, record = indexed_record
+    result: Dict[str, Any] = {"index": index}
+    try:
+        project, psu_req, user_request = record_to_requirements(record)
+        result.update(project_name=project and project.project_name, block_name=psu_req.block_name,
+                      user_request=user_request)
+        if _worker_orchestrator is None:
+            _worker_orchestrator = DesignOrchestrator()
+        with contextlib.redirect_stdout(io.StringIO()):
+            schematic, plan = _worker_orchestrator.create_schematic_from_request(user_request, psu_req,
+                                                                                  project=project)
+        result.update(plan=plan, fingerprint=schematic.fingerprint(), schematic=schematic.to_dict())
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def generate_from_records(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Pool worker: generates a chunk of records, amortizing inter-process overhead."""
+    return [generate_from_record(indexed_record) for indexed_record in chunk]
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Lazily groups items into lists of at most `size` elements."""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bounded_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    executor: Optional[Executor],
+    window: int
+) -> Iterator[Any]:
+    """
+    Maps fn over items in order, keeping at most `window` tasks in flight.
+
+    Unlike Executor.map, the input is consumed lazily, so arbitrarily long
+    inputs run in constant memory. Without an executor, items are mapped inline.
+    """
+    if executor is None:
+        for item in items:
+            yield fn(item)
+        return
+    pending: deque = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def run_bulk(
+    input_stream: TextIO,
+    fmt: str,
+    output_stream: TextIO,
+    max_workers: Optional[int] = None,
+    progress_stream: Optional[TextIO] = None,
+    chunk_size: int = 64
+) -> Tuple[int, int]:
+    """
+    Generates schematics for every record of a stream and writes JSON Lines results.
+
+    Args:
+        input_stream: Stream of CSV, JSON Lines or YAML records.
+        fmt: One of BULK_FORMATS.
+        output_stream: Stream the results are written to, one JSON object per line.
+        max_workers: Process pool size. A value of 1 generates in-process.
+        progress_stream: Stream for the progress display, or None to disable it.
+        chunk_size: Number of records sent to a worker per task.
+
+    Returns:
+        The number of succeeded and failed records.
+    """
+    records = enumerate(read_requirement_records(input_stream, fmt))
+    succeeded = failed = 0
+    with contextlib.ExitStack() as stack:
+        executor = None
+        if max_workers != 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=max_workers))
+        window = 4 * (max_workers or os.cpu_count() or 1)
+        for results in bounded_map(generate_from_records, _chunked(records, chunk_size), executor, window):
+            for result in results:
+                output_stream.write(json.dumps(result) + "\n")
+                if "error" in result:
+                    failed += 1
+                else:
+                    succeeded += 1
+            if progress_stream is not None:
+                progress_stream.write(f"\rProcessed {succeeded + failed} records ({failed} failed)")
+                progress_stream.flush()
+    if progress_stream is not None:
+        progress_stream.write("\n")
+    return succeeded, failed
+
+
+def run_interactive():
+    """Prompts for project and power supply requirements and generates a schematic for each block."""
     print("--- Project Requirements Input ---")
     project_reqs = prompt_for_project_requirements()
     print("\n--- Created Project Requirements ---")
     print(project_reqs)
 
-    # Instantiate the generator
-    generator = SchematicGenerator()
+    # Instantiate the orchestrator
+    orchestrator = DesignOrchestrator()
 
     print("\n--- Power Supply Requirements Input ---")
     # Example of adding multiple power supplies
@@ -152,8 +376,16 @@ if __name__ == '__main__':
             power_supplies.append(psu_req)
             print(f"\nAttempting to generate schematic for '{psu_req.block_name}'...")
             # Generate the schematic for the newly added power supply
-            generated_schematic = generator.generate(psu_req)
-            if generated_schematic:
+            try:
+                generated_schematic, plan = orchestrator.create_schematic_from_request(
+                    default_request_for(psu_req), psu_req, project=project_reqs
+                )
+            except InfeasibleRequirementsError as e:
+                print("These requirements cannot be met:")
+                for line in e.report.reasons + e.report.suggestions:
+                    print(f"  - {line}")
+                continue
+            if plan:
                 print("Schematic generated successfully!")
                 display_schematic(generated_schematic)
             else:
@@ -167,3 +399,35 @@ if __name__ == '__main__':
             print(psu)
     else:
         print("\nNo power supply blocks were added.")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point; runs interactively unless --bulk is given."""
+    parser = argparse.ArgumentParser(description="Enter requirements and generate schematics.")
+    parser.add_argument("--bulk", metavar="INPUT", help="Read records from INPUT ('-' for stdin) instead of prompting.")
+    parser.add_argument("--format", choices=BULK_FORMATS, help="Input format; inferred from the file extension if omitted.")
+    parser.add_argument("-o", "--output", default="-", help="JSON Lines output file ('-' for stdout).")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size.")
+    args = parser.parse_args(argv)
+
+    if args.bulk is None:
+        run_interactive()
+        return
+
+    fmt = args.format
+    if fmt is None:
+        extension = os.path.splitext(args.bulk)[1].lower().lstrip(".")
+        fmt = {"csv": "csv", "jsonl": "jsonl", "ndjson": "jsonl", "yaml": "yaml", "yml": "yaml"}.get(extension)
+        if fmt is None:
+            parser.error("Cannot infer the input format; pass --format.")
+
+    with contextlib.ExitStack() as stack:
+        input_stream = sys.stdin if args.bulk == "-" else stack.enter_context(open(args.bulk, newline=""))
+        output_stream = sys.stdout if args.output == "-" else stack.enter_context(open(args.output, "w"))
+        succeeded, failed = run_bulk(input_stream, fmt, output_stream, args.workers, progress_stream=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
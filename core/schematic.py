@@ -1,8 +1,13 @@
 """
 Defines data structures for representing an electronic schematic.
 """
+import hashlib
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import List, Dict, Set
+from typing import Iterable, List, Dict, Optional, Sequence, Set, Tuple
+
+from core.fingerprint import MASK, MerkleIndex, component_hash, net_hash, pin_hash
+from core.persistent import PersistentMap, PersistentVector
 
 @dataclass(frozen=True)
 class Pin:
@@ -30,37 +35,282 @@ class Net:
     name: str
     pins: Set[Pin] = field(default_factory=set)
 
+    def __post_init__(self):
+        # The owning schematic and its ownership token; see Schematic.snapshot().
+        self._schematic: Optional["Schematic"] = None
+        self._token: Optional[object] = None
+        self._pin_sum = sum(pin_hash(pin) for pin in self.pins) & MASK
+
     def add_connection(self, pin: Pin):
         """Adds a component pin to this net."""
-        self.pins.add(pin)
+        if self._schematic is not None:
+            self._schematic._add_connection(self, pin)
+        elif pin not in self.pins:
+            self.pins.add(pin)
+            self._pin_sum = (self._pin_sum + pin_hash(pin)) & MASK
 
 @dataclass
 class Schematic:
-    """Represents the entire electronic schematic, containing all components and nets."""
+    """
+    Represents the entire electronic schematic, containing all components and nets.
+
+    Edits can be grouped into transactions (begin/commit/rollback) backed by an
+    operation log, and snapshot() returns an O(1) copy that shares all storage
+    with the original. Components, nets and the net-name index are kept in
+    persistent tries (see core.persistent), so after a snapshot each side copies
+    only the trie paths and individual nets it modifies.
+
+    A canonical content fingerprint with per-component and per-net sub-hashes
+    is maintained incrementally; see core.fingerprint.
+    """
     components: List[Component] = field(default_factory=list)
     nets: List[Net] = field(default_factory=list)
 
+    def __post_init__(self):
+        self.components = PersistentVector(self.components)
+        self.nets = PersistentVector(self.nets)
+        self._token = object()
+        self._net_index: PersistentMap[int] = PersistentMap()
+        self._log: List[Tuple] = []
+        self._tx_marks: List[int] = []
+        self._component_hashes = MerkleIndex()
+        self._net_hashes = MerkleIndex()
+        for component in self.components:
+            self._component_hashes.add(component.reference_designator, component_hash(component))
+        for i, net in enumerate(self.nets):
+            self._net_index.setdefault(net.name, i)
+            self._claim(net)
+            self._net_hashes.add(net.name, net_hash(net.name, net._pin_sum))
+
     def add_component(self, component: Component):
         """Adds a component to the schematic."""
         self.components.append(component)
+        self._component_hashes.add(component.reference_designator, component_hash(component))
+        self._record(("component",))
 
     def add_net(self, net: Net):
         """Adds a net to the schematic."""
+        self._claim(net)
+        self._net_index.setdefault(net.name, len(self.nets))
         self.nets.append(net)
+        self._net_hashes.add(net.name, net_hash(net.name, net._pin_sum))
+        self._record(("net", net.name))
+
+    def add_bulk(
+        self,
+        components: Sequence[Component],
+        connections: Sequence[Tuple[str, Iterable[Pin]]],
+        component_hashes: Optional[Sequence[int]] = None,
+        pin_sums: Optional[Sequence[int]] = None
+    ):
+        """
+        Adds many components and connections in one operation.
+
+        Produces the same schematic as adding each component and calling
+        get_or_create_net(name).add_connection(pin) for every pin, but a net
+        that does not exist yet is created with all of its pins at once.
+
+        Args:
+            components: Components to append.
+            connections: Pairs of (net name, pins to connect to that net).
+            component_hashes: Optional precomputed component_hash() of each component.
+            pin_sums: Optional precomputed pin-hash sum of each connection's pins,
+                for callers that add the same parts repeatedly.
+        """
+        for i, component in enumerate(components):
+            leaf = component_hashes[i] if component_hashes is not None else component_hash(component)
+            self.components.append(component)
+            self._component_hashes.add(component.reference_designator, leaf)
+            self._record(("component",))
+        for i, (name, pins) in enumerate(connections):
+            if name in self._net_index:
+                net = self._own_net(name)
+                for pin in pins:
+                    self._add_connection(net, pin)
+            elif pin_sums is not None:
+                net = Net(name=name)
+                net.pins.update(pins)
+                net._pin_sum = pin_sums[i]
+                self.add_net(net)
+            else:
+                self.add_net(Net(name=name, pins=set(pins)))
 
     def find_net(self, name: str) -> Net or None:
         """Finds a net by its name."""
-        for net in self.nets:
-            if net.name == name:
-                return net
-        return None
+        index = self._net_index.get(name)
+        return self.nets[index] if index is not None else None
 
     def get_or_create_net(self, name: str) -> Net:
         """
         Returns an existing net with the given name or creates, adds, and returns a new one.
         """
-        net = self.find_net(name)
-        if net is None:
-            net = Net(name=name)
-            self.add_net(net)
-        return net
\ No newline at end of file
+        if name in self._net_index:
+            return self._own_net(name)
+        net = Net(name=name)
+        self.add_net(net)
+        return net
+
+    # --- Serialization ---
+
+    def to_dict(self) -> dict:
+        """Returns a JSON-serializable representation of the schematic."""
+        return {
+            "components": [
+                {
+                    "reference_designator": c.reference_designator,
+                    "part_number": c.part_number,
+                    "description": c.description,
+                }
+                for c in self.components
+            ],
+            "nets": [
+                {
+                    "name": net.name,
+                    "pins": sorted([pin.component_ref_des, pin.pin_name] for pin in net.pins),
+                }
+                for net in self.nets
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Schematic":
+        """Rebuilds a schematic from the output of to_dict()."""
+        return cls(
+            components=[Component(**c) for c in data.get("components", [])],
+            nets=[
+                Net(name=net["name"], pins={Pin(ref, pin_name) for ref, pin_name in net["pins"]})
+                for net in data.get("nets", [])
+            ],
+        )
+
+    # --- Fingerprints ---
+
+    def fingerprint(self) -> str:
+        """
+        Returns a canonical hash of the schematic content as a hex string.
+
+        It is independent of the order in which components, nets and pins were
+        added, and is maintained incrementally, so this call is O(1).
+        """
+        combined = f"{self._component_hashes.root:016x}{self._net_hashes.root:016x}"
+        return hashlib.blake2b(combined.encode("ascii"), digest_size=16).hexdigest()
+
+    # --- Snapshots ---
+
+    def snapshot(self) -> "Schematic":
+        """
+        Returns an independent copy of this schematic in O(1) time.
+
+        Both schematics share their storage until one of them is modified, and
+        then only the touched parts are copied, so a branch costs memory
+        proportional to its edits rather than to the size of the schematic.
+        """
+        clone = Schematic()
+        clone.components = self.components.copy()
+        clone.nets = self.nets.copy()
+        clone._net_index = self._net_index.copy()
+        clone._component_hashes = self._component_hashes.copy()
+        clone._net_hashes = self._net_hashes.copy()
+        # A fresh token disowns every existing net, so neither side mutates them in place.
+        self._token = object()
+        return clone
+
+    # --- Transactions ---
+
+    @property
+    def in_transaction(self) -> bool:
+        """True if a transaction is currently open."""
+        return bool(self._tx_marks)
+
+    def begin(self):
+        """Opens a (possibly nested) transaction."""
+        self._tx_marks.append(len(self._log))
+
+    def commit(self):
+        """Commits the innermost open transaction."""
+        if not self._tx_marks:
+            raise RuntimeError("No transaction in progress.")
+        self._tx_marks.pop()
+        if not self._tx_marks:
+            self._log.clear()
+
+    def rollback(self):
+        """Undoes every edit made since the innermost open transaction began."""
+        if not self._tx_marks:
+            raise RuntimeError("No transaction in progress.")
+        mark = self._tx_marks.pop()
+        while len(self._log) > mark:
+            self._undo(self._log.pop())
+
+    @contextmanager
+    def transaction(self):
+        """Runs a block in a transaction, rolling back if it raises."""
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    # --- Internal helpers ---
+
+    def _record(self, entry: Tuple):
+        """Appends an undo entry to the operation log while a transaction is open."""
+        if self._tx_marks:
+            self._log.append(entry)
+
+    def _undo(self, entry: Tuple):
+        """Reverts a single logged operation."""
+        kind = entry[0]
+        if kind == "component":
+            component = self.components.pop()
+            self._component_hashes.discard(component.reference_designator, component_hash(component))
+        elif kind == "net":
+            net = self.nets.pop()
+            if self._net_index.get(net.name) == len(self.nets):
+                del self._net_index[net.name]
+            self._net_hashes.discard(net.name, net_hash(net.name, net._pin_sum))
+            net._schematic = None
+        elif kind == "pin":
+            _, name, pin = entry
+            net = self._own_net(name)
+            net.pins.discard(pin)
+            self._set_pin_sum(net, net._pin_sum - pin_hash(pin))
+
+    def _claim(self, net: Net):
+        """Marks a net as owned (and therefore mutable in place) by this schematic."""
+        net._schematic = self
+        net._token = self._token
+
+    def _owns(self, net: Net) -> bool:
+        """True if the net may be modified in place by this schematic."""
+        return net._schematic is self and net._token is self._token
+
+    def _own_net(self, name: str) -> Net:
+        """Returns the named net, copying it first if it is shared with a snapshot."""
+        index = self._net_index[name]
+        net = self.nets[index]
+        if not self._owns(net):
+            shared_pin_sum = net._pin_sum
+            net = Net(name=net.name, pins=set(net.pins))
+            net._pin_sum = shared_pin_sum
+            self._claim(net)
+            self.nets[index] = net
+        return net
+
+    def _add_connection(self, net: Net, pin: Pin):
+        """Adds a pin to a net of this schematic, copying the net first if needed."""
+        if not self._owns(net):
+            net = self._own_net(net.name)
+        if pin in net.pins:
+            return
+        net.pins.add(pin)
+        self._set_pin_sum(net, net._pin_sum + pin_hash(pin))
+        self._record(("pin", net.name, pin))
+
+    def _set_pin_sum(self, net: Net, pin_sum: int):
+        """Updates a net's pin-hash sum and its leaf in the net hash index."""
+        self._net_hashes.discard(net.name, net_hash(net.name, net._pin_sum))
+        net._pin_sum = pin_sum & MASK
+        self._net_hashes.add(net.name, net_hash(net.name, net._pin_sum))
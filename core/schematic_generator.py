@@ -1,7 +1,14 @@
 """
 Service to generate a schematic based on provided requirements.
 """
+import dataclasses
+import threading
+from dataclasses import dataclass
+from typing import ClassVar, Dict, FrozenSet, Optional, Sequence, Tuple
+
+from core.admission import Deadline
 from core.requirements import PowerSupplyRequirements
+from core.fingerprint import MASK, component_hash, pin_hash
 from core.schematic import Schematic, Component, Net, Pin
 
 # A simple, hard-coded component library for the PoC.
@@ -9,39 +16,231 @@ from core.schematic import Schematic, Component, Net, Pin
 COMPONENT_LIBRARY = {
     "LM7805": {
         "description": "5V Positive Voltage Regulator",
-        "pins": ["IN", "GND", "OUT"]
+        "pins": ["IN", "GND", "OUT"],
+        "unit_cost_usd": 0.45,
+        "electrical_model": {
+            "type": "linear_regulator",
+            "output_voltage_v": 5.0,
+            "dropout_voltage_v": 2.0,
+            "quiescent_current_a": 0.005,
+            "max_output_current_a": 1.5,
+            "max_dissipation_w": 15.0
+        }
     },
     "CAP_10uF": {
         "description": "10uF Electrolytic Capacitor",
-        "pins": ["1", "2"]
+        "pins": ["1", "2"],
+        "unit_cost_usd": 0.05,
+        "electrical_model": {
+            "type": "capacitor",
+            "leakage_resistance_ohm": 1.0e7
+        }
     },
     "CAP_0.1uF": {
         "description": "0.1uF Ceramic Capacitor",
-        "pins": ["1", "2"]
+        "pins": ["1", "2"],
+        "unit_cost_usd": 0.01,
+        "electrical_model": {
+            "type": "capacitor",
+            "leakage_resistance_ohm": 1.0e10
+        }
     }
 }
 
+@dataclass(frozen=True)
+class SchematicTemplate:
+    """
+    The result of a design plan, recorded once and re-rendered for new requirements.
+
+    Net names are stored as format strings with a placeholder for each entry of
+    PARAMETERS, e.g. "VIN_{input_voltage_v}V". Everything else is copied verbatim.
+
+    Attributes:
+        components (Tuple[Tuple[str, str, str], ...]): (designator, part number, description) of each component.
+        nets (Tuple[Tuple[str, FrozenSet[Pin]], ...]): (net name format, pins) of each net, in creation order.
+    """
+    PARAMETERS: ClassVar[Tuple[str, ...]] = ("input_voltage_v", "output_voltage_v")
+
+    components: Tuple[Tuple[str, str, str], ...]
+    nets: Tuple[Tuple[str, FrozenSet[Pin]], ...]
+
+    def __post_init__(self):
+        # Fingerprint leaves do not depend on the parameters, so they are computed once
+        object.__setattr__(self, "_component_hashes",
+                           tuple(component_hash(Component(*fields)) for fields in self.components))
+        object.__setattr__(self, "_pin_sums",
+                           tuple(sum(pin_hash(pin) for pin in pins) & MASK for _, pins in self.nets))
+
+    @staticmethod
+    def parameter_values(requirements: PowerSupplyRequirements) -> Dict[str, str]:
+        """Returns the text each parameter contributes to net names."""
+        return {name: str(getattr(requirements, name)) for name in SchematicTemplate.PARAMETERS}
+
+    @classmethod
+    def from_schematic(cls, schematic: Schematic, requirements: PowerSupplyRequirements) -> "SchematicTemplate":
+        """
+        Records a schematic built for the given requirements as a template.
+
+        The requirements' parameter values must be distinct and neither may
+        contain the other, otherwise substitution in net names would be ambiguous.
+
+        Raises:
+            ValueError: If the parameter values are ambiguous.
+        """
+        values = cls.parameter_values(requirements)
+        for name, value in values.items():
+            for other_name, other in values.items():
+                if name != other_name and value in other:
+                    raise ValueError(f"Parameter values {value!r} and {other!r} are ambiguous in net names.")
+        nets = []
+        for net in schematic.nets:
+            name_format = net.name.replace("{", "{{").replace("}", "}}")
+            for name, value in values.items():
+                name_format = name_format.replace(value, "{" + name + "}")
+            nets.append((name_format, frozenset(net.pins)))
+        return cls(
+            components=tuple((c.reference_designator, c.part_number, c.description) for c in schematic.components),
+            nets=tuple(nets)
+        )
+
+    def stamp(self, schematic: Schematic, requirements: PowerSupplyRequirements):
+        """Adds the template's components and connections to a schematic in one bulk operation."""
+        values = self.parameter_values(requirements)
+        schematic.add_bulk(
+            [Component(*fields) for fields in self.components],
+            [(name_format.format(**values), pins) for name_format, pins in self.nets],
+            component_hashes=self._component_hashes,
+            pin_sums=self._pin_sums
+        )
+
+
 class SchematicGenerator:
     """
     Executes single-step commands to build a schematic incrementally.
+
+    Whole plans can be run with execute_plan(), which records the result of a
+    plan as a SchematicTemplate the first time and stamps it afterwards.
     """
-    def execute_command(self, command: str, schematic: Schematic, requirements: PowerSupplyRequirements):
+    SUPPORTED_COMMANDS = ("add_regulator_5v", "add_input_capacitor", "add_output_capacitor")
+
+    # Parameter values used to record templates. Net names built from them are
+    # unambiguous, since placeholders never contain digits.
+    _PROBE_REQUIREMENTS = {"input_voltage_v": 9876.125, "output_voltage_v": 4321.625}
+
+    def __init__(self):
+        # Plan -> template, or None for plans whose result cannot be templated
+        self._templates: Dict[Tuple[str, ...], Optional[SchematicTemplate]] = {}
+        self._templates_lock = threading.Lock()
+        self.template_hits = 0
+        self.template_misses = 0
+
+    def supports(self, command: str) -> bool:
+        """Returns True if the command is known to this generator."""
+        return command in self.SUPPORTED_COMMANDS
+
+    def execute_plan(
+        self,
+        design_plan: Sequence[str],
+        requirements: PowerSupplyRequirements,
+        deadline: Optional[Deadline] = None
+    ) -> Schematic:
+        """
+        Builds a new schematic by executing every command of a plan.
+
+        The first time a plan is executed, its result is recorded as a template,
+        and later calls with the same plan stamp the template with the new
+        requirements instead of replaying each command. The commands may depend
+        on the requirements only through the net names built from
+        SchematicTemplate.PARAMETERS; a plan whose template does not reproduce
+        a replayed result is never templated.
+
+        Args:
+            design_plan: The commands to execute.
+            requirements: The overall project requirements.
+            deadline: Optional deadline; DeadlineExceeded is raised if it passes between commands.
+
+        Returns:
+            The generated schematic.
+        """
+        key = tuple(design_plan)
+        template = self._templates.get(key)
+        if template is not None:
+            if deadline is not None:
+                deadline.check("stamping the plan template")
+            self.template_hits += 1
+            schematic = Schematic()
+            template.stamp(schematic, requirements)
+            return schematic
+
+        self.template_misses += 1
+        schematic = self._replay(design_plan, requirements, deadline)
+        if key not in self._templates and all(self.supports(command) for command in key):
+            self._record_template(key, schematic, requirements)
+        return schematic
+
+    def _replay(
+        self,
+        design_plan: Sequence[str],
+        requirements: PowerSupplyRequirements,
+        deadline: Optional[Deadline] = None
+    ) -> Schematic:
+        """Executes each command of a plan on a new schematic."""
+        schematic = Schematic()
+        with schematic.transaction():
+            for command in design_plan:
+                self.execute_command(command, schematic, requirements, deadline)
+        return schematic
+
+    def _record_template(self, key: Tuple[str, ...], schematic: Schematic, requirements: PowerSupplyRequirements):
+        """
+        Records a plan's template from a run with probe requirements, and keeps
+        it only if stamping it for the original requirements reproduces their result.
+        """
+        probe_requirements = dataclasses.replace(requirements, **self._PROBE_REQUIREMENTS)
+        try:
+            template = SchematicTemplate.from_schematic(self._replay(key, probe_requirements), probe_requirements)
+            stamped = Schematic()
+            template.stamp(stamped, requirements)
+            if stamped.to_dict() != schematic.to_dict():
+                template = None
+        except Exception as e:
+            print(f"Generator: Recording a template failed: {e!r}")
+            template = None
+        if template is None:
+            print(f"Generator: Plan {list(key)} cannot be templated; it will always be replayed.")
+        with self._templates_lock:
+            self._templates.setdefault(key, template)
+
+    def execute_command(
+        self,
+        command: str,
+        schematic: Schematic,
+        requirements: PowerSupplyRequirements,
+        deadline: Optional[Deadline] = None
+    ):
         """
         Executes a single design command and modifies the schematic in place.
 
+        The command runs inside a schematic transaction, so if it fails part-way
+        the schematic is rolled back to its state before the command.
+
         Args:
             command: The command to execute (e.g., 'add_regulator_5v').
             schematic: The schematic object to modify.
             requirements: The overall project requirements.
+            deadline: Optional deadline; DeadlineExceeded is raised if it has already passed.
         """
-        if command == "add_regulator_5v":
-            self._add_lm7805_regulator(schematic, requirements)
-        elif command == "add_input_capacitor":
-            self._add_input_capacitor(schematic, requirements)
-        elif command == "add_output_capacitor":
-            self._add_output_capacitor(schematic, requirements)
-        else:
-            print(f"Warning: Unknown command '{command}' ignored.")
+        if deadline is not None:
+            deadline.check(f"generator command '{command}'")
+        with schematic.transaction():
+            if command == "add_regulator_5v":
+                self._add_lm7805_regulator(schematic, requirements)
+            elif command == "add_input_capacitor":
+                self._add_input_capacitor(schematic, requirements)
+            elif command == "add_output_capacitor":
+                self._add_output_capacitor(schematic, requirements)
+            else:
+                print(f"Warning: Unknown command '{command}' ignored.")
 
     def _add_lm7805_regulator(self, schematic: Schematic, requirements: PowerSupplyRequirements):
         """Adds and connects an LM7805 regulator."""
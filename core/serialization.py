@@ -0,0 +1,301 @@
+"""
+Compact, machine-readable encodings of schematics for the API.
+
+The columnar layout interns every string (designators, part numbers, net and
+pin names) once in a string table and stores components and net pin lists as
+parallel index arrays. It can be sent as JSON or as MessagePack, using the
+`msgpack` package when installed and a pure-Python codec otherwise, and
+compressed with gzip or, when the `brotli` package is installed, brotli.
+"""
+import gzip
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.schematic import Component, Net, Pin, Schematic
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised when msgpack is absent
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised when brotli is absent
+    brotli = None
+
+COLUMNAR_VERSION = 1
+MSGPACK_MIMETYPE = "application/msgpack"
+
+
+# --- Columnar layout ---
+
+def to_columnar(schematic: Schematic, plan: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Encodes a schematic (and optionally its plan) in the columnar layout.
+
+    Layout:
+        strings: Interned string table; every other string field is an index into it.
+        components: Parallel arrays designator / part / description.
+        nets: name array, pin_offsets (net i owns pins[pin_offsets[i]:pin_offsets[i+1]]),
+            and parallel pin_designator / pin_name arrays.
+    """
+    strings: List[str] = []
+    interned: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        index = interned.get(value)
+        if index is None:
+            index = interned[value] = len(strings)
+            strings.append(value)
+        return index
+
+    components = {"designator": [], "part": [], "description": []}
+    for comp in schematic.components:
+        components["designator"].append(intern(comp.reference_designator))
+        components["part"].append(intern(comp.part_number))
+        components["description"].append(intern(comp.description))
+
+    nets = {"name": [], "pin_offsets": [0], "pin_designator": [], "pin_name": []}
+    for net in schematic.nets:
+        nets["name"].append(intern(net.name))
+        for pin in sorted(net.pins, key=lambda p: (p.component_ref_des, p.pin_name)):
+            nets["pin_designator"].append(intern(pin.component_ref_des))
+            nets["pin_name"].append(intern(pin.pin_name))
+        nets["pin_offsets"].append(len(nets["pin_designator"]))
+
+    return {
+        "version": COLUMNAR_VERSION,
+        "plan": list(plan or []),
+        "strings": strings,
+        "components": components,
+        "nets": nets,
+    }
+
+
+def from_columnar(data: Dict[str, Any]) -> Tuple[Schematic, List[str]]:
+    """Decodes the columnar layout back into a Schematic and plan."""
+    if data.get("version") != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported columnar schematic version: {data.get('version')!r}")
+    strings = data["strings"]
+    components = data["components"]
+    nets = data["nets"]
+    schematic = Schematic(
+        components=[
+            Component(strings[d], strings[p], strings[desc])
+            for d, p, desc in zip(components["designator"], components["part"], components["description"])
+        ],
+        nets=[
+            Net(
+                name=strings[name],
+                pins={
+                    Pin(strings[nets["pin_designator"][i]], strings[nets["pin_name"][i]])
+                    for i in range(nets["pin_offsets"][n], nets["pin_offsets"][n + 1])
+                }
+            )
+            for n, name in enumerate(nets["name"])
+        ]
+    )
+    return schematic, list(data.get("plan", []))
+
+
+# --- MessagePack ---
+
+def packb(obj: Any) -> bytes:
+    """Serializes an object to MessagePack."""
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    out = bytearray()
+    _pack(obj, out)
+    return bytes(out)
+
+
+def unpackb(data: bytes) -> Any:
+    """Deserializes MessagePack bytes."""
+    if msgpack is not None:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    obj, offset = _unpack(memoryview(data), 0)
+    if offset != len(data):
+        raise ValueError("Trailing bytes after MessagePack object.")
+    return obj
+
+
+def _pack(obj: Any, out: bytearray):
+    """Pure-Python MessagePack encoder for None, bool, int, float, str, bytes, list/tuple and dict."""
+    if obj is None:
+        out.append(0xc0)
+    elif obj is True:
+        out.append(0xc3)
+    elif obj is False:
+        out.append(0xc2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -32 <= obj < 0:
+            out.append(obj & 0xff)
+        elif 0 <= obj <= 0xff:
+            out += b"\xcc" + struct.pack(">B", obj)
+        elif 0 <= obj <= 0xffff:
+            out += b"\xcd" + struct.pack(">H", obj)
+        elif 0 <= obj <= 0xffffffff:
+            out += b"\xce" + struct.pack(">I", obj)
+        elif 0 <= obj <= 0xffffffffffffffff:
+            out += b"\xcf" + struct.pack(">Q", obj)
+        elif -0x80 <= obj:
+            out += b"\xd0" + struct.pack(">b", obj)
+        elif -0x8000 <= obj:
+            out += b"\xd1" + struct.pack(">h", obj)
+        elif -0x80000000 <= obj:
+            out += b"\xd2" + struct.pack(">i", obj)
+        elif -0x8000000000000000 <= obj:
+            out += b"\xd3" + struct.pack(">q", obj)
+        else:
+            raise OverflowError("Integer out of MessagePack range.")
+    elif isinstance(obj, float):
+        out += b"\xcb" + struct.pack(">d", obj)
+    elif isinstance(obj, str):
+        encoded = obj.encode("utf-8")
+        n = len(encoded)
+        if n < 32:
+            out.append(0xa0 | n)
+        elif n <= 0xff:
+            out += b"\xd9" + struct.pack(">B", n)
+        elif n <= 0xffff:
+            out += b"\xda" + struct.pack(">H", n)
+        else:
+            out += b"\xdb" + struct.pack(">I", n)
+        out += encoded
+    elif isinstance(obj, (bytes, bytearray)):
+        n = len(obj)
+        if n <= 0xff:
+            out += b"\xc4" + struct.pack(">B", n)
+        elif n <= 0xffff:
+            out += b"\xc5" + struct.pack(">H", n)
+        else:
+            out += b"\xc6" + struct.pack(">I", n)
+        out += obj
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n < 16:
+            out.append(0x90 | n)
+        elif n <= 0xffff:
+            out += b"\xdc" + struct.pack(">H", n)
+        else:
+            out += b"\xdd" + struct.pack(">I", n)
+        for item in obj:
+            _pack(item, out)
+    elif isinstance(obj, dict):
+        n = len(obj)
+        if n < 16:
+            out.append(0x80 | n)
+        elif n <= 0xffff:
+            out += b"\xde" + struct.pack(">H", n)
+        else:
+            out += b"\xdf" + struct.pack(">I", n)
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    else:
+        raise TypeError(f"Cannot serialize {type(obj).__name__} to MessagePack.")
+
+
+# Fixed-width formats: type byte -> (struct format, size)
+_FIXED = {
+    0xcc: (">B", 1), 0xcd: (">H", 2), 0xce: (">I", 4), 0xcf: (">Q", 8),
+    0xd0: (">b", 1), 0xd1: (">h", 2), 0xd2: (">i", 4), 0xd3: (">q", 8),
+    0xca: (">f", 4), 0xcb: (">d", 8),
+}
+# Length-prefixed formats: type byte -> (kind, length struct format, length size)
+_SIZED = {
+    0xd9: ("str", ">B", 1), 0xda: ("str", ">H", 2), 0xdb: ("str", ">I", 4),
+    0xc4: ("bin", ">B", 1), 0xc5: ("bin", ">H", 2), 0xc6: ("bin", ">I", 4),
+    0xdc: ("array", ">H", 2), 0xdd: ("array", ">I", 4),
+    0xde: ("map", ">H", 2), 0xdf: ("map", ">I", 4),
+}
+
+
+def _unpack(data: memoryview, offset: int) -> Tuple[Any, int]:
+    """Pure-Python MessagePack decoder for the types produced by _pack."""
+    byte = data[offset]
+    offset += 1
+    if byte < 0x80:
+        return byte, offset
+    if byte >= 0xe0:
+        return byte - 0x100, offset
+    if 0xa0 <= byte <= 0xbf:
+        return _read(data, offset, "str", byte & 0x1f)
+    if 0x90 <= byte <= 0x9f:
+        return _read(data, offset, "array", byte & 0x0f)
+    if 0x80 <= byte <= 0x8f:
+        return _read(data, offset, "map", byte & 0x0f)
+    if byte == 0xc0:
+        return None, offset
+    if byte == 0xc2:
+        return False, offset
+    if byte == 0xc3:
+        return True, offset
+    if byte in _FIXED:
+        fmt, size = _FIXED[byte]
+        return struct.unpack_from(fmt, data, offset)[0], offset + size
+    if byte in _SIZED:
+        kind, fmt, size = _SIZED[byte]
+        length = struct.unpack_from(fmt, data, offset)[0]
+        return _read(data, offset + size, kind, length)
+    raise ValueError(f"Unsupported MessagePack type byte 0x{byte:02x}.")
+
+
+def _read(data: memoryview, offset: int, kind: str, length: int) -> Tuple[Any, int]:
+    """Reads a str, bin, array or map payload of the given length."""
+    if kind == "str":
+        return str(data[offset:offset + length], "utf-8"), offset + length
+    if kind == "bin":
+        return bytes(data[offset:offset + length]), offset + length
+    if kind == "array":
+        items = []
+        for _ in range(length):
+            item, offset = _unpack(data, offset)
+            items.append(item)
+        return items, offset
+    result = {}
+    for _ in range(length):
+        key, offset = _unpack(data, offset)
+        value, offset = _unpack(data, offset)
+        result[key] = value
+    return result, offset
+
+
+# --- Compression ---
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Picks a content coding from an Accept-Encoding header.
+
+    Prefers brotli (when available) over gzip, honours q=0 exclusions, and
+    returns None for identity.
+    """
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    for coding in (("br", "gzip") if brotli is not None else ("gzip",)):
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress(body: bytes, coding: Optional[str]) -> bytes:
+    """Compresses a response body with the negotiated content coding."""
+    if coding == "br":
+        return brotli.compress(body)
+    if coding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
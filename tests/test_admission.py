@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+from core.admission import AdmissionController, Deadline, DeadlineExceeded, Overloaded, Priority
+
+def _hold_slot(controller, release, priority=Priority.INTERACTIVE):
+    """Starts a thread that holds a slot until the release event is set."""
+    started = threading.Event()
+
+    def worker():
+        with controller.admit(priority):
+            started.set()
+            release.wait()
+    thread = threading.Thread(target=worker)
+    thread.start()
+    started.wait()
+    return thread
+
+def _wait_for_queue(controller, length):
+    """Waits until the given number of requests are queued."""
+    while controller.stats()["queued"] < length:
+        time.sleep(0.001)
+
+def test_deadline():
+    """Tests deadline bookkeeping and checks."""
+    assert not Deadline(60).expired
+    expired = Deadline(0)
+    assert expired.expired
+    assert expired.remaining() == 0.0
+    with pytest.raises(DeadlineExceeded, match="AI step"):
+        expired.check("AI step")
+
+def test_expired_deadline_fails_fast():
+    """Tests that an already-expired request is rejected and counted."""
+    controller = AdmissionController()
+    with pytest.raises(DeadlineExceeded):
+        with controller.admit(deadline=Deadline(0)):
+            pass
+    assert controller.stats()["expired"] == 1
+
+def test_work_raising_deadline_exceeded_counts_as_expired():
+    """Tests that deadlines missed while working are counted as expired."""
+    controller = AdmissionController()
+    with pytest.raises(DeadlineExceeded):
+        with controller.admit():
+            raise DeadlineExceeded("generator")
+    stats = controller.stats()
+    assert (stats["admitted"], stats["expired"], stats["completed"], stats["active"]) == (1, 1, 0, 0)
+
+def test_interactive_waiters_are_admitted_before_batch():
+    """Tests that queued requests are admitted by priority, then arrival."""
+    controller = AdmissionController(max_concurrency=1, max_queue=4)
+    release = threading.Event()
+    holder = _hold_slot(controller, release)
+    order = []
+
+    def waiter(name, priority):
+        with controller.admit(priority):
+            order.append(name)
+    threads = []
+    for name, priority in (("batch", Priority.BATCH), ("interactive", Priority.INTERACTIVE)):
+        thread = threading.Thread(target=waiter, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        _wait_for_queue(controller, len(threads))
+
+    release.set()
+    for thread in [holder] + threads:
+        thread.join()
+    assert order == ["interactive", "batch"]
+    assert controller.stats()["completed"] == 3
+
+def test_full_queue_sheds_requests():
+    """Tests that requests beyond the queue bound fail fast, evicting batch work for interactive work."""
+    controller = AdmissionController(max_concurrency=1, max_queue=1)
+    release = threading.Event()
+    holder = _hold_slot(controller, release)
+    outcome = []
+
+    def batch_waiter():
+        try:
+            with controller.admit(Priority.BATCH):
+                outcome.append("admitted")
+        except Overloaded:
+            outcome.append("shed")
+    thread = threading.Thread(target=batch_waiter)
+    thread.start()
+    _wait_for_queue(controller, 1)
+
+    # Another batch request cannot displace the queued one
+    with pytest.raises(Overloaded):
+        with controller.admit(Priority.BATCH):
+            pass
+
+    # An interactive request evicts the queued batch request and waits in its place
+    def interactive_waiter():
+        with controller.admit(Priority.INTERACTIVE):
+            outcome.append("interactive")
+    interactive = threading.Thread(target=interactive_waiter)
+    interactive.start()
+    thread.join()
+    assert outcome == ["shed"]
+
+    release.set()
+    holder.join()
+    interactive.join()
+    assert outcome == ["shed", "interactive"]
+    assert controller.stats()["shed"] == 2
+
+def test_unmeetable_deadline_is_shed_before_queueing():
+    """Tests that a request whose estimated wait exceeds its deadline is rejected immediately."""
+    controller = AdmissionController(max_concurrency=1, service_time_s=10.0)
+    release = threading.Event()
+    holder = _hold_slot(controller, release)
+
+    with pytest.raises(DeadlineExceeded, match="cannot be met"):
+        with controller.admit(deadline=Deadline(1.0)):
+            pass
+    assert controller.stats()["shed"] == 1
+    release.set()
+    holder.join()
@@ -2,10 +2,13 @@ import pytest
 from app import app as flask_app
 
 @pytest.fixture
-def app():
+def app(tmp_path):
     """Create and configure a new app instance for each test."""
-    flask_app.config.update({"TESTING": True})
+    flask_app.config.update({"TESTING": True, "DESIGN_DB_PATH": str(tmp_path / "designs.db")})
     yield flask_app
+    store = flask_app.extensions.pop("design_store", None)
+    if store is not None:
+        store.close()
 
 @pytest.fixture
 def client(app):
@@ -49,4 +52,138 @@ def test_generate_design_with_unknown_request(client):
     assert b"Design Failed" in response.data
     assert b"The AI could not generate a design plan" in response.data
     # Ensure no schematic content is displayed
-    assert b"Final Schematic" not in response.data
\ No newline at end of file
+    assert b"Final Schematic" not in response.data
+
+def test_generated_design_can_be_reopened(app, client):
+    """
+    Test that a generated design is stored in the history and can be reopened.
+    """
+    client.post('/generate', data={'user_request': 'I need a 5V power supply.'})
+    store = app.extensions["design_store"]
+    store.flush()
+
+    response = client.get('/designs')
+    assert response.status_code == 200
+    assert b"I need a 5V power supply." in response.data
+
+    design_id = store.list_designs()[0].id
+    response = client.get(f'/designs/{design_id}')
+    assert response.status_code == 200
+    assert b"LM7805" in response.data
+
+def test_unknown_design_returns_404(client):
+    """Test that reopening a design that does not exist returns 404."""
+    assert client.get('/designs/does-not-exist').status_code == 404
+
+
+def test_generate_returns_503_when_deadline_cannot_be_met(app, client):
+    """Test that requests whose deadline has already passed fail fast with a 503."""
+    app.config["GENERATE_TIMEOUT_S"] = 0
+    try:
+        response = client.post('/generate', data={'user_request': 'I need a 5V power supply.'})
+    finally:
+        app.config["GENERATE_TIMEOUT_S"] = 30
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert b"busy" in response.data
+
+    stats = client.get('/admin/admission').get_json()
+    assert stats["expired"] >= 1
+
+def test_repeated_generate_requests_stamp_the_plan_template(client):
+    """Test that /generate builds a retrieved plan from the generator's cached template."""
+    from app import orchestrator
+    generator = orchestrator.schematic_generator
+    for _ in range(3):
+        assert client.post('/generate', data={'user_request': 'I need a 5V power supply.'}).status_code == 200
+    hits = generator.template_hits
+    assert client.post('/generate', data={'user_request': 'I need a 5V power supply.'}).status_code == 200
+    assert generator.template_hits == hits + 1
+
+def test_profile_admin_is_hidden_when_profiling_is_disabled(client):
+    """Test that the profile admin page does not exist unless profiling is configured."""
+    assert client.get('/admin/profiles').status_code == 404
+
+def test_profile_admin_links_do_not_carry_the_token(client, monkeypatch, tmp_path):
+    """Test that capture links on the profile admin page leave the token out of the URL."""
+    import app as app_module
+    from core.profiling import PROFILE_HEADER, RequestProfiler
+    profiler = RequestProfiler(str(tmp_path / "profiles"), token="s3cret")
+    monkeypatch.setattr(app_module, "profiler", profiler)
+    (tmp_path / "profiles").mkdir()
+    (tmp_path / "profiles" / "20260101T000000-generate-abcd1234.pstats").write_bytes(b"")
+
+    assert client.get('/admin/profiles').status_code == 403
+    response = client.get('/admin/profiles', headers={PROFILE_HEADER: "s3cret"})
+    assert response.status_code == 200
+    assert b"20260101T000000-generate-abcd1234.pstats" in response.data
+    assert b"s3cret" not in response.data
+
+def test_api_schematic_returns_columnar_json(client):
+    """
+    Test that /api/schematic returns the schematic and plan in the columnar layout.
+    """
+    from core.serialization import from_columnar
+    response = client.get('/api/schematic', query_string={'user_request': 'I need a 5V power supply.'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    schematic, plan = from_columnar(response.get_json())
+    assert plan == ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+    assert [c.reference_designator for c in schematic.components] == ["U1", "C1", "C2"]
+
+def test_api_schematic_negotiates_msgpack_and_gzip(client):
+    """
+    Test that /api/schematic honours Accept and Accept-Encoding.
+    """
+    import gzip
+    from core.serialization import unpackb
+    response = client.post('/api/schematic', json={'user_request': 'I need a 5V power supply.'},
+                           headers={'Accept': 'application/msgpack', 'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/msgpack'
+    assert response.headers['Content-Encoding'] == 'gzip'
+    data = unpackb(gzip.decompress(response.data))
+    assert data["plan"][0] == "add_regulator_5v"
+
+def test_api_schematic_only_saves_posted_designs(client, app):
+    """
+    Test that a GET to /api/schematic is free of side effects and a POST is saved to the history.
+    """
+    assert client.get('/api/schematic', query_string={'user_request': 'I need a 5V power supply.'}).status_code == 200
+    assert client.post('/api/schematic', json={'user_request': 'I need a 5V power supply.'}).status_code == 200
+    store = app.extensions["design_store"]
+    store.flush()
+    assert len(store.list_designs()) == 1
+
+def test_api_schematic_bad_requests(client):
+    """
+    Test that /api/schematic rejects a missing request and returns an empty plan for an unknown one.
+    """
+    response = client.get('/api/schematic')
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+    for body in (["x"], "I need a 5V power supply.", {"user_request": 5}):
+        response = client.post('/api/schematic', json=body)
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+    response = client.post('/api/schematic', data={'user_request': 'Build me a spaceship.'})
+    assert response.status_code == 200
+    assert response.get_json()["plan"] == []
+
+def test_infeasible_requirements_are_explained(client, monkeypatch):
+    """
+    Test that requirements failing the feasibility pre-check are shown with their reasons.
+    """
+    import app as app_module
+    from core.requirements import PowerSupplyRequirements
+    monkeypatch.setattr(app_module, "default_requirements", lambda: PowerSupplyRequirements(
+        block_name="Boost", input_voltage_v=5.0, output_voltage_v=12.0, max_output_current_a=0.5))
+
+    response = client.post('/generate', data={'user_request': 'I need a 5V power supply.'})
+    assert response.status_code == 422
+    assert b"Design Failed" in response.data
+    assert b"cannot step 5V up to 12V" in response.data
+
+    response = client.get('/api/schematic', query_string={'user_request': 'I need a 5V power supply.'})
+    assert response.status_code == 422
+    assert "boost" in response.get_json()["suggestions"][0]
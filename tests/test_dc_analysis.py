@@ -0,0 +1,78 @@
+import pytest
+from core.dc_analysis import DCOperatingPointSolver
+from core.orchestrator import DesignOrchestrator
+from core.requirements import PowerSupplyRequirements
+
+PLAN = ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+
+@pytest.fixture
+def solver():
+    """Provides a DCOperatingPointSolver instance for tests."""
+    return DCOperatingPointSolver()
+
+def _build(input_voltage_v, max_output_current_a=1.0):
+    """Generates the standard 5V power tree for the given input and load."""
+    reqs = PowerSupplyRequirements(
+        block_name="Test 5V Supply",
+        input_voltage_v=input_voltage_v,
+        output_voltage_v=5.0,
+        max_output_current_a=max_output_current_a
+    )
+    return DesignOrchestrator().execute_plan(PLAN, reqs), reqs
+
+def test_regulated_operating_point(solver):
+    """Tests rail voltages, currents and dissipation of the nominal 12V -> 5V design."""
+    schematic, reqs = _build(12.0)
+    point = solver.solve(schematic, reqs)
+
+    assert point.meets_requirements
+    assert point.rail_voltages_v["VIN_12.0V"] == pytest.approx(12.0)
+    assert point.rail_voltages_v["VOUT_5.0V"] == pytest.approx(5.0)
+    assert point.part_currents_a["U1"] == pytest.approx(1.0, rel=1e-6)
+    # (12 - 5) * 1A plus 12V * 5mA quiescent
+    assert point.part_dissipation_w["U1"] == pytest.approx(7.06, rel=1e-6)
+    assert point.supply_current_a == pytest.approx(1.005, rel=1e-5)
+
+def test_dropout_is_reported(solver):
+    """Tests that an input without enough headroom drops the output rail."""
+    schematic, reqs = _build(6.0)
+    point = solver.solve(schematic, reqs)
+
+    assert not point.meets_requirements
+    assert point.rail_voltages_v["VOUT_5.0V"] == pytest.approx(4.0)
+    assert any("dropout" in issue for issue in point.issues)
+
+def test_overcurrent_and_overheating_are_reported(solver):
+    """Tests that loads beyond the regulator ratings are flagged."""
+    schematic, reqs = _build(24.0, max_output_current_a=2.0)
+    point = solver.solve(schematic, reqs)
+
+    assert not point.meets_requirements
+    assert any("rated for" in issue for issue in point.issues)
+    assert any("limit" in issue for issue in point.issues)
+
+def test_structure_and_factorization_are_reused(solver):
+    """Tests that sweeping the input voltage reuses the cached MNA factorization."""
+    for vin in (9.0, 12.0, 15.0):
+        schematic, reqs = _build(vin)
+        assert solver.solve(schematic, reqs).meets_requirements
+
+    assert len(solver._structures) == 1
+    structure = next(iter(solver._structures.values()))
+    assert structure.factorizations == 1
+
+def test_cached_structure_reports_current_net_names(solver):
+    """Tests that a re-solve on a cached structure labels rails with the new schematic's net names."""
+    schematic, reqs = _build(9.0)
+    solver.solve(schematic, reqs)
+    schematic, reqs = _build(12.0)
+    point = solver.solve(schematic, reqs)
+
+    assert len(solver._structures) == 1
+    assert set(point.rail_voltages_v) == {"VIN_12.0V", "VOUT_5.0V", "GND"}
+    assert point.rail_voltages_v["VIN_12.0V"] == pytest.approx(12.0)
+
+    reqs_3v3 = PowerSupplyRequirements("3V3", input_voltage_v=12.0, output_voltage_v=3.3, max_output_current_a=1.0)
+    point = solver.solve(DesignOrchestrator().execute_plan(PLAN, reqs_3v3), reqs_3v3)
+    assert "VOUT_3.3V" in point.rail_voltages_v
+    assert any(issue.startswith("VOUT_3.3V settles at") for issue in point.issues)
@@ -0,0 +1,76 @@
+import pytest
+from core.design_space import (
+    DesignSpaceExplorer, DesignVariant, expand_requirement_grid, pareto_front
+)
+from core.requirements import PowerSupplyRequirements
+from core.schematic import Schematic
+
+@pytest.fixture
+def requirements():
+    """Provides a standard set of PowerSupplyRequirements."""
+    return PowerSupplyRequirements(
+        block_name="Sweep 5V Supply",
+        input_voltage_v=12.0,
+        output_voltage_v=5.0,
+        max_output_current_a=1.0
+    )
+
+def _variant(cost, dissipation, target=None):
+    """Builds a bare variant with the given ratings."""
+    return DesignVariant(
+        requirements=None, target_cost_usd=target, plan=[], schematic=Schematic(),
+        bom_cost_usd=cost, regulator_dissipation_w=dissipation
+    )
+
+def test_expand_requirement_grid(requirements):
+    """Tests that the grid is the cartesian product of the swept parameters."""
+    grid = expand_requirement_grid(requirements, [7.0, 12.0], [0.5, 1.0, 1.5])
+    assert len(grid) == 6
+    assert {(r.input_voltage_v, r.max_output_current_a) for r in grid} == {
+        (7.0, 0.5), (7.0, 1.0), (7.0, 1.5), (12.0, 0.5), (12.0, 1.0), (12.0, 1.5)
+    }
+    assert all(r.output_voltage_v == 5.0 for r in grid)
+
+def test_pareto_front_drops_dominated_and_over_budget_variants():
+    """Tests that dominated variants and variants over their cost target are excluded."""
+    cheap_hot = _variant(0.5, 7.0)
+    pricey_cool = _variant(1.0, 2.0)
+    dominated = _variant(1.2, 3.0)
+    over_budget = _variant(0.1, 0.1, target=0.05)
+    front = pareto_front([dominated, pricey_cool, over_budget, cheap_hot])
+    assert front == [cheap_hot, pricey_cool]
+
+def test_sweep_rates_variants(requirements):
+    """Tests a small in-process sweep end to end."""
+    explorer = DesignSpaceExplorer(max_workers=1)
+    result = explorer.sweep(
+        "I need a 5V power supply.", requirements,
+        input_voltages=[7.0, 12.0], output_currents=[1.0], target_costs=[0.2, 1.0]
+    )
+    assert len(result.variants) == 4
+    # Grid points that only differ by cost target share one generated schematic
+    assert result.variants[0].schematic is result.variants[2].schematic
+
+    assert all(v.bom_cost_usd == pytest.approx(0.51) for v in result.variants)
+    dissipations = sorted({v.regulator_dissipation_w for v in result.variants})
+    assert dissipations == [pytest.approx(2.0), pytest.approx(7.0)]
+
+    # Only the 1.0 USD target is met, and the 7V input dissipates least
+    assert len(result.pareto_front) == 1
+    assert result.pareto_front[0].requirements.input_voltage_v == 7.0
+    assert result.pareto_front[0].target_cost_usd == 1.0
+
+def test_sweep_in_process_pool(requirements):
+    """Tests that generation in a process pool produces complete schematics."""
+    explorer = DesignSpaceExplorer(max_workers=2)
+    result = explorer.sweep("I need a 5V power supply.", requirements, input_voltages=[9.0, 12.0])
+    assert len(result.variants) == 2
+    assert all(len(v.schematic.components) == 3 for v in result.variants)
+
+def test_sweep_skips_infeasible_points(requirements):
+    """Tests that grid points no regulator can meet are reported instead of generated."""
+    explorer = DesignSpaceExplorer(max_workers=1)
+    result = explorer.sweep("I need a 5V power supply.", requirements, input_voltages=[6.0, 12.0, 36.0])
+    assert [v.requirements.input_voltage_v for v in result.variants] == [12.0]
+    assert [req.input_voltage_v for req, _ in result.infeasible] == [6.0, 36.0]
+    assert all(not report.feasible for _, report in result.infeasible)
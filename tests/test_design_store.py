@@ -0,0 +1,133 @@
+import sqlite3
+import time
+
+import pytest
+from core.design_store import DesignStore
+from core.orchestrator import DesignOrchestrator
+from core.requirements import PowerSupplyRequirements, ProjectRequirements
+
+PLAN = ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+
+@pytest.fixture
+def store(tmp_path):
+    """Provides a DesignStore backed by a temporary database."""
+    store = DesignStore(str(tmp_path / "history" / "designs.db"))
+    yield store
+    store.close()
+
+@pytest.fixture
+def requirements():
+    """Provides a standard set of PowerSupplyRequirements."""
+    return PowerSupplyRequirements(
+        block_name="Test 5V Supply",
+        input_voltage_v=12.0,
+        output_voltage_v=5.0,
+        max_output_current_a=1.0,
+        protection_features=["short-circuit"]
+    )
+
+def test_save_and_reload_design(store, requirements):
+    """Tests that a saved design round-trips through the database."""
+    schematic = DesignOrchestrator().execute_plan(PLAN, requirements)
+    project = ProjectRequirements(project_name="Weather Station", target_cost_usd=25.0)
+    design_id = store.save_design("I need a 5V power supply.", requirements, PLAN, schematic, project)
+    store.flush()
+
+    design = store.get_design(design_id)
+    assert design.project_name == "Weather Station"
+    assert design.requirements == requirements
+    assert design.plan == PLAN
+    assert design.schematic == schematic
+    assert design.fingerprint == schematic.fingerprint()
+    assert design.schematic.fingerprint() == schematic.fingerprint()
+    assert store.get_project("Weather Station") == project
+
+def test_saved_schematic_is_isolated_from_later_edits(store, requirements):
+    """Tests that editing a schematic after saving does not change the stored copy."""
+    schematic = DesignOrchestrator().execute_plan(PLAN[:1], requirements)
+    design_id = store.save_design("regulator only", requirements, PLAN[:1], schematic)
+    DesignOrchestrator().schematic_generator.execute_command("add_input_capacitor", schematic, requirements)
+    store.flush()
+
+    assert len(store.get_design(design_id).schematic.components) == 1
+
+def test_queries_by_project_time_and_fingerprint(store, requirements):
+    """Tests the indexed history queries."""
+    orchestrator = DesignOrchestrator()
+    full = orchestrator.execute_plan(PLAN, requirements)
+    partial = orchestrator.execute_plan(PLAN[:2], requirements)
+    alpha = ProjectRequirements(project_name="Alpha")
+    beta = ProjectRequirements(project_name="Beta")
+
+    first = store.save_design("a1", requirements, PLAN, full, alpha)
+    store.flush()
+    cutoff = time.time()
+    second = store.save_design("a2", requirements, PLAN[:2], partial, alpha)
+    third = store.save_design("b1", requirements, PLAN, full, beta)
+    store.flush()
+
+    assert {d.id for d in store.list_designs(project_name="Alpha")} == {first, second}
+    assert {d.id for d in store.list_designs(since=cutoff)} == {second, third}
+    assert {d.id for d in store.find_by_fingerprint(full.fingerprint())} == {first, third}
+    assert len(store.list_designs(limit=1)) == 1
+
+def test_database_uses_wal_mode(store):
+    """Tests that the database is opened in write-ahead logging mode."""
+    connection = sqlite3.connect(store.path)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    connection.close()
+
+def test_short_lived_threads_share_a_bounded_pool(store):
+    """Tests that reads from many threads do not each leave a connection open."""
+    import threading
+    threads = [threading.Thread(target=store.list_designs) for _ in range(200)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # The writer's connection plus at most max_read_connections readers
+    assert len(store._connections) <= 1 + store.max_read_connections
+
+def test_unserializable_design_fails_on_the_caller(store, requirements):
+    """Tests that bad input raises in save_design and leaves the writer running."""
+    schematic = DesignOrchestrator().execute_plan(PLAN[:1], requirements)
+    requirements.protection_features = {"short-circuit"}
+    with pytest.raises(TypeError):
+        store.save_design("bad", requirements, PLAN[:1], schematic)
+    requirements.protection_features = ["short-circuit"]
+    design_id = store.save_design("good", requirements, PLAN[:1], schematic)
+    store.flush()
+    assert store._writer.is_alive()
+    assert store.get_design(design_id) is not None
+
+def test_writer_survives_unexpected_errors(store, requirements, monkeypatch):
+    """Tests that a non-SQLite error in a write neither kills the writer nor hangs flush()."""
+    schematic = DesignOrchestrator().execute_plan(PLAN[:1], requirements)
+
+    def fail(connection, items):
+        raise RuntimeError("disk on fire")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(DesignStore, "_write_batch", staticmethod(fail))
+        lost_id = store.save_design("lost", requirements, PLAN[:1], schematic)
+        store.flush()
+    assert store._writer.is_alive()
+    design_id = store.save_design("kept", requirements, PLAN[:1], schematic)
+    store.flush()
+    assert store.get_design(lost_id) is None
+    assert store.get_design(design_id) is not None
+
+def test_failed_batch_is_retried_one_design_at_a_time(tmp_path, requirements, monkeypatch):
+    """Tests that one bad design in a batch does not discard the others."""
+    store = DesignStore(str(tmp_path / "designs.db"), flush_interval_s=0.5)
+    schematic = DesignOrchestrator().execute_plan(PLAN[:1], requirements)
+    ids = iter(["a" * 32, "a" * 32, "b" * 32])
+    monkeypatch.setattr("core.design_store.uuid.uuid4", lambda: type("U", (), {"hex": next(ids)})())
+    try:
+        for request in ("first", "duplicate id", "third"):
+            store.save_design(request, requirements, PLAN[:1], schematic)
+        store.flush()
+        assert store.get_design("a" * 32).user_request == "first"
+        assert store.get_design("b" * 32).user_request == "third"
+    finally:
+        store.close()
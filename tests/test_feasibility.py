@@ -0,0 +1,79 @@
+import pytest
+from core.feasibility import LIBRARY_BOUNDS, check_feasibility, compute_library_bounds
+from core.requirements import PowerSupplyRequirements, ProjectRequirements
+
+def _psu(vin, vout=5.0, current=1.0):
+    """Builds power supply requirements with the given operating point."""
+    return PowerSupplyRequirements("Test", input_voltage_v=vin, output_voltage_v=vout, max_output_current_a=current)
+
+def test_library_bounds_come_from_component_library():
+    """Tests the bounds precomputed from the LM7805 and the two capacitors."""
+    assert LIBRARY_BOUNDS.output_voltages_v == (5.0,)
+    assert LIBRARY_BOUNDS.min_dropout_voltage_v == 2.0
+    assert LIBRARY_BOUNDS.max_output_current_a == 1.5
+    assert LIBRARY_BOUNDS.max_dissipation_w == 15.0
+    assert LIBRARY_BOUNDS.min_bom_cost_usd == pytest.approx(0.51)
+
+def test_library_without_regulator_is_rejected():
+    """Tests that bounds cannot be computed for a library without a regulator."""
+    with pytest.raises(ValueError):
+        compute_library_bounds({})
+
+def test_nominal_design_is_feasible():
+    """Tests that the app's default 12V -> 5V at 1A (7W) passes."""
+    report = check_feasibility(_psu(12.0), ProjectRequirements("P", target_cost_usd=25.0))
+    assert report.feasible
+    assert report.reasons == []
+    assert report.limits["input_voltage_v_min"] == 7.0
+
+def test_step_up_is_redirected_to_switching_regulator():
+    """Tests that 5V -> 12V is rejected with a suggestion to use a boost regulator."""
+    report = check_feasibility(_psu(5.0, vout=12.0, current=0.5))
+    assert not report.feasible
+    assert "cannot step 5V up to 12V" in report.reasons[0]
+    assert "boost" in report.suggestions[0]
+
+def test_insufficient_headroom_suggests_minimum_input():
+    """Tests that 6V -> 5V is rejected for dropout and the minimum input voltage is suggested."""
+    report = check_feasibility(_psu(6.0))
+    assert not report.feasible
+    assert "dropout" in report.reasons[0]
+    assert "at least 7V" in report.suggestions[0]
+
+def test_dissipation_propagates_input_and_current_limits():
+    """Tests that 48V -> 5V at 1A is rejected with the largest feasible Vin and current."""
+    report = check_feasibility(_psu(48.0))
+    assert not report.feasible
+    assert "dissipate" in report.reasons[0]
+    vin_max = report.limits["input_voltage_v_max"]
+    current_max = report.limits["max_output_current_a_max"]
+    # Both propagated limits sit exactly on the dissipation boundary
+    assert check_feasibility(_psu(vin_max - 1e-6)).feasible
+    assert not check_feasibility(_psu(vin_max + 1e-3)).feasible
+    assert check_feasibility(_psu(48.0, current=current_max)).feasible
+    assert any("switching (buck)" in s for s in report.suggestions)
+
+def test_overcurrent_and_cost_target_are_reported():
+    """Tests that an excessive current and a cost target below the cheapest BOM are both reported."""
+    report = check_feasibility(_psu(7.5, current=2.0), ProjectRequirements("P", target_cost_usd=0.10))
+    assert len(report.reasons) == 2
+    assert "cheapest possible BOM of $0.51" in report.reasons[0]
+    assert "1.5A rating" in report.reasons[1]
+
+def test_non_positive_values_are_rejected():
+    """Tests that a zero output current is rejected before any other check."""
+    report = check_feasibility(_psu(12.0, current=0.0))
+    assert report.reasons == ["The output current must be positive."]
+
+@pytest.mark.parametrize("vin, vout", [(12.0, 3.3), (24.0, 15.0)])
+def test_unreachable_output_voltage_is_redirected(vin, vout):
+    """Tests that output voltages no fixed regulator provides are rejected with alternatives."""
+    report = check_feasibility(_psu(vin, vout=vout, current=0.5))
+    assert not report.feasible
+    assert any(f"outputs {vout:g}V" in r and "5V" in r for r in report.reasons)
+    assert any("adjustable or switching regulator" in s and "5V instead" in s for s in report.suggestions)
+
+def test_output_voltage_within_dc_tolerance_is_feasible():
+    """Tests that outputs within the DC analysis tolerance of 5V are accepted, and just outside are not."""
+    assert check_feasibility(_psu(12.0, vout=5.05)).feasible
+    assert not check_feasibility(_psu(12.0, vout=5.2)).feasible
@@ -0,0 +1,94 @@
+import pytest
+from core.hierarchy import BlockDefinition, BlockLibrary, HierarchicalSchematic
+from core.requirements import PowerSupplyRequirements
+from core.schematic import Pin
+
+PLAN = ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+PORTS = {"VIN": "VIN_12.0V", "VOUT": "VOUT_5.0V", "GND": "GND"}
+
+@pytest.fixture
+def requirements():
+    """Provides a standard set of PowerSupplyRequirements."""
+    return PowerSupplyRequirements(
+        block_name="Channel 5V Supply",
+        input_voltage_v=12.0,
+        output_voltage_v=5.0,
+        max_output_current_a=0.5
+    )
+
+@pytest.fixture
+def psu_block(requirements):
+    """Provides the standard 5V supply as a block definition."""
+    return BlockLibrary().get_block("PSU_5V", PLAN, requirements, PORTS)
+
+def test_instances_share_the_definition(psu_block):
+    """Tests that instances are flyweights over a single definition."""
+    board = HierarchicalSchematic()
+    for channel in range(16):
+        board.instantiate(psu_block, f"CH{channel}", {"VIN": "VIN_12V", "VOUT": f"CH{channel}_5V", "GND": "GND"})
+
+    assert len(board.definitions) == 1
+    assert all(instance.definition is psu_block for instance in board.instances)
+    assert board.part_count == 48
+
+def test_flatten_merges_bound_ports(psu_block):
+    """Tests that the flat view prefixes designators and merges bound nets."""
+    board = HierarchicalSchematic()
+    board.instantiate(psu_block, "CH1", {"VIN": "VIN_12V", "VOUT": "CH1_5V", "GND": "GND"})
+    board.instantiate(psu_block, "CH2", {"VIN": "VIN_12V", "VOUT": "CH2_5V", "GND": "GND"})
+
+    flat = board.flatten()
+    assert sorted(c.reference_designator for c in flat.components) == [
+        "CH1/C1", "CH1/C2", "CH1/U1", "CH2/C1", "CH2/C2", "CH2/U1"
+    ]
+    assert sorted(net.name for net in flat.nets) == ["CH1_5V", "CH2_5V", "GND", "VIN_12V"]
+    assert flat.find_net("VIN_12V").pins == {
+        Pin("CH1/U1", "IN"), Pin("CH1/C1", "1"), Pin("CH2/U1", "IN"), Pin("CH2/C1", "1")
+    }
+    assert len(flat.find_net("GND").pins) == 6
+
+    schematic = flat.to_schematic()
+    assert len(schematic.components) == 6
+    assert schematic.find_net("CH2_5V") is not None
+
+def test_unbound_ports_stay_local(psu_block):
+    """Tests that ports without a binding become nets local to the instance."""
+    board = HierarchicalSchematic()
+    board.instantiate(psu_block, "CH1", {"GND": "GND"})
+    names = {net.name for net in board.flatten().nets}
+    assert names == {"CH1/VIN_12.0V", "CH1/VOUT_5.0V", "GND"}
+
+def test_invalid_instances_are_rejected(psu_block, requirements):
+    """Tests validation of instance names, bindings and ports."""
+    board = HierarchicalSchematic()
+    board.instantiate(psu_block, "CH1")
+    with pytest.raises(ValueError):
+        board.instantiate(psu_block, "CH1")
+    with pytest.raises(ValueError):
+        board.instantiate(psu_block, "CH2", {"VBAT": "VBAT"})
+
+    schematic = BlockLibrary().orchestrator.execute_plan(PLAN, requirements)
+    with pytest.raises(ValueError):
+        BlockDefinition.from_schematic("Broken", schematic, {"VIN": "NOT_A_NET"})
+
+def test_block_library_generates_each_block_once(requirements):
+    """Tests that repeated requests for the same block reuse the generated definition."""
+    library = BlockLibrary()
+    first = library.get_block("PSU_5V", PLAN, requirements, PORTS)
+    second = library.get_block("PSU_5V", PLAN, requirements, PORTS)
+    assert first is second
+
+def test_block_library_keeps_the_requested_name(requirements):
+    """Tests that the same content requested under another name is returned under that name."""
+    library = BlockLibrary()
+    first = library.get_block("A", PLAN, requirements, PORTS)
+    second = library.get_block("B", PLAN, requirements, PORTS)
+    assert (first.name, second.name) == ("A", "B")
+    assert second.components is first.components
+    assert library.get_block("B", PLAN, requirements, PORTS) is second
+
+def test_block_definitions_are_hashable(psu_block):
+    """Tests that frozen block definitions can be hashed and used as keys."""
+    assert {psu_block: 1}[psu_block] == 1
+    assert hash(psu_block) == hash(BlockDefinition(psu_block.name, psu_block.components,
+                                                   psu_block.nets, psu_block.ports))
@@ -1,5 +1,5 @@
 import pytest
-from core.orchestrator import DesignOrchestrator
+from core.orchestrator import DesignOrchestrator, InvalidPlanError
 from core.requirements import PowerSupplyRequirements
 from core.schematic import Schematic
 
@@ -59,4 +59,78 @@ def test_create_schematic_from_unknown_request(orchestrator, requirements):
     assert schematic is not None
     assert isinstance(schematic, Schematic)
     assert len(schematic.components) == 0
-    assert len(schematic.nets) == 0
\ No newline at end of file
+    assert len(schematic.nets) == 0
+
+def _streaming_service(orchestrator, steps, events, error=None):
+    """Replaces the AI service with one that streams the given steps and logs each yield."""
+    def iter_design_plan(user_request, deadline=None):
+        for step in steps:
+            events.append(f"yield {step}")
+            yield step
+        if error is not None:
+            raise error
+    orchestrator.ai_strategy_service.iter_design_plan = iter_design_plan
+
+def test_plan_steps_execute_as_they_stream(orchestrator, requirements):
+    """
+    Tests that each plan step is executed before the next one is requested.
+    """
+    events = []
+    steps = ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+    _streaming_service(orchestrator, steps, events)
+    original = orchestrator.schematic_generator.execute_command
+
+    def logging_execute(command, schematic, reqs, deadline=None):
+        events.append(f"execute {command}")
+        original(command, schematic, reqs, deadline)
+    orchestrator.schematic_generator.execute_command = logging_execute
+
+    schematic, plan = orchestrator.create_schematic_from_request("anything", requirements)
+
+    assert plan == steps
+    assert events == [f"{action} {step}" for step in steps for action in ("yield", "execute")]
+    assert len(schematic.components) == 3
+
+def test_aborted_stream_is_rolled_back(orchestrator, requirements):
+    """
+    Tests that a stream failing part-way re-raises and discards executed steps.
+    """
+    built = []
+    original = orchestrator.schematic_generator.execute_command
+
+    def capturing_execute(command, schematic, reqs, deadline=None):
+        built.append(schematic)
+        original(command, schematic, reqs, deadline)
+    orchestrator.schematic_generator.execute_command = capturing_execute
+    _streaming_service(orchestrator, ["add_regulator_5v"], [], error=ConnectionError("stream closed"))
+
+    with pytest.raises(ConnectionError):
+        orchestrator.create_schematic_from_request("anything", requirements)
+
+    assert len(built) == 1
+    assert built[0].components == []
+    assert built[0].nets == []
+
+def test_invalid_step_is_rejected_and_rolled_back(orchestrator, requirements):
+    """
+    Tests that an unsupported step later in the stream invalidates the whole plan.
+    """
+    _streaming_service(orchestrator, ["add_regulator_5v", "add_flux_capacitor"], [])
+    with pytest.raises(InvalidPlanError, match="add_flux_capacitor"):
+        orchestrator.create_schematic_from_request("anything", requirements)
+
+def test_infeasible_requirements_are_rejected_before_the_ai(orchestrator, monkeypatch):
+    """
+    Tests that impossible requirements never reach the AI service.
+    """
+    from core.orchestrator import InfeasibleRequirementsError
+
+    def unexpected_ai_call(user_request, deadline=None):
+        raise AssertionError("The AI service must not be called.")
+
+    monkeypatch.setattr(orchestrator.ai_strategy_service, "iter_design_plan", unexpected_ai_call)
+    step_up = PowerSupplyRequirements("Boost", input_voltage_v=5.0, output_voltage_v=12.0, max_output_current_a=0.5)
+    with pytest.raises(InfeasibleRequirementsError) as excinfo:
+        orchestrator.create_schematic_from_request("I need a 5V power supply.", step_up)
+    assert not excinfo.value.report.feasible
+    assert orchestrator.admission_controller.stats()["admitted"] == 0
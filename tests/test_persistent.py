@@ -0,0 +1,66 @@
+import random
+
+import pytest
+from core.persistent import PersistentMap, PersistentVector
+
+def test_vector_matches_list_across_copies():
+    """Tests random appends, pops and assignments on a vector and its copies against plain lists."""
+    rng = random.Random(7)
+    vectors = [(PersistentVector(), [])]
+    for _ in range(5000):
+        vector, expected = rng.choice(vectors)
+        action = rng.random()
+        if action < 0.6:
+            item = rng.random()
+            vector.append(item)
+            expected.append(item)
+        elif action < 0.75 and expected:
+            assert vector.pop() == expected.pop()
+        elif action < 0.95 and expected:
+            index = rng.randrange(-len(expected), len(expected))
+            vector[index] = expected[index] = rng.random()
+        elif len(vectors) < 8:
+            vectors.append((vector.copy(), list(expected)))
+    for vector, expected in vectors:
+        assert len(vector) == len(expected)
+        assert vector == expected
+        assert [vector[i] for i in range(len(expected))] == expected
+
+def test_vector_index_errors():
+    """Tests that out-of-range access and popping an empty vector raise IndexError."""
+    vector = PersistentVector([1, 2, 3])
+    assert vector[-1] == 3
+    assert vector[1:] == [2, 3]
+    with pytest.raises(IndexError):
+        vector[3]
+    with pytest.raises(IndexError):
+        PersistentVector().pop()
+
+def test_map_matches_dict_across_copies():
+    """Tests random inserts and deletes on a map and its copies against plain dicts."""
+    rng = random.Random(11)
+    maps = [(PersistentMap(), {})]
+    for _ in range(5000):
+        mapping, expected = rng.choice(maps)
+        key = f"NET{rng.randrange(2000)}"
+        action = rng.random()
+        if action < 0.7:
+            mapping[key] = expected[key] = rng.random()
+        elif action < 0.95 and key in expected:
+            del mapping[key]
+            del expected[key]
+        elif len(maps) < 8:
+            maps.append((mapping.copy(), dict(expected)))
+    for mapping, expected in maps:
+        assert len(mapping) == len(expected)
+        assert dict(mapping.items()) == expected
+        assert all(mapping.get(key) == value for key, value in expected.items())
+        assert "MISSING" not in mapping
+
+def test_map_setdefault_keeps_existing_values():
+    """Tests that setdefault only stores values for new keys."""
+    mapping = PersistentMap()
+    assert mapping.setdefault("VIN", 0) == 0
+    assert mapping.setdefault("VIN", 1) == 0
+    with pytest.raises(KeyError):
+        del mapping["GND"]
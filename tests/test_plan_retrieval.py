@@ -0,0 +1,161 @@
+import threading
+
+import pytest
+from core.orchestrator import DesignOrchestrator
+from core.plan_retrieval import (
+    DEFAULT_SIMILARITY_THRESHOLD, PlanIndex, RetrievingAIStrategyService, evaluate, head_noun, tokenize
+)
+from core.requirements import PowerSupplyRequirements
+
+PLAN = ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+
+@pytest.fixture
+def index():
+    """Provides an index holding one accepted 5V request."""
+    index = PlanIndex()
+    index.add("I need a 5V power supply for my Arduino project.", PLAN)
+    return index
+
+def test_tokenize_normalizes_units_and_abbreviations():
+    """Tests that spelled-out units and abbreviations share tokens."""
+    assert tokenize("5 volt supply for a Pi") == ["5v", "supply", "pi"]
+    assert tokenize("need 5V PSU") == ["5v", "power", "supply"]
+
+@pytest.mark.parametrize("request_text", ["5 volt supply for a Pi", "need 5V PSU", "Please build a 5v power supply"])
+def test_paraphrases_are_retrieved(index, request_text):
+    """Tests that paraphrases of a stored request retrieve its plan."""
+    match = index.query(request_text)
+    assert match is not None
+    assert match.plan == PLAN
+    assert match.similarity >= DEFAULT_SIMILARITY_THRESHOLD
+
+@pytest.mark.parametrize("text, head", [
+    ("I need a 5V power supply.", "supply"), ("5 volt supply for a Pi", "supply"),
+    ("need 5V PSU", "supply"), ("5V power switch", "switch"), ("5V USB power bank", "bank"),
+])
+def test_head_noun(text, head):
+    """Tests that the head of the main noun phrase is found before any preposition."""
+    assert head_noun(text) == head
+
+@pytest.mark.parametrize("request_text", [
+    "5V USB hub", "5V tolerant level shifter", "5V relay driver", "5V fan controller",
+    "5V power switch", "5V supply monitor", "5V USB power bank"
+])
+def test_other_circuits_at_the_same_voltage_are_not_retrieved(request_text):
+    """Tests that a short stored request, as /generate stores it, does not match other 5V circuits."""
+    index = PlanIndex()
+    index.add("I need a 5V power supply.", PLAN)
+    match = index.query(request_text)
+    assert match is None or match.similarity < DEFAULT_SIMILARITY_THRESHOLD
+
+def test_different_quantities_are_never_retrieved(index):
+    """Tests that requests naming other voltages do not reuse the 5V plan."""
+    assert index.query("I need a 12V power supply for my Arduino project.") is None
+
+def test_index_persistence(index, tmp_path):
+    """Tests that an index round-trips through disk."""
+    path = str(tmp_path / "plans.json")
+    index.save(path)
+    loaded = PlanIndex.load(path)
+    assert len(loaded) == 1
+    assert loaded.query("need 5V PSU").plan == PLAN
+    assert len(PlanIndex.load(str(tmp_path / "missing.json"))) == 0
+
+def test_service_inserts_on_miss_and_reuses_on_hit(tmp_path):
+    """Tests that accepted plans are indexed, persisted and reused for paraphrases."""
+    path = str(tmp_path / "plans.json")
+    service = RetrievingAIStrategyService(index_path=path)
+    orchestrator = DesignOrchestrator(ai_strategy_service=service)
+
+    assert orchestrator.ai_strategy_service.get_design_plan("I need a 5V power supply.") == PLAN
+    assert (service.hits, service.misses) == (0, 1)
+    service.close()
+    assert len(PlanIndex.load(path)) == 1
+
+    # "5 volt PSU" would not match the keyword mock, but is served from the index
+    reloaded = RetrievingAIStrategyService(index_path=path)
+    assert reloaded.get_design_plan("5 volt PSU please") == PLAN
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+
+def test_misses_are_saved_in_the_background_not_per_request(tmp_path):
+    """Tests that a miss does not rewrite the index file, and the saver thread does later."""
+    path = str(tmp_path / "plans.json")
+    slow = RetrievingAIStrategyService(index_path=path, save_interval_s=60.0)
+    slow.get_design_plan("I need a 5V power supply.")
+    assert len(PlanIndex.load(path)) == 0
+    slow.close()
+    assert len(PlanIndex.load(path)) == 1
+
+    path = str(tmp_path / "background.json")
+    service = RetrievingAIStrategyService(index_path=path, save_interval_s=0.05)
+    try:
+        service.get_design_plan("I need a 5V power supply.")
+        for _ in range(100):
+            if len(PlanIndex.load(path)) == 1:
+                break
+            threading.Event().wait(0.05)
+        assert len(PlanIndex.load(path)) == 1
+    finally:
+        service.close()
+
+def test_concurrent_adds_keep_requests_and_plans_aligned():
+    """Tests that rows assigned by concurrent add() calls line up with their plans."""
+    index = PlanIndex()
+
+    def add(worker):
+        for i in range(50):
+            index.add(f"request {worker} {i}", [f"step_{worker}_{i}"])
+
+    threads = [threading.Thread(target=add, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(index) == 400
+    for request, plan in zip(index._requests, index._plans):
+        _, worker, i = request.split()
+        assert plan == [f"step_{worker}_{i}"]
+    assert index.query("request 3 17").plan == ["step_3_17"]
+
+def test_retrieved_plans_are_stamped_from_the_template():
+    """Tests that requests served from the index build the whole plan at once and stamp its template."""
+    orchestrator = DesignOrchestrator(ai_strategy_service=RetrievingAIStrategyService())
+    generator = orchestrator.schematic_generator
+    reqs = PowerSupplyRequirements("PSU", input_voltage_v=12.0, output_voltage_v=5.0, max_output_current_a=1.0)
+
+    streamed, _ = orchestrator.create_schematic_from_request("I need a 5V power supply.", reqs)
+    assert (generator.template_hits, generator.template_misses) == (0, 0)
+
+    orchestrator.create_schematic_from_request("5 volt PSU please", reqs)
+    assert (generator.template_hits, generator.template_misses) == (0, 1)
+    stamped, plan = orchestrator.create_schematic_from_request("need 5V PSU", reqs)
+    assert (generator.template_hits, generator.template_misses) == (1, 1)
+    assert plan == PLAN
+    assert stamped.to_dict() == streamed.to_dict()
+    assert orchestrator.ai_strategy_service.hits == 2
+
+def test_miss_queries_the_index_once(monkeypatch):
+    """Tests that a request the index cannot answer is looked up only once on the way to the AI."""
+    service = RetrievingAIStrategyService()
+    orchestrator = DesignOrchestrator(ai_strategy_service=service)
+    reqs = PowerSupplyRequirements("PSU", input_voltage_v=12.0, output_voltage_v=5.0, max_output_current_a=1.0)
+    queries = []
+    original = service.index.query
+    monkeypatch.setattr(service.index, "query", lambda text: queries.append(text) or original(text))
+
+    orchestrator.create_schematic_from_request("I need a 5V power supply.", reqs)
+    assert queries == ["I need a 5V power supply."]
+    assert (service.hits, service.misses) == (0, 1)
+
+def test_empty_plans_are_not_indexed():
+    """Tests that requests the AI could not plan are not stored."""
+    service = RetrievingAIStrategyService()
+    assert service.get_design_plan("Build me a spaceship.") == []
+    assert len(service.index) == 0
+
+def test_evaluate_reports_recall_and_false_hits(index):
+    """Tests the labeled evaluation helper."""
+    report = evaluate(index, [("need 5V PSU", PLAN), ("Design a differential pair", None)])
+    assert report.recall == 1.0
+    assert report.false_hit_rate == 0.0
+    assert report.mean_latency_ms >= 0.0
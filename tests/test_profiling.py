@@ -0,0 +1,69 @@
+import os
+
+import pytest
+from flask import Flask, render_template_string
+from core.profiling import CAPTURE_HEADER, PROFILE_HEADER, RequestProfiler
+
+def _make_app(profiler):
+    """Builds a minimal app with one profiled view."""
+    app = Flask(__name__)
+
+    @app.route('/work')
+    @profiler.wrap
+    def work():
+        total = sum(i * i for i in range(1000))
+        return render_template_string("{{ total }}", total=total)
+
+    return app
+
+def test_disabled_profiler_returns_view_unchanged(tmp_path):
+    """Tests that no wrapper is installed when profiling is disabled."""
+    profiler = RequestProfiler(str(tmp_path))
+
+    def view():
+        return "ok"
+    assert not profiler.enabled
+    assert profiler.wrap(view) is view
+
+def test_authorized_request_is_profiled(tmp_path):
+    """Tests that a request carrying the token is captured and listed."""
+    profiler = RequestProfiler(str(tmp_path), token="s3cret")
+    client = _make_app(profiler).test_client()
+
+    response = client.get('/work', headers={PROFILE_HEADER: "s3cret"})
+    assert response.status_code == 200
+    name = response.headers[CAPTURE_HEADER]
+
+    captures = profiler.list_captures()
+    assert [c.name for c in captures] == [name]
+    assert captures[0].endpoint == "work"
+    assert "work" in profiler.summary(name)
+
+def test_unauthorized_request_is_not_profiled(tmp_path):
+    """Tests that a wrong token neither profiles nor fails the request."""
+    profiler = RequestProfiler(str(tmp_path), token="s3cret")
+    client = _make_app(profiler).test_client()
+
+    response = client.get('/work?profile=guess')
+    assert response.status_code == 200
+    assert CAPTURE_HEADER not in response.headers
+    assert profiler.list_captures() == []
+
+def test_sampling_and_retention(tmp_path):
+    """Tests sampled captures and that only the newest captures are kept."""
+    profiler = RequestProfiler(str(tmp_path), token="s3cret", sample_rate=1.0, max_captures=2)
+    client = _make_app(profiler).test_client()
+    for _ in range(4):
+        assert CAPTURE_HEADER in client.get('/work').headers
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_sampling_requires_a_token(tmp_path):
+    """Tests that sampled captures cannot be configured without a token to view them."""
+    with pytest.raises(ValueError):
+        RequestProfiler(str(tmp_path), sample_rate=0.1)
+
+def test_capture_names_are_validated(tmp_path):
+    """Tests that capture lookups cannot escape the capture directory."""
+    profiler = RequestProfiler(str(tmp_path), token="s3cret")
+    assert profiler.path_for("../secrets.pstats") is None
+    assert profiler.summary("missing.pstats") is None
@@ -1,11 +1,18 @@
 """
 Unit tests for core.requirements and core.requirements_parser.
 """
+import importlib.util
+import io
+import json
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 from core.requirements import ProjectRequirements, PowerSupplyRequirements
-from core.requirements_parser import prompt_for_project_requirements, prompt_for_power_supply_requirements
+from core.requirements_parser import (
+    bounded_map, prompt_for_project_requirements, prompt_for_power_supply_requirements,
+    read_requirement_records, record_to_requirements, run_bulk
+)
 
 class TestRequirementsDataStructures(unittest.TestCase):
     """Tests for the data structure classes in core.requirements."""
@@ -204,5 +211,81 @@ class TestRequirementsParser(unittest.TestCase):
         psu = prompt_for_power_supply_requirements()
         self.assertIsNone(psu)
 
+
+class TestBulkRequirements(unittest.TestCase):
+    """Tests for the non-interactive bulk mode in core.requirements_parser."""
+
+    CSV_INPUT = (
+        "project_name,block_name,input_voltage_v,output_voltage_v,max_output_current_a,protection_features,target_cost_usd\n"
+        "Weather Station,Main 5V,12,5,1.0,\"short-circuit,over-voltage\",25\n"
+        ",Sensor 3.3V,5,3.3,0.2,,\n"
+    )
+
+    def test_read_csv_records(self):
+        """Test streaming records from CSV and converting them to requirements."""
+        records = list(read_requirement_records(io.StringIO(self.CSV_INPUT), "csv"))
+        self.assertEqual(len(records), 2)
+
+        project, psu, user_request = record_to_requirements(records[0])
+        self.assertEqual(project, ProjectRequirements(project_name="Weather Station", target_cost_usd=25.0))
+        self.assertEqual(psu.input_voltage_v, 12.0)
+        self.assertEqual(psu.protection_features, ["short-circuit", "over-voltage"])
+        self.assertEqual(user_request, "I need a 5V power supply.")
+
+        project, psu, user_request = record_to_requirements(records[1])
+        self.assertIsNone(project)
+        self.assertEqual(psu.output_voltage_v, 3.3)
+        self.assertEqual(psu.protection_features, [])
+
+    def test_read_jsonl_records(self):
+        """Test streaming records from JSON Lines, skipping blank lines."""
+        jsonl = '{"input_voltage_v": 9, "output_voltage_v": 5, "max_output_current_a": 0.5}\n\n'
+        self.assertEqual(len(list(read_requirement_records(io.StringIO(jsonl), "jsonl"))), 1)
+
+    @unittest.skipUnless(importlib.util.find_spec("yaml"), "YAML input requires the optional PyYAML package")
+    def test_read_yaml_records(self):
+        """Test streaming records from multi-document YAML."""
+        yaml_input = "input_voltage_v: 9\noutput_voltage_v: 5\nmax_output_current_a: 0.5\n---\n" \
+                     "input_voltage_v: 12\noutput_voltage_v: 5\nmax_output_current_a: 1\n"
+        records = list(read_requirement_records(io.StringIO(yaml_input), "yaml"))
+        self.assertEqual([r["input_voltage_v"] for r in records], [9, 12])
+
+    def test_record_missing_mandatory_field(self):
+        """Test that a record without a mandatory numeric field is rejected."""
+        with self.assertRaises(ValueError):
+            record_to_requirements({"input_voltage_v": "12", "output_voltage_v": "5"})
+
+    def test_run_bulk_writes_one_result_per_record(self):
+        """Test an in-process bulk run, including a record that fails."""
+        jsonl = "\n".join(json.dumps(r) for r in (
+            {"block_name": "A", "input_voltage_v": 12, "output_voltage_v": 5, "max_output_current_a": 1},
+            {"block_name": "B", "input_voltage_v": 12},
+            {"block_name": "C", "input_voltage_v": 9, "output_voltage_v": 5, "max_output_current_a": 1},
+        ))
+        output = io.StringIO()
+        succeeded, failed = run_bulk(io.StringIO(jsonl), "jsonl", output, max_workers=1, chunk_size=2)
+        self.assertEqual((succeeded, failed), (2, 1))
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([r["index"] for r in results], [0, 1, 2])
+        self.assertEqual(len(results[0]["schematic"]["components"]), 3)
+        self.assertIn("error", results[1])
+        self.assertNotEqual(results[0]["fingerprint"], results[2]["fingerprint"])
+
+    def test_bounded_map_consumes_input_lazily(self):
+        """Test that bounded_map keeps order and never runs far ahead of its consumer."""
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = bounded_map(lambda x: x * x, items(), executor, window=4)
+            self.assertEqual(next(results), 0)
+            self.assertLessEqual(len(consumed), 4)
+            self.assertEqual(list(results), [i * i for i in range(1, 100)])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,216 @@
+import tracemalloc
+
+import pytest
+from core.fingerprint import MerkleIndex, diff_schematics
+from core.schematic import Component, Net, Schematic
+
+def _component(ref):
+    """Builds a simple two-pin component."""
+    return Component(reference_designator=ref, part_number="CAP_10uF", description="Test Capacitor")
+
+def _allocated(action):
+    """Returns the bytes still allocated after running an action."""
+    tracemalloc.start()
+    try:
+        result = action()
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return allocated
+
+@pytest.fixture
+def schematic():
+    """Provides a schematic with one component connected to one net."""
+    schematic = Schematic()
+    c1 = _component("C1")
+    schematic.add_component(c1)
+    schematic.get_or_create_net("VIN").add_connection(c1.get_pin("1"))
+    return schematic
+
+def test_rollback_undoes_all_edits(schematic):
+    """Tests that a rollback restores components, nets and pins."""
+    before = schematic.snapshot()
+    schematic.begin()
+    c2 = _component("C2")
+    schematic.add_component(c2)
+    schematic.get_or_create_net("VIN").add_connection(c2.get_pin("1"))
+    schematic.get_or_create_net("GND").add_connection(c2.get_pin("2"))
+    schematic.rollback()
+
+    assert schematic == before
+    assert schematic.find_net("GND") is None
+    assert not schematic.in_transaction
+
+def test_nested_transactions(schematic):
+    """Tests that rolling back an inner transaction keeps the outer edits."""
+    with schematic.transaction():
+        schematic.add_component(_component("C2"))
+        schematic.begin()
+        schematic.add_component(_component("C3"))
+        schematic.rollback()
+    assert [c.reference_designator for c in schematic.components] == ["C1", "C2"]
+
+def test_transaction_context_rolls_back_on_error(schematic):
+    """Tests that an exception inside a transaction block rolls it back."""
+    with pytest.raises(RuntimeError):
+        with schematic.transaction():
+            schematic.add_component(_component("C2"))
+            raise RuntimeError("boom")
+    assert len(schematic.components) == 1
+
+def test_commit_without_transaction_raises(schematic):
+    """Tests that committing without an open transaction is an error."""
+    with pytest.raises(RuntimeError):
+        schematic.commit()
+
+def test_snapshot_shares_storage_until_modified(schematic):
+    """Tests that snapshots are O(1) copies that diverge independently."""
+    branch = schematic.snapshot()
+    assert branch.components._root is schematic.components._root
+    assert branch.nets._root is schematic.nets._root
+
+    c2 = _component("C2")
+    branch.add_component(c2)
+    branch.get_or_create_net("VIN").add_connection(c2.get_pin("1"))
+
+    assert len(schematic.components) == 1
+    assert len(branch.components) == 2
+    assert c2.get_pin("1") not in schematic.find_net("VIN").pins
+    assert c2.get_pin("1") in branch.find_net("VIN").pins
+
+def test_stale_net_reference_does_not_leak_into_snapshot(schematic):
+    """Tests that a net obtained before a snapshot cannot modify the snapshot."""
+    vin = schematic.find_net("VIN")
+    branch = schematic.snapshot()
+    vin.add_connection(_component("C9").get_pin("1"))
+
+    assert len(branch.find_net("VIN").pins) == 1
+    assert len(schematic.find_net("VIN").pins) == 2
+
+def test_detached_net_add_connection():
+    """Tests that nets not added to a schematic still accept connections."""
+    net = Net(name="FLOATING")
+    net.add_connection(_component("C1").get_pin("1"))
+    assert len(net.pins) == 1
+
+def test_fingerprint_is_order_independent():
+    """Tests that the fingerprint only depends on content, not insertion order."""
+    c1, c2 = _component("C1"), _component("C2")
+    first = Schematic()
+    first.add_component(c1)
+    first.add_component(c2)
+    first.get_or_create_net("VIN").add_connection(c1.get_pin("1"))
+    first.get_or_create_net("VIN").add_connection(c2.get_pin("1"))
+    first.get_or_create_net("GND").add_connection(c1.get_pin("2"))
+
+    second = Schematic()
+    second.add_component(c2)
+    second.get_or_create_net("GND").add_connection(c1.get_pin("2"))
+    second.get_or_create_net("VIN").add_connection(c2.get_pin("1"))
+    second.add_component(c1)
+    second.get_or_create_net("VIN").add_connection(c1.get_pin("1"))
+
+    assert first.fingerprint() == second.fingerprint()
+    assert diff_schematics(first, second).is_empty
+
+    second.get_or_create_net("VIN").add_connection(_component("C3").get_pin("1"))
+    assert first.fingerprint() != second.fingerprint()
+
+def test_fingerprint_matches_fresh_build_after_rollback(schematic):
+    """Tests that rolled back edits also revert the fingerprint."""
+    before = schematic.fingerprint()
+    with pytest.raises(RuntimeError):
+        with schematic.transaction():
+            schematic.add_component(_component("C2"))
+            schematic.get_or_create_net("VIN").add_connection(_component("C2").get_pin("1"))
+            raise RuntimeError("boom")
+    assert schematic.fingerprint() == before
+    assert Schematic(components=list(schematic.components), nets=[
+        Net(name=net.name, pins=set(net.pins)) for net in schematic.nets
+    ]).fingerprint() == before
+
+def test_diff_reports_changed_components_and_nets(schematic):
+    """Tests that the diff finds added, removed and changed entries."""
+    branch = schematic.snapshot()
+    c2 = _component("C2")
+    branch.add_component(c2)
+    branch.get_or_create_net("VIN").add_connection(c2.get_pin("1"))
+    branch.get_or_create_net("GND").add_connection(c2.get_pin("2"))
+
+    diff = diff_schematics(schematic, branch)
+    assert diff.added_components == ["C2"]
+    assert diff.added_nets == ["GND"]
+    assert diff.changed_nets == ["VIN"]
+    assert not diff.removed_components and not diff.removed_nets
+
+    reverse = diff_schematics(branch, schematic)
+    assert reverse.removed_components == ["C2"]
+    assert reverse.removed_nets == ["GND"]
+
+def test_add_bulk_matches_incremental_edits(schematic):
+    """Tests that add_bulk merges into existing nets and equals one-by-one edits."""
+    incremental = schematic.snapshot()
+    c2 = _component("C2")
+    incremental.add_component(c2)
+    incremental.get_or_create_net("VIN").add_connection(c2.get_pin("1"))
+    incremental.get_or_create_net("GND").add_connection(c2.get_pin("2"))
+
+    schematic.add_bulk([_component("C2")], [("VIN", [c2.get_pin("1")]), ("GND", [c2.get_pin("2")])])
+
+    assert schematic.to_dict() == incremental.to_dict()
+    assert schematic.fingerprint() == incremental.fingerprint()
+
+def test_add_bulk_rolls_back(schematic):
+    """Tests that a bulk add inside a transaction is undone by a rollback."""
+    before = schematic.snapshot()
+    c2 = _component("C2")
+    schematic.begin()
+    schematic.add_bulk([c2], [("VIN", [c2.get_pin("1")]), ("GND", [c2.get_pin("2")])])
+    schematic.rollback()
+
+    assert schematic == before
+    assert schematic.fingerprint() == before.fingerprint()
+    assert schematic.find_net("GND") is None
+
+@pytest.mark.parametrize("size", [100, 20000])
+def test_merkle_index_copy_cost_does_not_grow_with_size(size):
+    """Tests that copying an index and writing to both sides copies a bounded amount."""
+    def index_of(n):
+        index = MerkleIndex()
+        for i in range(n):
+            index.add(f"K{i}", i + 1)
+        return index
+
+    def copy_and_write(index):
+        clone = index.copy()
+        clone.add("NEW", 5)
+        index.add("K0", 3)
+        return clone
+
+    small, large = index_of(10), index_of(size)
+    assert _allocated(lambda: copy_and_write(large)) < 2 * _allocated(lambda: copy_and_write(small))
+    assert sorted(large.changed_keys(copy_and_write(large))) == ["K0", "NEW"]
+
+def test_branch_memory_is_proportional_to_its_edits():
+    """Tests that a one-edit branch allocates about the same on a 100-part and a 20k-part board."""
+    def board(size):
+        board = Schematic()
+        for i in range(size):
+            part = _component(f"C{i}")
+            board.add_component(part)
+            board.get_or_create_net(f"N{i}").add_connection(part.get_pin("1"))
+            board.get_or_create_net("GND").add_connection(part.get_pin("2"))
+        return board
+
+    def branch_with_one_edit(board):
+        branch = board.snapshot()
+        branch.add_component(_component("X1"))
+        return branch
+
+    small, large = board(100), board(20000)
+    small_cost = _allocated(lambda: branch_with_one_edit(small))
+    large_cost = _allocated(lambda: branch_with_one_edit(large))
+    assert large_cost < 1.5 * small_cost
+    assert len(branch_with_one_edit(large).components) == 20001
+    assert len(large.components) == 20000
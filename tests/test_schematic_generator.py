@@ -84,4 +84,64 @@ def test_unknown_command_is_ignored(generator, empty_schematic, requirements):
     """Tests that an unknown command does not add any components."""
     schematic = empty_schematic
     generator.execute_command("make_coffee", schematic, requirements)
-    assert len(schematic.components) == 0
\ No newline at end of file
+    assert len(schematic.components) == 0
+
+def test_failing_command_leaves_schematic_untouched(generator, empty_schematic, requirements, monkeypatch):
+    """Tests that a command that fails part-way is rolled back."""
+    schematic = empty_schematic
+    generator.execute_command("add_input_capacitor", schematic, requirements)
+    before = schematic.snapshot()
+
+    def failing_regulator(schematic, requirements):
+        schematic.get_or_create_net("VIN_12.0V").add_connection(schematic.components[0].get_pin("X"))
+        schematic.get_or_create_net("BROKEN")
+        raise RuntimeError("library lookup failed")
+
+    monkeypatch.setattr(generator, "_add_lm7805_regulator", failing_regulator)
+    with pytest.raises(RuntimeError):
+        generator.execute_command("add_regulator_5v", schematic, requirements)
+
+    assert schematic == before
+    assert schematic.find_net("BROKEN") is None
+
+PLAN = ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+
+def test_execute_plan_stamps_recorded_template(generator, requirements):
+    """Tests that a repeated plan is stamped from its template with the new net names."""
+    first = generator.execute_plan(PLAN, requirements)
+    assert (generator.template_misses, generator.template_hits) == (1, 0)
+
+    other = PowerSupplyRequirements("Other", input_voltage_v=24.0, output_voltage_v=3.3, max_output_current_a=0.5)
+    stamped = generator.execute_plan(PLAN, other)
+    replayed = SchematicGenerator().execute_plan(PLAN, other)
+
+    assert generator.template_hits == 1
+    assert stamped.to_dict() == replayed.to_dict()
+    assert stamped.fingerprint() == replayed.fingerprint()
+    assert stamped.find_net("VIN_24.0V") is not None
+    # The first result is not affected by later stamps
+    assert first.find_net("VIN_12.0V") is not None
+    assert first.components[0] is not stamped.components[0]
+
+def test_execute_plan_handles_ambiguous_voltages(generator):
+    """Tests that voltages whose text overlaps (12.0 / 2.0) still stamp correct net names."""
+    reqs = PowerSupplyRequirements("A", input_voltage_v=12.0, output_voltage_v=2.0, max_output_current_a=1.0)
+    generator.execute_plan(PLAN, PowerSupplyRequirements("B", 9.0, 5.0, 1.0))
+    stamped = generator.execute_plan(PLAN, reqs)
+    assert [net.name for net in stamped.nets] == ["VIN_12.0V", "VOUT_2.0V", "GND"]
+
+def test_plan_that_template_cannot_reproduce_is_replayed(generator, requirements, monkeypatch):
+    """Tests that a plan whose topology depends on the voltages is never templated."""
+    original = generator._add_output_capacitor
+
+    def voltage_dependent(schematic, reqs):
+        original(schematic, reqs)
+        if reqs.output_voltage_v < 10:
+            schematic.get_or_create_net("LOW_VOLTAGE_FLAG")
+
+    monkeypatch.setattr(generator, "_add_output_capacitor", voltage_dependent)
+    generator.execute_plan(PLAN, requirements)
+    generator.execute_plan(PLAN, requirements)
+
+    assert generator.template_hits == 0
+    assert generator.execute_plan(PLAN, requirements).find_net("LOW_VOLTAGE_FLAG") is not None
@@ -0,0 +1,80 @@
+import gzip
+import json
+
+import pytest
+
+from core import serialization
+from core.orchestrator import DesignOrchestrator
+from core.requirements import PowerSupplyRequirements
+from core.serialization import (compress, from_columnar, negotiate_encoding, packb, to_columnar,
+                                unpackb)
+
+PLAN = ["add_regulator_5v", "add_input_capacitor", "add_output_capacitor"]
+
+
+@pytest.fixture
+def schematic():
+    """Provides the standard 5V supply schematic."""
+    reqs = PowerSupplyRequirements("PSU", input_voltage_v=12.0, output_voltage_v=5.0, max_output_current_a=1.0)
+    return DesignOrchestrator().execute_plan(PLAN, reqs)
+
+
+def test_columnar_round_trip(schematic):
+    """The columnar layout decodes back to the same schematic and plan."""
+    decoded, plan = from_columnar(to_columnar(schematic, PLAN))
+    assert plan == PLAN
+    assert decoded.to_dict() == schematic.to_dict()
+    assert decoded.fingerprint() == schematic.fingerprint()
+
+
+def test_columnar_interns_strings(schematic):
+    """Each string is stored once and referenced by index."""
+    data = to_columnar(schematic, PLAN)
+    assert len(data["strings"]) == len(set(data["strings"]))
+    assert data["strings"].count("GND") == 1
+    nets = data["nets"]
+    assert nets["pin_offsets"][-1] == len(nets["pin_designator"]) == len(nets["pin_name"])
+    assert all(isinstance(i, int) for i in nets["pin_designator"])
+
+
+def test_columnar_rejects_unknown_version(schematic):
+    """Data from another layout version is rejected rather than misread."""
+    data = to_columnar(schematic)
+    data["version"] = 99
+    with pytest.raises(ValueError):
+        from_columnar(data)
+
+
+@pytest.mark.parametrize("value", [
+    None, True, False, 0, 127, 128, 255, 65535, 65536, 2 ** 40, -1, -32, -33, -200, -40000, -2 ** 40,
+    1.5, "", "GND", "x" * 40, "x" * 300, "x" * 70000, b"\x00\x01", list(range(20)), list(range(70000)),
+    {"a": 1, "b": [1, 2, {"c": None}]}, {str(i): i for i in range(20)},
+])
+def test_pure_python_msgpack_round_trip(monkeypatch, value):
+    """The fallback codec round-trips every type the API emits."""
+    monkeypatch.setattr(serialization, "msgpack", None)
+    assert unpackb(packb(value)) == value
+
+
+def test_pure_python_msgpack_matches_spec(monkeypatch):
+    """A few encodings checked byte-for-byte against the MessagePack spec."""
+    monkeypatch.setattr(serialization, "msgpack", None)
+    assert packb({"a": [1, -1, None]}) == b"\x81\xa1a\x93\x01\xff\xc0"
+    assert packb(300) == b"\xcd\x01\x2c"
+    assert packb(1.0) == b"\xcb\x3f\xf0\x00\x00\x00\x00\x00\x00"
+
+
+def test_negotiate_encoding(monkeypatch):
+    """Without brotli, gzip is picked unless excluded by q=0; identity is None."""
+    monkeypatch.setattr(serialization, "brotli", None)
+    assert negotiate_encoding("gzip, deflate, br") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("*") == "gzip"
+
+
+def test_compress_gzip(schematic):
+    """gzip bodies decompress to the original; no coding returns the body as-is."""
+    body = json.dumps(to_columnar(schematic, PLAN)).encode("utf-8")
+    assert gzip.decompress(compress(body, "gzip")) == body
+    assert compress(body, None) is body